@@ -3,8 +3,8 @@ import random
 import time
 from statistics import mean
 from pentago.game import Game
-from pentago.board import Player
-from pentago.ai.minimax import best_move, reset_stats, stats_snapshot
+from pentago.board import Board, Player
+from pentago.ai.minimax import best_move, reset_stats, stats_snapshot, set_tt_size
 
 def random_position(plies: int, seed: int = 42):
     random.seed(seed)
@@ -18,17 +18,20 @@ def random_position(plies: int, seed: int = 42):
         g.play(r, c, q, d)
     return g
 
-def bench_position(g: Game, side: Player, depth: int, time_ms: int | None, repeats: int):
+def bench_position(g: Game, side: Player, depth: int, time_ms: int | None, repeats: int, **opts):
     times = []
     nodes = []
     evals = []
     cuts = []
     tt_probe = []
     tt_hit = []
+    tt_fill = []
+    cut_first = []
+    cut_killer = []
     for i in range(repeats):
         reset_stats()
         t0 = time.time()
-        _ = best_move(g.board, side, max_depth=depth, time_ms=time_ms)
+        _ = best_move(g.board, side, max_depth=depth, time_ms=time_ms, **opts)
         dt = time.time() - t0
         s = stats_snapshot()
         times.append(dt)
@@ -37,6 +40,9 @@ def bench_position(g: Game, side: Player, depth: int, time_ms: int | None, repea
         cuts.append(s["cuts"])
         tt_probe.append(s["tt_probe"])
         tt_hit.append(s["tt_hit"])
+        tt_fill.append(s["tt_fill"])
+        cut_first.append(s["cut_first"])
+        cut_killer.append(s["cut_killer"])
     return {
         "time_s_avg": mean(times),
         "nodes_avg": int(mean(nodes)),
@@ -45,6 +51,39 @@ def bench_position(g: Game, side: Player, depth: int, time_ms: int | None, repea
         "cuts_avg": int(mean(cuts)),
         "tt_probe_avg": int(mean(tt_probe)),
         "tt_hit_avg": int(mean(tt_hit)),
+        "tt_fill_avg": int(mean(tt_fill)),
+        "cut_first_avg": int(mean(cut_first)),
+        "cut_killer_avg": int(mean(cut_killer)),
+    }
+
+def segment_scan(board: Board, player: Player) -> bool:
+    for seg in Board.SEGMENTS:
+        if all(board.at(r, c) == player for r, c in seg):
+            return True
+    return False
+
+def bench_wincheck(g: Game, side: Player, iterations: int):
+    moves = g.legal_moves()
+    boards = []
+    for r, c, q, d in moves:
+        b = g.board.copy()
+        b.place(r, c, side)
+        b.rotate(q, d)
+        boards.append(b)
+    n = iterations * len(boards)
+    t0 = time.time()
+    for _ in range(iterations):
+        for b in boards:
+            segment_scan(b, side)
+    t_scan = time.time() - t0
+    t0 = time.time()
+    for _ in range(iterations):
+        for b in boards:
+            b.check_five(side)
+    t_count = time.time() - t0
+    return {
+        "scan_cps": int(n / t_scan) if t_scan > 0 else 0,
+        "counter_cps": int(n / t_count) if t_count > 0 else 0,
     }
 
 def main():
@@ -54,19 +93,55 @@ def main():
     parser.add_argument("--time", type=int, nargs="*", default=[])
     parser.add_argument("--repeats", type=int, default=3)
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--wincheck-iters", type=int, default=20)
+    parser.add_argument("--symmetry", action="store_true")
+    parser.add_argument("--tt-mb", type=float, default=None)
+    parser.add_argument("--no-threats", action="store_true",
+                        help="disable threat detection (immediate wins, forced blocks, horizon extension)")
+    parser.add_argument("--batch-eval", action="store_true",
+                        help="evaluate the children of depth-1 nodes in one NumPy batch")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1],
+                        help="Lazy SMP worker counts; several values print the scaling curve")
+    parser.add_argument("--compare-pvs", action="store_true",
+                        help="run each depth without PVS/aspiration, with PVS, and with PVS + aspiration")
     args = parser.parse_args()
+    opts = {"symmetry": args.symmetry, "threats": not args.no_threats, "batch_eval": args.batch_eval}
+    variants = [("", {})]
+    if args.compare_pvs:
+        variants = [
+            ("plain    ", {"pvs": False, "aspiration": None}),
+            ("pvs      ", {"pvs": True, "aspiration": None}),
+            ("pvs+asp  ", {"pvs": True}),
+        ]
+    if len(args.workers) > 1:
+        variants = [(f"{label}w={w:<3}", {**extra, "workers": w}) for label, extra in variants for w in args.workers]
+    elif args.workers[0] > 1:
+        opts["workers"] = args.workers[0]
+    if args.tt_mb is not None:
+        set_tt_size(args.tt_mb)
 
     print("Pentago minimax benchmark")
     for p in args.plies:
         g = random_position(p, seed=args.seed)
         side = g.current_player()
         print(f"\nPosition after {p} plies (to move: {'B' if side==Player.BLACK else 'W'})")
+        if args.wincheck_iters > 0 and not g.terminal():
+            res = bench_wincheck(g, side, args.wincheck_iters)
+            print(f"check_five/s  segments={res['scan_cps']:>8}  counters={res['counter_cps']:>8}")
         for d in args.depths:
-            res = bench_position(g, side, depth=d, time_ms=None, repeats=args.repeats)
-            print(f"depth={d:>2}  time={res['time_s_avg']:.3f}s  nodes={res['nodes_avg']:>8}  nps={res['nps']:>8}  evals={res['evals_avg']:>8}  cuts={res['cuts_avg']:>8}  tt_hit={res['tt_hit_avg']:>8}/{res['tt_probe_avg']:>8}")
+            base = None
+            for label, extra in variants:
+                res = bench_position(g, side, depth=d, time_ms=None, repeats=args.repeats, **opts, **extra)
+                speedup = ""
+                if "workers" in extra:
+                    if extra["workers"] == args.workers[0]:
+                        base = res["time_s_avg"]
+                    speedup = f"  speedup={base / res['time_s_avg']:.2f}x" if res["time_s_avg"] > 0 else ""
+                print(f"{label}depth={d:>2}  time={res['time_s_avg']:.3f}s  nodes={res['nodes_avg']:>8}  nps={res['nps']:>8}  evals={res['evals_avg']:>8}  cuts={res['cuts_avg']:>8} (first={res['cut_first_avg']}, killer={res['cut_killer_avg']})  tt_hit={res['tt_hit_avg']:>8}/{res['tt_probe_avg']:>8}  tt_fill={res['tt_fill_avg']:>4}‰{speedup}")
         for t in args.time:
-            res = bench_position(g, side, depth=32, time_ms=t, repeats=args.repeats)
-            print(f"time={t:>4}ms depth<=ID  time={res['time_s_avg']:.3f}s  nodes={res['nodes_avg']:>8}  nps={res['nps']:>8}  evals={res['evals_avg']:>8}  cuts={res['cuts_avg']:>8}  tt_hit={res['tt_hit_avg']:>8}/{res['tt_probe_avg']:>8}")
+            for label, extra in variants:
+                res = bench_position(g, side, depth=32, time_ms=t, repeats=args.repeats, **opts, **extra)
+                print(f"{label}time={t:>4}ms depth<=ID  time={res['time_s_avg']:.3f}s  nodes={res['nodes_avg']:>8}  nps={res['nps']:>8}  evals={res['evals_avg']:>8}  cuts={res['cuts_avg']:>8} (first={res['cut_first_avg']}, killer={res['cut_killer_avg']})  tt_hit={res['tt_hit_avg']:>8}/{res['tt_probe_avg']:>8}  tt_fill={res['tt_fill_avg']:>4}‰")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
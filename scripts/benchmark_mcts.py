@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+from pentago.board import Player
+from pentago.ai import mcts
+from pentago.ai.batch import board_cells
+from pentago.ai.playout import playouts
+from benchmark import random_position
+
+def bench_sims(g, side: Player, time_ms: int, repeats: int, **opts):
+    rates = []
+    for _ in range(repeats):
+        mcts.mcts_reset()
+        done = [0]
+        t0 = time.time()
+        mcts.best_move_mcts(g.board, side, time_ms=time_ms, progress_cb=lambda n: done.__setitem__(0, n), **opts)
+        dt = time.time() - t0
+        rates.append(done[0] / dt if dt > 0 else 0.0)
+    return sum(rates) / len(rates)
+
+def bench_rollouts(g, side: Player, fn, n: int) -> float:
+    random.seed(0)
+    t0 = time.time()
+    for _ in range(n):
+        fn(g.board, side)
+    dt = time.time() - t0
+    return n / dt if dt > 0 else 0.0
+
+def bench_playouts(g, side: Player, k: int, repeats: int = 3) -> float:
+    cells = board_cells(g.board)
+    t0 = time.time()
+    for _ in range(repeats):
+        playouts(cells, side, k)
+    dt = time.time() - t0
+    return k * repeats / dt if dt > 0 else 0.0
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plies", type=int, nargs="+", default=[0, 8])
+    parser.add_argument("--time", type=int, default=2000, help="wall-clock budget per move (ms)")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", default=["root", "tree"], choices=["root", "tree"])
+    parser.add_argument("--rollouts", type=int, default=20, help="rollouts per engine for the rollout/sec line")
+    parser.add_argument("--playouts", type=int, default=0,
+                        help="evaluate each leaf with K batched NumPy playouts instead of one rollout")
+    parser.add_argument("--full-rollouts", action="store_true",
+                        help="run the simulation benchmarks with the original move-sweep rollout")
+    args = parser.parse_args()
+
+    print("Pentago MCTS benchmark (simulations/sec at a fixed time budget)")
+    for p in args.plies:
+        g = random_position(p, seed=args.seed)
+        side = g.current_player()
+        print(f"\nPosition after {p} plies (to move: {'B' if side == Player.BLACK else 'W'})")
+        if args.rollouts > 0 and not g.terminal():
+            full = bench_rollouts(g, side, mcts.rollout, args.rollouts)
+            fast = bench_rollouts(g, side, mcts.fast_rollout, args.rollouts * 10)
+            print(f"rollouts/s      full={full:>9.1f}  fast={fast:>9.1f}  ratio={fast / full if full else 0:.1f}x")
+            for k in sorted({64, 1024, args.playouts} - {0}):
+                print(f"playouts/s      K={k:<6} {bench_playouts(g, side, k):>9.1f}")
+        opts = {"fast_rollouts": not args.full_rollouts, "playouts": args.playouts}
+        base = bench_sims(g, side, args.time, args.repeats, **opts)
+        print(f"serial          sims/s={base:>9.1f}")
+        for mode in args.modes:
+            for w in args.workers:
+                if w == 1:
+                    continue
+                rate = bench_sims(g, side, args.time, args.repeats, parallel=mode, workers=w, **opts)
+                speedup = rate / base if base > 0 else 0.0
+                print(f"{mode:<5} w={w:<3}     sims/s={rate:>9.1f}  speedup={speedup:.2f}x")
+    mcts.mcts_pool_shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import argparse
+import os
+import time
+from pentago.ai.book import build_book
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book by searching every opening position")
+    parser.add_argument("--out", default="book.bin")
+    parser.add_argument("--plies", type=int, default=2, help="cover positions reached in at most this many plies")
+    parser.add_argument("--depth", type=int, default=3, help="minimax depth per position")
+    parser.add_argument("--time", type=int, default=None, help="optional time limit per position (ms)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    t0 = time.time()
+
+    def _progress(done: int, total: int) -> None:
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"{done:>6}/{total}  {time.time() - t0:8.1f}s", flush=True)
+
+    book = build_book(args.plies, args.depth, args.time, args.workers, _progress)
+    book.save(args.out)
+    print(f"{len(book)} positions (plies<={args.plies}, depth {args.depth}) -> {args.out}, "
+          f"{os.path.getsize(args.out)} bytes")
+
+if __name__ == "__main__":
+    main()
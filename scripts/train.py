@@ -0,0 +1,83 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+import numpy as np
+from pentago.ai.nn import PolicyValueNet
+from pentago.ai.selfplay import ShardWriter, play_game, RECORD_DTYPE
+
+# compteurs partagés avec les workers : parties commencées, terminées, positions écrites
+_SHARED = {}
+
+def _init(started, games, positions) -> None:
+    _SHARED.update(started=started, games=games, positions=positions)
+
+def _take_game(limit) -> bool:
+    started = _SHARED["started"]
+    with started.get_lock():
+        if limit is not None and started.value >= limit:
+            return False
+        started.value += 1
+    return True
+
+def selfplay_worker(wid: int, opts: dict) -> None:
+    # boucle d'un worker : une partie à la fois, écrite dans ses propres shards dès qu'elle finit
+    seed = opts["seed"] * 1000 + wid
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    evaluator = PolicyValueNet.load(opts["net"]) if opts["net"] else None
+    writer = ShardWriter(opts["out"], writer_id=wid, shard_records=opts["shard_records"])
+    deadline = None if opts["hours"] is None else time.time() + opts["hours"] * 3600
+    try:
+        while (deadline is None or time.time() < deadline) and _take_game(opts["games"]):
+            records = play_game(opts["engine"], opts["simulations"], opts["temperature_plies"], evaluator, rng)
+            writer.write(records)
+            with _SHARED["games"].get_lock():
+                _SHARED["games"].value += 1
+            with _SHARED["positions"].get_lock():
+                _SHARED["positions"].value += len(records)
+    finally:
+        writer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-play data generation for the policy engine")
+    parser.add_argument("--out", default="selfplay", help="shard directory")
+    parser.add_argument("--engine", choices=["policy", "mcts"], default="policy")
+    parser.add_argument("--simulations", type=int, default=200)
+    parser.add_argument("--temperature-plies", type=int, default=8,
+                        help="plies whose move is sampled from the root visits")
+    parser.add_argument("--net", default=None, help="policy/value weights (.npz) for the policy engine")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--games", type=int, default=None, help="total games (default: run until stopped)")
+    parser.add_argument("--hours", type=float, default=None)
+    parser.add_argument("--shard-records", type=int, default=100_000)
+    parser.add_argument("--report", type=float, default=30.0, help="seconds between throughput lines")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    opts = {k: getattr(args, k) for k in ("out", "engine", "simulations", "temperature_plies", "net", "games",
+                                          "hours", "shard_records", "seed")}
+
+    ctx = multiprocessing.get_context()
+    started, games, positions = ctx.Value("q", 0), ctx.Value("q", 0), ctx.Value("q", 0)
+    pool = ctx.Pool(args.workers, initializer=_init, initargs=(started, games, positions))
+    pending = [pool.apply_async(selfplay_worker, (w, opts)) for w in range(args.workers)]
+    pool.close()
+    print(f"self-play: {args.workers} workers, engine={args.engine}, {args.simulations} sims/move, "
+          f"{RECORD_DTYPE.itemsize} B/record -> {args.out}")
+    t0 = time.time()
+    try:
+        while pending:
+            pending[0].wait(args.report)
+            for r in [r for r in pending if r.ready()]:
+                r.get()
+                pending.remove(r)
+            dt = time.time() - t0
+            print(f"{dt:8.0f}s  games={games.value:>7}  positions={positions.value:>9}  "
+                  f"games/min={games.value * 60 / dt:8.1f}  positions/s={positions.value / dt:8.1f}", flush=True)
+    except KeyboardInterrupt:
+        pool.terminate()
+    pool.join()
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Optional
 from uuid import uuid4
+import os
 import time
 
 from pentago.game import Game
 from pentago.board import Player, Quadrant, Direction
 from pentago.ai.minimax import best_move as best_move_minimax
-from pentago.ai.mcts import best_move_mcts, mcts_reset, mcts_rebase
-from pentago.ai.policy import best_move as best_move_policy
+from pentago.ai.mcts import best_move_mcts, mcts_reset, mcts_rebase, tree_stats
+from pentago.ai.policy import best_move as best_move_policy, set_evaluator
+from pentago.ai.nn import PolicyValueNet
+from pentago.ai.book import book_move, load_book
+from pentago.ai.endgame import ENDGAME_EMPTIES, open_cache
+from pentago.ai import poscache
 
 app = FastAPI()
 app.add_middleware(
@@ -19,6 +24,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# réseau policy/value (.npz) pour le moteur "policy" ; sans lui, priors CENTER_WEIGHTS
+if os.environ.get("PENTAGO_POLICY_NET"):
+    set_evaluator(PolicyValueNet.load(os.environ["PENTAGO_POLICY_NET"]))
+# livre d'ouvertures (scripts/build_book.py), consulté avant tout moteur
+if os.environ.get("PENTAGO_BOOK"):
+    load_book(os.environ["PENTAGO_BOOK"])
+# finales résolues (sqlite) partagées entre les parties et les processus du serveur
+if os.environ.get("PENTAGO_ENDGAME_CACHE"):
+    open_cache(os.environ["PENTAGO_ENDGAME_CACHE"])
+# résultats de recherche minimax persistants, partagés par les workers uvicorn
+if os.environ.get("PENTAGO_POSITION_CACHE"):
+    poscache.open_cache(os.environ["PENTAGO_POSITION_CACHE"],
+                        int(os.environ.get("PENTAGO_POSITION_CACHE_ENTRIES", 1_000_000)))
+
+# plafond des processus de recherche par requête /bot, fixé par la configuration du serveur
+MAX_WORKERS = max(1, int(os.environ.get("PENTAGO_MAX_WORKERS", 1)))
+
 GAMES: Dict[str, Game] = {}
 PROGRESS: Dict[str, dict] = {}
 
@@ -32,12 +54,19 @@ class BotRequest(BaseModel):
     time_ms: Optional[int] = None
     engine: Optional[str] = "minimax"
     simulations: Optional[int] = None
+    workers: Optional[int] = None
+    # "tree" : threads et playouts NumPy ; "root" : un processus par worker (plafonné par MAX_WORKERS)
+    parallel: Optional[str] = None
 
 COLS = "ABCDEF"
 ROWS = "123456"
 QMAP_STR_TO_ENUM = {"Q00": Quadrant.Q00, "Q01": Quadrant.Q01, "Q10": Quadrant.Q10, "Q11": Quadrant.Q11}
 DMAP_STR_TO_ENUM = {"CW": Direction.CW, "CCW": Direction.CCW}
 
+def bot_workers(requested: Optional[int]) -> int:
+    # le client peut demander moins de workers que le plafond, jamais plus
+    return min(max(1, requested or 1), MAX_WORKERS)
+
 def to_state(g: Game) -> dict:
     grid = [row[:] for row in g.board.grid]
     to_move = "B" if g.current_player() == Player.BLACK else "W"
@@ -123,6 +152,8 @@ def bot(gid: str, req: BotRequest):
         raise HTTPException(404, "unknown game")
     engine = (req.engine or "minimax").lower()
     side = g.current_player()
+    if engine == "mcts" and req.parallel not in (None, "root", "tree"):
+        raise HTTPException(400, "unknown parallel mode")
 
     PROGRESS[gid] = {
         "engine": engine,
@@ -133,7 +164,11 @@ def bot(gid: str, req: BotRequest):
         "sims_done": 0,
     }
 
-    if engine == "minimax":
+    mv = book_move(g.board, side) if engine in ("minimax", "mcts", "policy") else None
+    if mv is not None:
+        r, c, q, d = mv
+
+    elif engine == "minimax":
         def _cb_ms(elapsed_ms: int):
             PROGRESS[gid]["elapsed_override_ms"] = int(elapsed_ms)
         r, c, q, d = best_move_minimax(
@@ -142,6 +177,9 @@ def bot(gid: str, req: BotRequest):
             max_depth=req.depth,
             time_ms=req.time_ms,
             progress_cb=_cb_ms,
+            workers=bot_workers(req.workers),
+            # résolution exacte des finales seulement avec une limite de temps, qui borne son coût
+            endgame=ENDGAME_EMPTIES if req.time_ms is not None else None,
         )
 
     elif engine == "mcts":
@@ -154,15 +192,25 @@ def bot(gid: str, req: BotRequest):
             else:
                 sims = max(200, req.depth * 500)
         PROGRESS[gid]["sims_target"] = sims
+        workers = bot_workers(req.workers)
+        # en parallélisme racine, les arbres vivent dans les processus du pool : POOL reste vide ici
+        # et sa taille ne dirait rien de la recherche, on ne la rapporte pas
+        local_tree = not (req.parallel == "root" and workers > 1)
         def _cb(done_sims: int):
             PROGRESS[gid]["sims_done"] = done_sims
+            if local_tree:
+                PROGRESS[gid]["tree"] = tree_stats()
         r, c, q, d = best_move_mcts(
             g.board,
             player_to_move=side,
             time_ms=req.time_ms,
             simulations=sims,
             progress_cb=_cb,
+            parallel=req.parallel,
+            workers=workers,
         )
+        if local_tree:
+            PROGRESS[gid]["tree"] = tree_stats()
 
     elif engine == "policy":
         if req.time_ms is not None:
@@ -192,4 +240,8 @@ def bot(gid: str, req: BotRequest):
     mcts_rebase(g.board, g.current_player(), prune=True)
     cell = f"{COLS[c]}{ROWS[r]}"
     move_str = f"{cell} {q.name} {d.name}"
-    return {"move": move_str, "state": to_state(g), "engine": engine}
\ No newline at end of file
+    out = {"move": move_str, "state": to_state(g), "engine": engine, "book": mv is not None}
+    if "tree" in PROGRESS[gid]:
+        # taille de l'arbre MCTS à la fin de la recherche, avant l'élagage du coup joué
+        out["tree"] = PROGRESS[gid]["tree"]
+    return out
\ No newline at end of file
@@ -0,0 +1,123 @@
+from typing import Sequence, Tuple
+import numpy as np
+from ..board import Board, Player, MOVE_TABLE, rotate_bits
+from ..threats import LINE_TABLES
+
+# SEGMENT_INDEX[s] -> les 5 indices (r * 6 + c) du segment s de Board.SEGMENTS
+SEGMENT_INDEX = np.array([[r * 6 + c for r, c in seg] for seg in Board.SEGMENTS], dtype=np.intp)
+POW10 = 10 ** np.arange(6, dtype=np.int64)
+_SHIFTS = np.arange(36, dtype=np.uint64)
+
+
+def _compute_move_gather() -> np.ndarray:
+    # MOVE_GATHER[code][i] = case d'origine de la pierre qui arrive en i après la rotation du coup
+    out = np.empty((len(MOVE_TABLE), 36), dtype=np.intp)
+    for code, (_, _, q, d) in enumerate(MOVE_TABLE):
+        for j in range(36):
+            out[code, rotate_bits(1 << j, q, d).bit_length() - 1] = j
+    return out
+
+
+# PREIMAGES[i, g] = 1 si la case i se retrouve sur une ligne gagnante après une des rotations
+PREIMAGES = np.array([[(pre >> i) & 1 for i in range(36)]
+                      for pre in sorted({pre for _, groups in LINE_TABLES for pre, _ in groups})],
+                     dtype=np.float32).T
+MOVE_CELL = np.array([r * 6 + c for r, c, _, _ in MOVE_TABLE], dtype=np.intp)
+MOVE_GATHER = _compute_move_gather()
+
+
+def cells_from_bits(black: Sequence[int], white: Sequence[int]) -> np.ndarray:
+    """(N, 36) int8 array of 0/1/2 cells from per-position black and white bitboards."""
+    b = np.asarray(black, dtype=np.uint64)[:, None]
+    w = np.asarray(white, dtype=np.uint64)[:, None]
+    cells = ((b >> _SHIFTS) & 1) + 2 * ((w >> _SHIFTS) & 1)
+    return cells.astype(np.int8)
+
+
+def board_cells(board: Board) -> np.ndarray:
+    return cells_from_bits([board.bits[1]], [board.bits[2]])[0]
+
+
+def mover_cells(board: Board, to_move: Player) -> np.ndarray:
+    """(36,) cells seen from the side to move: 1 for its stones, 2 for the opponent's."""
+    return cells_from_bits([board.bits[to_move]], [board.bits[3 - to_move]])[0]
+
+
+def expand_moves(cells: np.ndarray, player: Player, codes: Sequence[int]) -> np.ndarray:
+    """(K, 36) children of one (36,) position, one per move code (see board.encode_move)."""
+    codes = np.asarray(codes, dtype=np.intp)
+    placed = np.repeat(cells[None, :], len(codes), axis=0)
+    placed[np.arange(len(codes)), MOVE_CELL[codes]] = int(player)
+    return np.take_along_axis(placed, MOVE_GATHER[codes], axis=1)
+
+
+def has_winning_move_batch(cells: np.ndarray, player: int) -> np.ndarray:
+    """(N,) bool, threats.has_winning_move for positions that are not full."""
+    # une préimage pleine, ou à qui il manque une case vide, donne cinq après pose + rotation
+    mine = (cells == player).astype(np.float32) @ PREIMAGES
+    theirs = (cells == 3 - player).astype(np.float32) @ PREIMAGES
+    return ((mine == 5) | ((mine == 4) & (theirs == 0))).any(axis=1)
+
+
+def has_safe_move(cells: np.ndarray, player: int) -> bool:
+    """threats.safe_moves(..., first_only=True) on one (36,) position, as a single batch."""
+    empties = np.flatnonzero(cells == 0)
+    codes = (empties[:, None] * 8 + np.arange(8)).ravel()
+    children = expand_moves(cells, player, codes)
+    mc = segment_counts(children, player)
+    yc = segment_counts(children, 3 - player)
+    me_five = (mc == 5).any(axis=1)
+    you_five = (yc == 5).any(axis=1)
+    full = (children != 0).all(axis=1)
+    open_ = ~me_five & ~you_five & ~full
+    ok = me_five | (~you_five & full)
+    if ok.any():
+        return True
+    return bool((~has_winning_move_batch(children[open_], 3 - player)).any())
+
+
+def segment_counts(cells: np.ndarray, player: int) -> np.ndarray:
+    """(N, 32) number of `player` stones on each segment."""
+    return (cells == player)[:, SEGMENT_INDEX].sum(axis=2)
+
+
+def _static(mc: np.ndarray, yc: np.ndarray) -> np.ndarray:
+    s = np.where((yc == 0) & (mc > 0), POW10[mc], 0) - np.where((mc == 0) & (yc > 0), POW10[yc], 0)
+    score = s.sum(axis=1)
+    score = np.where((yc == 5).any(axis=1), -1_000_000_000, score)
+    score = np.where((mc == 5).any(axis=1), 1_000_000_000, score)
+    return score.astype(np.int64)
+
+
+def evaluate_batch(cells: np.ndarray, player_to_maximize: Player) -> np.ndarray:
+    """Vectorized minimax.evaluate over an (N, 36) array of positions; returns (N,) int64 scores."""
+    me = int(player_to_maximize)
+    return _static(segment_counts(cells, me), segment_counts(cells, 3 - me))
+
+
+def evaluate_children(cells: np.ndarray,
+                      player_to_move: Player,
+                      player_to_maximize: Player,
+                      codes: Sequence[int],
+                      win_score: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Play every move code from one (36,) position and score the children in one pass.
+
+    Returns (scores, terminal, children): a five for the mover wins even if the opponent also gets one,
+    a full board without five is a draw, and terminal scores are +/- win_score.
+    """
+    children = expand_moves(cells, player_to_move, codes)
+    me = int(player_to_maximize)
+    mc = segment_counts(children, me)
+    yc = segment_counts(children, 3 - me)
+    scores = _static(mc, yc)
+    me_five = (mc == 5).any(axis=1)
+    you_five = (yc == 5).any(axis=1)
+    if me == int(player_to_move):
+        won, lost = me_five, you_five & ~me_five
+    else:
+        won, lost = me_five & ~you_five, you_five
+    drawn = ~(me_five | you_five) & (children != 0).all(axis=1)
+    scores = np.where(drawn, 0, scores)
+    scores = np.where(lost, -win_score, scores)
+    scores = np.where(won, win_score, scores)
+    return scores, won | lost | drawn, children
@@ -0,0 +1,128 @@
+import multiprocessing
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, encode_move
+from ..symmetry import canonical_key, to_canonical, from_canonical
+
+Move = Tuple[int, int, Quadrant, Direction]
+
+# fichier : en-tête (magic, nombre d'entrées, profondeur de recherche, plies couverts), puis les
+# clés canoniques triées (uint64) et les codes des coups dans le repère canonique (uint16)
+MAGIC = b"PTGBOOK1"
+HEADER = struct.Struct("<8sIHH")
+
+
+class OpeningBook:
+    """Best moves of the opening positions, keyed by canonical position key.
+
+    Keys are sorted so a probe is one canonical_key plus a binary search; moves are stored in
+    the canonical frame and mapped back to the board's frame. Positions with more than `plies`
+    stones are rejected before hashing.
+    """
+
+    def __init__(self, keys: np.ndarray, codes: np.ndarray, depth: int = 0, plies: int = 0) -> None:
+        self.keys = keys
+        self.codes = codes
+        self.depth = depth
+        self.plies = plies
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        with open(path, "rb") as fh:
+            magic, count, depth, plies = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an opening book")
+        keys = np.memmap(path, dtype="<u8", mode="r", offset=HEADER.size, shape=(count,)) if count else \
+            np.zeros(0, dtype="<u8")
+        codes = np.memmap(path, dtype="<u2", mode="r", offset=HEADER.size + 8 * count, shape=(count,)) if count else \
+            np.zeros(0, dtype="<u2")
+        return cls(keys, codes, depth, plies)
+
+    def save(self, path: str) -> None:
+        order = np.argsort(self.keys, kind="stable")
+        with open(path, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, len(self.keys), self.depth, self.plies))
+            fh.write(np.asarray(self.keys, dtype="<u8")[order].tobytes())
+            fh.write(np.asarray(self.codes, dtype="<u2")[order].tobytes())
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def probe(self, board: Board, to_move: Player) -> Optional[Move]:
+        if (board.bits[1] | board.bits[2]).bit_count() > self.plies or not len(self.keys):
+            return None
+        key, t = canonical_key(board, to_move)
+        i = int(np.searchsorted(self.keys, np.uint64(key)))
+        if i == len(self.keys) or int(self.keys[i]) != key:
+            return None
+        return from_canonical(MOVE_TABLE[int(self.codes[i])], t)
+
+
+# livre chargé par load_book() et consulté par les moteurs (minimax, mcts, policy) et le serveur
+BOOK: Optional[OpeningBook] = None
+
+
+def load_book(path: Optional[str]) -> None:
+    global BOOK
+    BOOK = None if path is None else OpeningBook.load(path)
+
+
+def book_move(board: Board, to_move: Player) -> Optional[Move]:
+    return None if BOOK is None else BOOK.probe(board, to_move)
+
+
+def opening_positions(plies: int) -> Dict[int, Tuple[int, int, int]]:
+    """Canonical key -> (black bits, white bits, side to move) of every non-terminal position
+    reachable in at most `plies` plies, one representative per symmetry class."""
+    start = Board()
+    out = {canonical_key(start, Player.BLACK)[0]: (0, 0, int(Player.BLACK))}
+    frontier = [(start, Player.BLACK)]
+    for _ in range(plies):
+        nxt = []
+        for b, p in frontier:
+            o = Player(3 - p)
+            for r, c, q, d in MOVE_TABLE:
+                if b.at(r, c):
+                    continue
+                b2 = b.copy()
+                b2.make(r, c, q, d, p)
+                if b2.fives[1] or b2.fives[2] or b2.full():
+                    continue
+                k, _ = canonical_key(b2, o)
+                if k not in out:
+                    out[k] = (b2.bits[1], b2.bits[2], int(o))
+                    nxt.append((b2, o))
+        frontier = nxt
+    return out
+
+
+def _search(job: Tuple[int, int, int, int, Optional[int]]) -> int:
+    from .minimax import best_move
+    black, white, side, depth, time_ms = job
+    board = Board.from_bits(black, white)
+    mv = best_move(board, Player(side), max_depth=depth, time_ms=time_ms, book=False)
+    _, t = canonical_key(board, Player(side))
+    return encode_move(*to_canonical(mv, t))
+
+
+def build_book(plies: int, depth: int, time_ms: Optional[int] = None, workers: int = 1,
+               progress_cb: Optional[Callable[[int, int], None]] = None) -> OpeningBook:
+    """Search every opening position up to `plies` plies (modulo symmetry) with minimax."""
+    positions = opening_positions(plies)
+    keys = np.fromiter(positions.keys(), dtype=np.uint64, count=len(positions))
+    jobs = [(b, w, s, depth, time_ms) for b, w, s in positions.values()]
+    codes: List[int] = []
+    if workers > 1:
+        with multiprocessing.get_context().Pool(workers) as pool:
+            for code in pool.imap(_search, jobs, chunksize=1):
+                codes.append(code)
+                if progress_cb:
+                    progress_cb(len(codes), len(jobs))
+    else:
+        for job in jobs:
+            codes.append(_search(job))
+            if progress_cb:
+                progress_cb(len(codes), len(jobs))
+    order = np.argsort(keys)
+    return OpeningBook(keys[order], np.array(codes, dtype=np.uint16)[order], depth, plies)
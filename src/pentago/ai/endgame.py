@@ -0,0 +1,195 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, encode_move
+from ..symmetry import canonical_key, to_canonical, from_canonical
+from ..threats import winning_codes
+from .batch import board_cells, evaluate_children, has_winning_move_batch
+from .tt import TranspositionTable
+
+Move = Tuple[int, int, Quadrant, Direction]
+# (résultat pour le joueur au trait : 1 / 0 / -1, distance à la fin en plies, meilleur coup)
+Solved = Tuple[int, int, Optional[Move]]
+
+# nombre de cases vides à partir duquel minimax.best_move passe en résolution exacte
+ENDGAME_EMPTIES = 10
+# budget par défaut quand best_move n'a pas de limite de temps (~4000 nœuds/s)
+ENDGAME_NODES = 8000
+# valeur d'une victoire au ply de la racine ; une victoire au ply t vaut SOLVED - t
+SOLVED = 100
+# petite table dédiée : profondeur stockée = 0, valeurs exactes ou bornes en distance relative au nœud
+TT = TranspositionTable(8)
+STATS: Dict[str, int] = {"nodes": 0, "tt_hit": 0, "cache_hit": 0}
+
+
+class _Abort(Exception):
+    pass
+
+
+class EndgameCache:
+    """Persistent store of solved endgames (sqlite), keyed by canonical position key.
+
+    Results are stored for the side to move with the best move in the canonical frame, so
+    symmetric positions share an entry. The database runs in WAL mode and can be opened by
+    several processes at once; a lookup is one primary-key read.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS solved ("
+                         "key INTEGER PRIMARY KEY, result INTEGER NOT NULL, dist INTEGER NOT NULL, "
+                         "move INTEGER)")
+        self._db.commit()
+
+    @staticmethod
+    def _signed(key: int) -> int:
+        # sqlite stocke des entiers signés sur 64 bits
+        return key - (1 << 64) if key >= 1 << 63 else key
+
+    def get(self, board: Board, to_move: Player) -> Optional[Solved]:
+        key, t = canonical_key(board, to_move)
+        with self._lock:
+            row = self._db.execute("SELECT result, dist, move FROM solved WHERE key = ?",
+                                   (self._signed(key),)).fetchone()
+        if row is None:
+            return None
+        result, dist, code = row
+        return result, dist, None if code is None else from_canonical(MOVE_TABLE[code], t)
+
+    def put(self, board: Board, to_move: Player, solved: Solved) -> None:
+        key, t = canonical_key(board, to_move)
+        result, dist, mv = solved
+        code = None if mv is None else encode_move(*to_canonical(mv, t))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO solved (key, result, dist, move) VALUES (?, ?, ?, ?)",
+                             (self._signed(key), result, dist, code))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM solved").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+CACHE: Optional[EndgameCache] = None
+
+
+def open_cache(path: Optional[str]) -> None:
+    global CACHE
+    if CACHE is not None:
+        CACHE.close()
+    CACHE = None if path is None else EndgameCache(path)
+
+
+def empties(board: Board) -> int:
+    return 36 - (board.bits[1] | board.bits[2]).bit_count()
+
+
+def _to_tt(v: int, ply: int) -> int:
+    # valeur de fin de partie relative au nœud courant (indépendante du chemin) pour la table
+    return v + ply if v > 0 else (v - ply if v < 0 else 0)
+
+
+def _from_tt(v: int, ply: int) -> int:
+    return v - ply if v > 0 else (v + ply if v < 0 else 0)
+
+
+def _children(board: Board, p: Player, ply: int) -> Tuple[int, Optional[Move], List[Tuple[float, Move]]]:
+    # tous les fils en un seul lot numpy : fils terminaux et fils qui laissent un gain immédiat à
+    # l'adversaire reçoivent leur valeur exacte sans recherche ; les autres sont triés (menace créée,
+    # puis score heuristique). Les rotations qui mènent à la même position sont fusionnées.
+    cells = board_cells(board)
+    codes = (np.flatnonzero(cells == 0)[:, None] * 8 + np.arange(8)).ravel()
+    scores, terminal, kids = evaluate_children(cells, p, p, codes, SOLVED)
+    _, first = np.unique(kids.view(np.dtype((np.void, 36))).ravel(), return_index=True)
+    codes, scores, terminal, kids = codes[first], scores[first], terminal[first], kids[first]
+    values = np.where(terminal, np.sign(scores) * (SOLVED - (ply + 1)), -(SOLVED - (ply + 2)))
+    open_ = ~terminal
+    open_[open_] = ~has_winning_move_batch(kids[open_], 3 - p)
+    i = int(np.argmax(np.where(open_, -SOLVED - 1, values)))
+    best, best_mv = int(values[i]), MOVE_TABLE[int(codes[i])]
+    prio = scores[open_] + np.where(has_winning_move_batch(kids[open_], p), 1 << 40, 0)
+    order = np.argsort(-prio, kind="stable")
+    moves = [(float(prio[j]), MOVE_TABLE[c]) for j, c in zip(order.tolist(), codes[open_][order].tolist())]
+    return best, best_mv, moves
+
+
+def _search(board: Board, p: Player, alpha: int, beta: int, ply: int,
+            deadline: Optional[float], max_nodes: Optional[int]) -> Tuple[int, Optional[Move]]:
+    STATS["nodes"] += 1
+    if (max_nodes is not None and STATS["nodes"] > max_nodes) or \
+            (deadline is not None and STATS["nodes"] & 63 == 0 and time.time() > deadline):
+        raise _Abort()
+    wins = winning_codes(board, p, first_only=True)
+    if wins:
+        return SOLVED - (ply + 1), MOVE_TABLE[wins[0]]
+    key = board.hash_key(p)
+    entry = TT.probe(key)
+    tt_move = None
+    if entry is not None:
+        _, tt_val, tt_flag, tt_move = entry
+        v = _from_tt(tt_val, ply)
+        if tt_flag == 0 or (tt_flag < 0 and v <= alpha) or (tt_flag > 0 and v >= beta):
+            STATS["tt_hit"] += 1
+            return v, tt_move
+
+    alpha0 = alpha
+    best, best_mv, moves = _children(board, p, ply)
+    if tt_move is not None:
+        moves.sort(key=lambda x: x[1] != tt_move)
+    alpha = max(alpha, best)
+    opp = Player(3 - p)
+    for _, mv in moves:
+        if alpha >= beta:
+            break
+        r, c, q, d = mv
+        board.make(r, c, q, d, p)
+        try:
+            v = -_search(board, opp, -beta, -alpha, ply + 1, deadline, max_nodes)[0]
+        finally:
+            board.unmake(r, c, q, d)
+        if v > best:
+            best = v
+            best_mv = mv
+        if v > alpha:
+            alpha = v
+    flag = 0 if alpha0 < best < beta else (1 if best >= beta else -1)
+    TT.store(key, 0, _to_tt(best, ply), flag, best_mv)
+    return best, best_mv
+
+
+def solve(board: Board, to_move: Player, time_ms: Optional[int] = None,
+          max_nodes: Optional[int] = None) -> Optional[Solved]:
+    """Exact win/draw/loss of the position for `to_move`, with the distance to the end in plies
+    under best play (fastest win, slowest loss) and the move achieving it.
+
+    Returns None when the time or node budget runs out first. Proven results are read from
+    and written to CACHE when one is open (open_cache).
+    """
+    STATS["nodes"] = 0
+    if CACHE is not None:
+        hit = CACHE.get(board, to_move)
+        if hit is not None:
+            STATS["cache_hit"] += 1
+            return hit
+    deadline = None if time_ms is None else time.time() + time_ms / 1000.0
+    TT.new_search()
+    b = board.copy()
+    try:
+        v, mv = _search(b, to_move, -SOLVED - 1, SOLVED + 1, 0, deadline, max_nodes)
+    except _Abort:
+        return None
+    result = (v > 0) - (v < 0)
+    solved = (result, SOLVED - abs(v) if result else empties(board), mv)
+    if CACHE is not None:
+        CACHE.put(board, to_move, solved)
+    return solved
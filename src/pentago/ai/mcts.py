@@ -1,12 +1,30 @@
 import time
 import random
 import math
+import atexit
+import threading
+import multiprocessing
+import numpy as np
 from typing import Dict, Tuple, List, Optional, Callable
-from ..board import Board, Player, Quadrant, Direction
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, FULL_MASK, encode_move
+from ..threats import winning_codes, has_winning_move, safe_moves
+from .batch import board_cells
+from .playout import playouts as run_playouts
+from .nodepool import NodePool, MOVE_STRIDE
+from .book import book_move
+from ..symmetry import position_key, from_canonical, to_canonical
 from .minimax import evaluate as static_eval, CENTER_WEIGHTS  
 
 Move = Tuple[int, int, Quadrant, Direction]
-Key = Tuple[int, Tuple[int, ...]]
+Key = int
+
+# perte virtuelle appliquée par chaque thread sur les nœuds de son chemin (parallel="tree")
+VIRTUAL_LOSS = 1.0
+# parallel="tree" évalue les feuilles par lots NumPy (playout.py), qui relâchent le GIL ; les rollouts
+# en Python pur y resteraient sur un seul cœur. Taille de lot utilisée quand playouts=0.
+TREE_PLAYOUTS = 16
+# RAVE : nombre de visites de l'arête pour lequel valeurs AMAF et UCT pèsent autant (beta = 1/2)
+RAVE_K = 300.0
 
 
 def opponent(p: Player) -> Player:
@@ -14,8 +32,7 @@ def opponent(p: Player) -> Player:
 
 
 def board_key(board: Board, to_move: Player) -> Key:
-    flat = tuple(v for row in board.grid for v in row)
-    return (int(to_move), flat)
+    return board.hash_key(to_move)
 
 
 def generate_moves(board: Board) -> List[Move]:
@@ -48,18 +65,16 @@ def apply_move(board: Board, player: Player, mv: Move):
     if b2.full():
         return b2, None, True, None
     return b2, None, False, None
-class Node:
-    __slots__ = ("N", "W", "untried", "children")
-
-    def __init__(self, moves: List[Move]):
-        self.N = 0
-        self.W = 0.0
-        self.untried = moves[:]
-        self.children: Dict[Move, Key] = {}
-
-
-TREE: Dict[Key, Node] = {}
+# arbre de recherche : nœuds et arêtes dans les tableaux de POOL, ROOT = clé de la racine
+POOL = NodePool()
 ROOT: Optional[Key] = None
+# racines épinglées par mcts_rebase (lignes de POOL)
+_PINS: List[int] = []
+
+# budget mémoire de l'arbre (octets des tableaux de POOL) ; au-delà, les feuilles les moins visitées sont évincées
+TREE_BUDGET_MB: Optional[float] = 256.0
+# après éviction, l'arbre redescend à cette fraction du budget
+EVICT_TARGET = 0.9
 
 
 def uct_score(parent_N: int, child_W: float, child_N: int, c: float) -> float:
@@ -105,7 +120,8 @@ def heuristic_pick_move(board: Board, player: Player, moves: List[Move]) -> Move
     return max(moves, key=move_center_score)
 
 
-def rollout(board: Board, to_move: Player, max_steps: int = 32) -> int:
+def rollout(board: Board, to_move: Player, max_steps: int = 32, trace: Optional[List[int]] = None) -> int:
+    # trace : si fournie, reçoit les codes des coups joués (joueurs alternés à partir de to_move)
     b = board.copy()
     p = to_move
     steps = 0
@@ -115,6 +131,8 @@ def rollout(board: Board, to_move: Player, max_steps: int = 32) -> int:
             return 0  
         mv = immediate_win_move(b, p, moves)
         if mv is not None:
+            if trace is not None:
+                trace.append(encode_move(*mv))
             b2, winner, terminal, _ = apply_move(b, p, mv)
             return 1 if winner == to_move else (-1 if winner is not None else 0)
 
@@ -122,6 +140,8 @@ def rollout(board: Board, to_move: Player, max_steps: int = 32) -> int:
         if mv is None:
             mv = heuristic_pick_move(b, p, moves)
 
+        if trace is not None:
+            trace.append(encode_move(*mv))
         b2, winner, terminal, _ = apply_move(b, p, mv)
         if terminal:
             if winner is None:
@@ -139,155 +159,631 @@ def rollout(board: Board, to_move: Player, max_steps: int = 32) -> int:
             if ev < 0:
                 return -1
             return 0
+
+
+# poids de tirage des cases pour fast_rollout (centre favorisé, comme heuristic_pick_move)
+_CELL_WEIGHTS = [CENTER_WEIGHTS[i // 6][i % 6] for i in range(36)]
+
+
+def _weighted_cells(empty: int) -> List[int]:
+    # cases vides dans un ordre aléatoire pondéré par _CELL_WEIGHTS
+    cells = []
+    while empty:
+        low = empty & -empty
+        cells.append(low.bit_length() - 1)
+        empty ^= low
+    return sorted(cells, key=lambda i: random.random() ** (1.0 / _CELL_WEIGHTS[i]), reverse=True)
+
+
+def fast_rollout(board: Board, to_move: Player, max_steps: int = 32, trace: Optional[List[int]] = None) -> int:
+    """Same contract as rollout(), on bitboard threat masks instead of move sweeps.
+
+    Wins come from threats.winning_codes and blocks from threats.safe_moves over a weighted
+    random move order, so a ply costs a few mask scans instead of ~288 board copies.
+    """
+    b = board.copy()
+    p = to_move
+    for _ in range(max_steps):
+        empty = ~(b.bits[1] | b.bits[2]) & FULL_MASK
+        if not empty:
+            return 0
+        wins = winning_codes(b, p, first_only=True)
+        if wins:
+            if trace is not None:
+                trace.append(wins[0])
+            return 1 if p == to_move else -1
+        cells = _weighted_cells(empty)
+        opp = opponent(p)
+        if has_winning_move(b, opp):
+            mv = None
+            rots = list(range(8))
+            for i in cells:
+                random.shuffle(rots)
+                safe = safe_moves(b, p, [MOVE_TABLE[i * 8 + k] for k in rots], first_only=True)
+                if safe:
+                    mv = safe[0]
+                    break
+            if mv is None:
+                mv = MOVE_TABLE[cells[0] * 8 + rots[0]]
+        else:
+            mv = MOVE_TABLE[cells[0] * 8 + random.randrange(8)]
+        r, c, q, d = mv
+        if trace is not None:
+            trace.append(encode_move(r, c, q, d))
+        b.make(r, c, q, d, p)
+        if b.fives[p]:
+            return 1 if p == to_move else -1
+        if b.fives[opp]:
+            return 1 if opp == to_move else -1
+        if b.full():
+            return 0
+        p = opp
+    ev = static_eval(b, to_move)
+    if ev > 0:
+        return 1
+    if ev < 0:
+        return -1
+    return 0
+
+
 def mcts_reset() -> None:
-    global TREE, ROOT
-    TREE.clear()
+    global ROOT
+    POOL.clear()
+    _PINS.clear()
     ROOT = None
 
 
+def set_tree_budget(mb: Optional[float]) -> None:
+    global TREE_BUDGET_MB
+    TREE_BUDGET_MB = mb
+
+
+def tree_stats() -> Dict[str, int]:
+    # bytes = mémoire allouée par l'arbre (celle que borne le budget), live_bytes = lignes vivantes
+    return {"nodes": len(POOL), "edges": POOL.edge_live, "bytes": POOL.nbytes, "live_bytes": POOL.used_bytes}
+
+
+def _new_node(key: Key, board: Board, terminal: bool = False) -> int:
+    return POOL.add(key, random.randrange(288), exhausted=terminal or board.full())
+
+
+def _next_untried(node: int, board: Board, sym: int) -> Optional[int]:
+    # prochain coup (code canonique) de la permutation implicite du nœud dont la case est vide
+    j = int(POOL.cursor[node])
+    start = int(POOL.start[node])
+    empty = ~(board.bits[1] | board.bits[2])
+    # après une éviction, le parcours reprend du début en sautant les fils encore présents
+    present = set(POOL.children(node)[0].tolist()) if POOL.rescan[node] else ()
+    while j < 288:
+        code = (start + j * MOVE_STRIDE) % 288
+        j += 1
+        if sym == 0:
+            cell = code >> 3
+        else:
+            r, c, _, _ = from_canonical(MOVE_TABLE[code], sym)
+            cell = r * 6 + c
+        if (empty >> cell) & 1 and code not in present:
+            POOL.cursor[node] = j
+            return code
+    POOL.cursor[node] = j
+    POOL.exhausted[node] = True
+    POOL.rescan[node] = False
+    return None
+
+
 def _prune_unreachable(root_key: Key) -> None:
-    keep: set[Key] = set()
-    stack: List[Key] = [root_key]
-    while stack:
-        k = stack.pop()
-        if k in keep:
-            continue
-        keep.add(k)
-        n = TREE.get(k)
-        if n is None:
-            continue
-        for ck in n.children.values():
-            if ck not in keep:
-                stack.append(ck)
-    for k in list(TREE.keys()):
-        if k not in keep:
-            del TREE[k]
-    for n in TREE.values():
-        n.children = {m: ck for m, ck in n.children.items() if ck in TREE}
+    # reconstruction complète : seulement quand aucune racine n'est épinglée (nœuds orphelins possibles)
+    POOL.compact(POOL.index[root_key])
+    _PINS[:] = [POOL.index[root_key]]
 
 
-def mcts_rebase(board: Board, to_move: Player, prune: bool = True) -> None:
+def mcts_rebase(board: Board, to_move: Player, prune: bool = True, symmetry: bool = False) -> None:
+    # la nouvelle racine est épinglée ; avec prune=True, les anciennes racines sont désépinglées et
+    # seuls les nœuds qu'elles étaient seules à garder sont libérés (coût proportionnel au retrait)
     global ROOT
-    rk = board_key(board, to_move)
-    if rk not in TREE:
-        TREE[rk] = Node(generate_moves(board))
+    rk, sym = position_key(board, to_move, symmetry)
+    if rk not in POOL:
+        _new_node(rk, board)
     ROOT = rk
-    if prune:
+    row = POOL.index[rk]
+    if prune and not _PINS:
         _prune_unreachable(rk)
-        
-def best_move_mcts(
-    board: Board,
-    player_to_move: Player,
-    time_ms: Optional[int] = None,
-    simulations: Optional[int] = None,
-    c_explore: float = 1.414,
-    progress_cb: Optional[Callable[[int], None]] = None,
-) -> Move:
-    root_key = board_key(board, player_to_move)
-    if root_key not in TREE:
-        TREE[root_key] = Node(generate_moves(board))
-
-    deadline = None if time_ms is None else time.time() + time_ms / 1000.0
-    sims_target = simulations if simulations is not None else (10_000 if time_ms is None else 1_000_000_000)
-
-    sims = 0
-    report_every = 200
-    if simulations is not None and sims_target and sims_target > 0:
-        report_every = max(1, sims_target // 100)
+        return
+    if row not in _PINS:
+        POOL.pin(row)
+        _PINS.append(row)
+    if prune:
+        for old in _PINS:
+            if old != row:
+                POOL.unpin(old)
+        _PINS[:] = [row]
+
+
+def _enforce_budget(root_key: Key, budget_mb: Optional[float]) -> int:
+    # le budget porte sur la mémoire allouée (POOL.nbytes), pas seulement sur les lignes vivantes :
+    # _grow ne double plus au-delà du budget, et quand l'allocation le dépasse quand même, on évince
+    # par lots les feuilles les moins visitées jusqu'à EVICT_TARGET puis on compacte pour réduire les
+    # tableaux. Le compactage renumérote les lignes : aucun chemin ne doit être en vol.
+    if budget_mb is None:
+        POOL.max_bytes = None
+        return 0
+    limit = budget_mb * 1024 * 1024
+    POOL.max_bytes = int(limit)
+    if POOL.nbytes <= limit:
+        return 0
+    protect = POOL.index[root_key]
+    freed = 0
+    while POOL.used_bytes > EVICT_TARGET * limit:
+        n = POOL.evict(max(64, len(POOL) // 20), protect)
+        if n == 0:
+            break
+        freed += n
+    if POOL.used_bytes <= EVICT_TARGET * limit:
+        if protect not in _PINS:
+            POOL.pin(protect)
+            _PINS.append(protect)
+        remap = POOL.compact(protect, [p for p in _PINS if p != protect])
+        # compact() recompte les références et épingle une fois chaque racine conservée
+        _PINS[:] = [remap[p] for p in _PINS]
+    return freed
+
+
+def _uct_pick(node: int, c_explore: float, rave_k: float = 0.0) -> Tuple[int, int, int]:
+    # uct_score vectorisé sur le bloc d'arêtes ; à égalité, le premier fils (comme la boucle scalaire).
+    # Exploration sur les visites de l'arête, valeur du fils agrégée sur tous ses parents (DAG) ;
+    # avec rave_k > 0, mélange avec la valeur AMAF, beta = sqrt(k / (3 n + k)).
+    first, count = POOL.block(node)
+    kids = POOL.edge_child[first:first + count]
+    n = POOL.edge_N[first:first + count].astype(np.float64)
+    cn = POOL.N[kids].astype(np.float64)
+    q = np.where(cn > 0, POOL.W[kids] / np.maximum(cn, 1.0), POOL.edge_W[first:first + count] / np.maximum(n, 1.0))
+    if rave_k > 0.0:
+        an = POOL.edge_AN[first:first + count]
+        beta = np.where(an > 0, np.sqrt(rave_k / (3.0 * n + rave_k)), 0.0)
+        q = (1.0 - beta) * q + beta * POOL.edge_AW[first:first + count] / np.maximum(an, 1)
+    explore = c_explore * np.sqrt(max(1.0, math.log(int(POOL.N[node]) + 1)) / np.maximum(n, 1.0))
+    scores = np.where(n == 0, np.inf, q + explore)
+    k = int(scores.argmax())
+    return int(POOL.edge_move[first + k]), int(kids[k]), first + k
+
+
+def _select_expand(board: Board,
+                   player_to_move: Player,
+                   root_key: Key,
+                   root_sym: int,
+                   c_explore: float,
+                   symmetry: bool,
+                   virtual_loss: float = 0.0,
+                   rave_k: float = 0.0):
+    # sélection UCT puis expansion d'un coup non essayé ; renvoie le chemin parcouru
+    # (parent, arête, fils, signe du joueur au trait vu de la racine, symétrie du parent),
+    # les arêtes ayant reçu la perte virtuelle, et la position atteinte
+    path: List[Tuple[int, int, int, int, int]] = []
+    vpath: List[int] = []
+    cur_board = board.copy()
+    cur_player = player_to_move
+    node = POOL.index[root_key]
+    sym = root_sym
+    terminal = False
+    winner = None
 
     while True:
-        if deadline is not None and time.time() > deadline:
+        code = None if POOL.exhausted[node] else _next_untried(node, cur_board, sym)
+        if code is not None:
+            # expansion
+            b2, winner, terminal, _ = apply_move(cur_board, cur_player, from_canonical(MOVE_TABLE[code], sym))
+            next_player = opponent(cur_player)
+            child_key, child_sym = position_key(b2, next_player if not terminal else cur_player, symmetry)
+            child = POOL.index.get(child_key)
+            if child is None:
+                child = _new_node(child_key, b2, terminal)
+            edge = POOL.add_edge(node, code, child, 8 * (36 - cur_board.stones(Player.BLACK).bit_count()
+                                                         - cur_board.stones(Player.WHITE).bit_count()))
+            path.append((node, edge, child, 1 if cur_player == player_to_move else -1, sym))
+            cur_board = b2
+            cur_player = next_player
             break
-        if sims >= sims_target:
+        if POOL.n_children[node] == 0:
             break
-        sims += 1
-
-        if progress_cb and (sims % report_every == 0):
-            try:
-                progress_cb(sims)
-            except Exception:
-                pass
-
-        path: List[Tuple[Key, Move]] = []
-        cur_board = board.copy()
-        cur_player = player_to_move
-        key = root_key
-        node = TREE[key]
-        terminal = False
-        winner = None
-
-        while not node.untried and node.children:
-            best = None
-            best_m = None
-            for m, ck in node.children.items():
-                ch = TREE[ck]
-                s = uct_score(node.N, ch.W, ch.N, c_explore)
-                if best is None or s > best:
-                    best = s
-                    best_m = m
-            mv = best_m
-            path.append((key, mv))
-            cur_board, winner, terminal, _ = apply_move(cur_board, cur_player, mv)  # type: ignore
-            if terminal:
-                break
-            cur_player = opponent(cur_player)
-            key = board_key(cur_board, cur_player)
-            if key not in TREE:
-                TREE[key] = Node(generate_moves(cur_board))
-            node = TREE[key]
-
-        if not terminal:
-            if node.untried:
-                mv = node.untried.pop(random.randrange(len(node.untried)))
-                b2, winner, terminal, _ = apply_move(cur_board, cur_player, mv)
-                path.append((key, mv))
-                next_player = opponent(cur_player)
-                child_key = board_key(b2, next_player if not terminal else cur_player)
-                node.children[mv] = child_key
-                if child_key not in TREE:
-                    TREE[child_key] = Node([] if terminal else generate_moves(b2))
-                cur_board = b2
-                cur_player = next_player
-                key = child_key
-                node = TREE[key]
-
+        code, child, edge = _uct_pick(node, c_explore, rave_k)
+        path.append((node, edge, child, 1 if cur_player == player_to_move else -1, sym))
+        if virtual_loss:
+            # perte virtuelle : les autres workers voient cette arête et ce fils comme déjà visités et perdus
+            POOL.edge_N[edge] += 1
+            POOL.edge_W[edge] -= virtual_loss
+            POOL.N[child] += 1
+            POOL.W[child] -= virtual_loss
+            vpath.append(edge)
+        cur_board, winner, terminal, _ = apply_move(cur_board, cur_player, from_canonical(MOVE_TABLE[code], sym))
         if terminal:
-            if winner is None:
-                reward = 0
-            elif winner == player_to_move:
-                reward = 1
-            else:
-                reward = -1
-        else:
-            reward = rollout(cur_board, cur_player)
+            break
+        cur_player = opponent(cur_player)
+        _, sym = position_key(cur_board, cur_player, symmetry)
+        node = child
+    return path, vpath, cur_board, cur_player, terminal, winner
 
-        for nk, _ in path:
-            n = TREE[nk]
-            n.N += 1
-            n.W += reward
 
+def _reward(cur_board: Board, cur_player: Player, player_to_move: Player, terminal: bool, winner,
+            fast_rollouts: bool = True, playouts: int = 0, trace: Optional[List[int]] = None) -> float:
+    if terminal:
+        if winner is None:
+            return 0
+        return 1 if winner == player_to_move else -1
+    # les rollouts notent la partie pour cur_player : on ramène le résultat au point de vue de la racine
+    sign = 1 if cur_player == player_to_move else -1
+    if playouts > 0:
+        # moyenne de K parties aléatoires jouées en un seul lot NumPy
+        rng = np.random.default_rng(random.getrandbits(64))
+        return sign * float(run_playouts(board_cells(cur_board), cur_player, playouts, rng=rng).mean())
+    if fast_rollouts:
+        return sign * fast_rollout(cur_board, cur_player, trace=trace)
+    return sign * rollout(cur_board, cur_player, trace=trace)
+
+
+def _backprop(path: List[Tuple[int, int, int, int, int]], vpath: List[int], reward: float,
+              virtual_loss: float = 0.0) -> None:
+    # statistiques d'arête et de nœud du point de vue du joueur qui a joué le coup (reward est vu
+    # de la racine) ; la racine ne compte que ses visites
+    for e in vpath:
+        ch = int(POOL.edge_child[e])
+        POOL.edge_N[e] -= 1
+        POOL.edge_W[e] += virtual_loss
+        POOL.N[ch] -= 1
+        POOL.W[ch] += virtual_loss
+    if path:
+        POOL.N[path[0][0]] += 1
+    for _, edge, child, sign, _ in path:
+        POOL.edge_N[edge] += 1
+        POOL.edge_W[edge] += sign * reward
+        POOL.N[child] += 1
+        POOL.W[child] += sign * reward
+
+
+def _amaf(path: List[Tuple[int, int, int, int, int]], rollout_moves: List[int], rollout_sign: int,
+          reward: float) -> None:
+    # AMAF : pour chaque nœud du chemin, crédite les arêtes dont le coup est joué plus loin dans la
+    # simulation (arbre puis rollout) par le même joueur. Coups exprimés dans le repère réel puis
+    # ramenés dans le repère canonique de chaque nœud.
+    seq = [(encode_move(*from_canonical(MOVE_TABLE[int(POOL.edge_move[e])], sym)) if sym else int(POOL.edge_move[e]),
+            sign) for _, e, _, sign, sym in path]
+    seq += [(code, rollout_sign if k % 2 == 0 else -rollout_sign) for k, code in enumerate(rollout_moves)]
+    for i, (node, _, _, sign, sym) in enumerate(path):
+        later = [code for code, s in seq[i:] if s == sign]
+        if sym:
+            later = [encode_move(*to_canonical(MOVE_TABLE[code], sym)) for code in later]
+        first, count = POOL.block(node)
+        hit = first + np.flatnonzero(np.isin(POOL.edge_move[first:first + count], later))
+        POOL.edge_AN[hit] += 1
+        POOL.edge_AW[hit] += sign * reward
+
+
+def _report(progress_cb: Optional[Callable[[int], None]], sims: int) -> None:
     if progress_cb:
         try:
             progress_cb(sims)
         except Exception:
             pass
 
-    root = TREE[root_key]
-    if not root.children:
-        moves = generate_moves(board)
-        return moves[0]
 
+def _budget(time_ms: Optional[int], simulations: Optional[int]) -> Tuple[Optional[float], int, int]:
+    deadline = None if time_ms is None else time.time() + time_ms / 1000.0
+    sims_target = simulations if simulations is not None else (10_000 if time_ms is None else 1_000_000_000)
+    report_every = 200
+    if simulations is not None and sims_target and sims_target > 0:
+        report_every = max(1, sims_target // 100)
+    return deadline, sims_target, report_every
+
+
+def _root_stats(root_key: Key, root_sym: int) -> Dict[Move, Tuple[int, float]]:
+    # (N, W) des arêtes de la racine, coups dans le repère réel
+    out: Dict[Move, Tuple[int, float]] = {}
+    first, count = POOL.block(POOL.index[root_key])
+    for e in range(first, first + count):
+        mv = from_canonical(MOVE_TABLE[int(POOL.edge_move[e])], root_sym)
+        out[mv] = (int(POOL.edge_N[e]), float(POOL.edge_W[e]))
+    return out
+
+
+def root_visits(board: Board, to_move: Player, symmetry: bool = False) -> np.ndarray:
+    """(288,) edge visits of the root after best_move_mcts, indexed by real-frame move code."""
+    out = np.zeros(288, dtype=np.int64)
+    key, sym = position_key(board, to_move, symmetry)
+    if key in POOL:
+        for mv, (n, _) in _root_stats(key, sym).items():
+            out[encode_move(*mv)] = n
+    return out
+
+
+def _pick(stats: Dict[Move, Tuple[int, float]], board: Board) -> Move:
     best_mv = None
     best_q = -float("inf")
-    for m, ck in root.children.items():
-        n = TREE[ck]
-        if n.N > 0:
-            q = n.W / n.N
+    for m, (n, w) in stats.items():
+        if n > 0:
+            q = w / n
             if q > best_q:
                 best_q = q
                 best_mv = m
-
     if best_mv is None:
-        moves = generate_moves(board)
-        best_mv = moves[0]
-    return best_mv  # type: ignore
\ No newline at end of file
+        return generate_moves(board)[0]
+    return best_mv
+
+
+def best_move_mcts(
+    board: Board,
+    player_to_move: Player,
+    time_ms: Optional[int] = None,
+    simulations: Optional[int] = None,
+    c_explore: float = 1.414,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    symmetry: bool = False,
+    parallel: Optional[str] = None,
+    workers: int = 1,
+    virtual_loss: float = VIRTUAL_LOSS,
+    fast_rollouts: bool = True,
+    playouts: int = 0,
+    tree_mb: Optional[float] = None,
+    rave: bool = False,
+    rave_k: float = RAVE_K,
+    book: bool = True,
+) -> Move:
+    # avec symmetry=True, les nœuds sont indexés par la position canonique et
+    # leurs coups exprimés dans le repère canonique (sym = transformation vers ce repère)
+    # parallel="root" : arbres indépendants dans un pool de processus, statistiques de la racine
+    # fusionnées (une recherche à la fois) ; parallel="tree" : threads sur l'arbre partagé, avec perte
+    # virtuelle, toujours avec des playouts NumPy (TREE_PLAYOUTS si playouts=0) à cause du GIL.
+    # playouts=K : chaque feuille est évaluée par K parties aléatoires en lot (voir playout.py)
+    # tree_mb : budget mémoire de l'arbre (TREE_BUDGET_MB par défaut, None = sans limite)
+    # rave=True : valeurs AMAF mêlées à l'UCT, poids rave_k (voir _uct_pick)
+    # book=True : une position du livre d'ouvertures est jouée sans recherche
+    if parallel not in (None, "root", "tree"):
+        raise ValueError(f"unknown parallel mode: {parallel}")
+    if book:
+        mv = book_move(board, player_to_move)
+        if mv is not None:
+            return mv
+    budget_mb = TREE_BUDGET_MB if tree_mb is None else tree_mb
+    rave_k = rave_k if rave else 0.0
+    if parallel == "root" and workers > 1:
+        return _best_move_root_parallel(board, player_to_move, time_ms, simulations, c_explore,
+                                        progress_cb, symmetry, workers, fast_rollouts, playouts, budget_mb,
+                                        rave_k)
+    root_key, root_sym = position_key(board, player_to_move, symmetry)
+    if root_key not in POOL:
+        _new_node(root_key, board)
+
+    deadline, sims_target, report_every = _budget(time_ms, simulations)
+    if parallel == "tree" and workers > 1:
+        sims = _run_tree_parallel(board, player_to_move, root_key, root_sym, deadline, sims_target,
+                                  report_every, c_explore, progress_cb, symmetry, workers, virtual_loss,
+                                  fast_rollouts, playouts or TREE_PLAYOUTS, budget_mb, rave_k)
+    else:
+        sims = _run(board, player_to_move, root_key, root_sym, deadline, sims_target, report_every,
+                    c_explore, progress_cb, symmetry, fast_rollouts, playouts, budget_mb, rave_k)
+
+    _report(progress_cb, sims)
+
+    if not POOL.n_children[POOL.index[root_key]]:
+        return generate_moves(board)[0]
+    return _pick(_root_stats(root_key, root_sym), board)
+
+
+def _run(board: Board,
+         player_to_move: Player,
+         root_key: Key,
+         root_sym: int,
+         deadline: Optional[float],
+         sims_target: int,
+         report_every: int,
+         c_explore: float,
+         progress_cb: Optional[Callable[[int], None]],
+         symmetry: bool,
+         fast_rollouts: bool = True,
+         playouts: int = 0,
+         budget_mb: Optional[float] = None,
+         rave_k: float = 0.0) -> int:
+    sims = 0
+    while True:
+        if deadline is not None and time.time() > deadline:
+            break
+        if sims >= sims_target:
+            break
+        sims += 1
+        _enforce_budget(root_key, budget_mb)
+
+        if sims % report_every == 0:
+            _report(progress_cb, sims)
+
+        path, vpath, cur_board, cur_player, terminal, winner = _select_expand(
+            board, player_to_move, root_key, root_sym, c_explore, symmetry, 0.0, rave_k)
+        trace: Optional[List[int]] = [] if rave_k else None
+        reward = _reward(cur_board, cur_player, player_to_move, terminal, winner, fast_rollouts, playouts, trace)
+        _backprop(path, vpath, reward)
+        if rave_k:
+            _amaf(path, trace, 1 if cur_player == player_to_move else -1, reward)
+    return sims
+
+
+def _run_tree_parallel(board: Board,
+                       player_to_move: Player,
+                       root_key: Key,
+                       root_sym: int,
+                       deadline: Optional[float],
+                       sims_target: int,
+                       report_every: int,
+                       c_explore: float,
+                       progress_cb: Optional[Callable[[int], None]],
+                       symmetry: bool,
+                       workers: int,
+                       virtual_loss: float,
+                       fast_rollouts: bool = True,
+                       playouts: int = 0,
+                       budget_mb: Optional[float] = None,
+                       rave_k: float = 0.0) -> int:
+    # sélection/expansion et rétropropagation sous verrou ; les rollouts tournent hors verrou.
+    # L'éviction attend qu'aucune simulation ne soit en vol : un chemin en cours ne doit pas
+    # pointer vers une ligne libérée puis réutilisée.
+    cond = threading.Condition()
+    done = [0]
+    inflight = [0]
+
+    def _worker() -> None:
+        while True:
+            with cond:
+                while inflight[0] and budget_mb is not None and POOL.nbytes > budget_mb * 1024 * 1024:
+                    cond.wait()
+                _enforce_budget(root_key, budget_mb)
+                if deadline is not None and time.time() > deadline:
+                    return
+                if done[0] >= sims_target:
+                    return
+                done[0] += 1
+                if done[0] % report_every == 0:
+                    _report(progress_cb, done[0])
+                path, vpath, cur_board, cur_player, terminal, winner = _select_expand(
+                    board, player_to_move, root_key, root_sym, c_explore, symmetry, virtual_loss, rave_k)
+                inflight[0] += 1
+            trace: Optional[List[int]] = [] if rave_k else None
+            reward = _reward(cur_board, cur_player, player_to_move, terminal, winner, fast_rollouts, playouts,
+                             trace)
+            with cond:
+                _backprop(path, vpath, reward, virtual_loss)
+                if rave_k:
+                    _amaf(path, trace, 1 if cur_player == player_to_move else -1, reward)
+                inflight[0] -= 1
+                if not inflight[0]:
+                    cond.notify_all()
+
+    threads = [threading.Thread(target=_worker, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return done[0]
+
+
+# --- parallélisme à la racine : un arbre indépendant par processus, fusion des visites de la racine
+_POOL: Dict[str, object] = {}
+# une seule recherche à la racine à la fois : le pool et son compteur sont communs, et le pool
+# n'est reconstruit (nombre de workers changé) que verrou tenu
+_POOL_LOCK = threading.Lock()
+
+
+def _pool_init(counter) -> None:
+    _POOL["counter"] = counter
+
+
+def _root_worker(job: tuple) -> Tuple[int, Dict[int, Tuple[int, float]]]:
+    (black, white, player, time_ms, simulations, c_explore, symmetry, fast_rollouts, playouts, budget_mb,
+     rave_k, seed) = job
+    random.seed(seed)
+    mcts_reset()
+    counter = _POOL["counter"]
+    board = Board.from_bits(black, white)
+    player = Player(player)
+    root_key, root_sym = position_key(board, player, symmetry)
+    _new_node(root_key, board)
+    deadline, sims_target, _ = _budget(time_ms, simulations)
+    last = [0]
+
+    def _count(sims: int) -> None:
+        with counter.get_lock():
+            counter.value += sims - last[0]
+        last[0] = sims
+
+    sims = _run(board, player, root_key, root_sym, deadline, sims_target, 50, c_explore, _count, symmetry,
+                fast_rollouts, playouts, budget_mb, rave_k)
+    _count(sims)
+    stats = {encode_move(*m): nw for m, nw in _root_stats(root_key, root_sym).items()}
+    mcts_reset()
+    return sims, stats
+
+
+def _root_pool(workers: int):
+    # appelé sous _POOL_LOCK
+    if _POOL.get("workers") == workers:
+        return _POOL["pool"], _POOL["counter"]
+    _pool_close()
+    ctx = multiprocessing.get_context()
+    counter = ctx.Value("q", 0)
+    pool = ctx.Pool(workers, initializer=_pool_init, initargs=(counter,))
+    _POOL.update(workers=workers, pool=pool, counter=counter)
+    return pool, counter
+
+
+def mcts_pool_shutdown() -> None:
+    with _POOL_LOCK:
+        _pool_close()
+
+
+def _pool_close() -> None:
+    if "pool" not in _POOL:
+        return
+    _POOL["pool"].terminate()
+    _POOL["pool"].join()
+    _POOL.clear()
+
+
+atexit.register(mcts_pool_shutdown)
+
+
+def _best_move_root_parallel(board: Board,
+                             player_to_move: Player,
+                             time_ms: Optional[int],
+                             simulations: Optional[int],
+                             c_explore: float,
+                             progress_cb: Optional[Callable[[int], None]],
+                             symmetry: bool,
+                             workers: int,
+                             fast_rollouts: bool,
+                             playouts: int,
+                             budget_mb: Optional[float] = None,
+                             rave_k: float = 0.0) -> Move:
+    with _POOL_LOCK:
+        return _run_root_parallel(board, player_to_move, time_ms, simulations, c_explore, progress_cb, symmetry,
+                                  workers, fast_rollouts, playouts, budget_mb, rave_k)
+
+
+def _run_root_parallel(board: Board,
+                       player_to_move: Player,
+                       time_ms: Optional[int],
+                       simulations: Optional[int],
+                       c_explore: float,
+                       progress_cb: Optional[Callable[[int], None]],
+                       symmetry: bool,
+                       workers: int,
+                       fast_rollouts: bool,
+                       playouts: int,
+                       budget_mb: Optional[float] = None,
+                       rave_k: float = 0.0) -> Move:
+    pool, counter = _root_pool(workers)
+    with counter.get_lock():
+        counter.value = 0
+    # budget de simulations réparti entre les workers ; le budget temps s'applique à chacun
+    shares = None if simulations is None else [simulations // workers + (k < simulations % workers)
+                                               for k in range(workers)]
+    if shares is None and time_ms is None:
+        shares = [10_000 // workers] * workers
+    seed = random.getrandbits(32)
+    pending = [pool.apply_async(_root_worker, ((board.bits[1], board.bits[2], int(player_to_move), time_ms,
+                                                None if shares is None else shares[k], c_explore, symmetry,
+                                                fast_rollouts, playouts, budget_mb, rave_k, seed + k),))
+               for k in range(workers)]
+    merged: Dict[Move, Tuple[int, float]] = {}
+    sims = 0
+    while pending:
+        pending[0].wait(0.05)
+        still = []
+        for r in pending:
+            if r.ready():
+                n_sims, stats = r.get()
+                sims += n_sims
+                for code, (n, w) in stats.items():
+                    n0, w0 = merged.get(MOVE_TABLE[code], (0, 0.0))
+                    merged[MOVE_TABLE[code]] = (n0 + n, w0 + w)
+            else:
+                still.append(r)
+        pending = still
+        if pending:
+            _report(progress_cb, counter.value)
+    _report(progress_cb, sims)
+    return _pick(merged, board)
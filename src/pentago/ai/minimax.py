@@ -1,12 +1,28 @@
 import time
 import math
+import random
+import atexit
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
 from typing import List, Tuple, Optional, Dict, Callable
-from ..board import Board, Player, Quadrant, Direction
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, encode_move
+from ..symmetry import position_key, to_canonical, from_canonical
+from .tt import TranspositionTable
+from .book import book_move
+from . import endgame as _endgame
+from . import poscache as _poscache
+from .batch import board_cells, evaluate_children, has_winning_move_batch, has_safe_move
+from ..threats import winning_codes, has_winning_move, safe_moves
 
 Move = Tuple[int, int, Quadrant, Direction]
 
-TTEntry = Tuple[int, int, int, Optional[Move]]
-TT: Dict[Tuple[int, Tuple[int, ...]], TTEntry] = {}
+TT_DEFAULT_MB = 64
+# allouée à la première recherche (_tt) : importer le module ne réserve pas TT_DEFAULT_MB
+TT: Optional[TranspositionTable] = None
+_TT_MB: float = TT_DEFAULT_MB
+# table de la dernière recherche (TT locale, ou TT partagée de Lazy SMP) : source de tt_fill / tt_collisions
+_STATS_TT: Optional[TranspositionTable] = None
 
 STATS: Dict[str, int] = {
     "nodes": 0,
@@ -15,26 +31,85 @@ STATS: Dict[str, int] = {
     "tt_hit": 0,
     "cuts": 0,
     "leaf_terminal": 0,
+    "tt_fill": 0,
+    "tt_collisions": 0,
+    "pvs_research": 0,
+    "asp_fail": 0,
+    "cut_first": 0,
+    "cut_killer": 0,
+    "threat_wins": 0,
+    "threat_blocks": 0,
+    "threat_ext": 0,
+    "eg_solved": 0,
+    "eg_nodes": 0,
+    "pc_hit": 0,
+    "pc_store": 0,
 }
 
+# drapeau d'arrêt : octet local, ou en mémoire partagée dans les workers Lazy SMP
+_STOP = bytearray(1)
+
+MAX_PLY = 64
+# deux coups "killer" par ply, et historique indexé par encode_move (case, quadrant, sens)
+KILLERS: List[List[Optional[Move]]] = [[None, None] for _ in range(MAX_PLY)]
+HISTORY: List[int] = [0] * 288
+
 def reset_stats() -> None:
+    global _STATS_TT
+    _STATS_TT = None
     STATS["nodes"] = 0
     STATS["evals"] = 0
     STATS["tt_probe"] = 0
     STATS["tt_hit"] = 0
     STATS["cuts"] = 0
     STATS["leaf_terminal"] = 0
-    TT.clear()
+    STATS["pvs_research"] = 0
+    STATS["asp_fail"] = 0
+    STATS["cut_first"] = 0
+    STATS["cut_killer"] = 0
+    STATS["threat_wins"] = 0
+    STATS["threat_blocks"] = 0
+    STATS["threat_ext"] = 0
+    STATS["eg_solved"] = 0
+    STATS["eg_nodes"] = 0
+    STATS["pc_hit"] = 0
+    STATS["pc_store"] = 0
+    for k in KILLERS:
+        k[0] = k[1] = None
+    for i in range(288):
+        HISTORY[i] = 0
+    if TT is not None:
+        TT.clear()
+    with _SMP_LOCK:
+        if "tt" in _SMP:
+            _SMP["tt"].clear()
+    _tt_stats()
 
 def stats_snapshot() -> Dict[str, int]:
+    _tt_stats()
     return dict(STATS)
 
+def set_tt_size(mb: float) -> None:
+    global TT, _TT_MB, _STATS_TT
+    TT = _STATS_TT = None
+    _TT_MB = mb
+    _tt_stats()
+
+def _tt() -> TranspositionTable:
+    global TT
+    if TT is None:
+        TT = TranspositionTable(_TT_MB)
+    return TT
+
+def _tt_stats() -> None:
+    tt = TT if _STATS_TT is None else _STATS_TT
+    STATS.update(tt.stats() if tt is not None else {"tt_fill": 0, "tt_collisions": 0})
+
 def opponent(p: Player) -> Player:
     return Player.BLACK if p == Player.WHITE else Player.WHITE
 
-def board_key(board: Board, to_move: Player) -> Tuple[int, Tuple[int, ...]]:
-    flat = tuple(v for row in board.grid for v in row)
-    return (int(to_move), flat)
+def board_key(board: Board, to_move: Player) -> int:
+    return board.hash_key(to_move)
 
 def generate_moves(board: Board) -> List[Move]:
     out: List[Move] = []
@@ -49,26 +124,35 @@ def generate_moves(board: Board) -> List[Move]:
         out.append((r, c, Quadrant.Q11, Direction.CCW))
     return out
 
-def apply_move(board: Board, player: Player, mv: Move) -> Tuple[Board, Optional[Player], bool]:
+def make_move(board: Board, player: Player, mv: Move) -> Tuple[Optional[Player], bool]:
     r, c, q, d = mv
-    b2 = board.copy()
-    b2.place(r, c, player)
-    b2.rotate(q, d)
-    cur = b2.check_five(player)
-    opp = b2.check_five(opponent(player))
+    board.make(r, c, q, d, player)
+    cur = board.check_five(player)
+    opp = board.check_five(opponent(player))
     if cur and opp:
         STATS["leaf_terminal"] += 1
-        return b2, player, True
+        return player, True
     if cur:
         STATS["leaf_terminal"] += 1
-        return b2, player, True
+        return player, True
     if opp:
         STATS["leaf_terminal"] += 1
-        return b2, opponent(player), True
-    if b2.full():
+        return opponent(player), True
+    if board.full():
         STATS["leaf_terminal"] += 1
-        return b2, None, True
-    return b2, None, False
+        return None, True
+    return None, False
+
+def unmake_move(board: Board, mv: Move) -> None:
+    r, c, q, d = mv
+    board.unmake(r, c, q, d)
+
+def apply_move(board: Board, player: Player, mv: Move) -> Tuple[Board, Optional[Player], bool]:
+    b2 = board.copy()
+    winner, terminal = make_move(b2, player, mv)
+    return b2, winner, terminal
+
+ASPIRATION_WINDOW = 250
 
 CENTER_WEIGHTS = [
     [1, 2, 3, 3, 2, 1],
@@ -79,43 +163,54 @@ CENTER_WEIGHTS = [
     [1, 2, 3, 3, 2, 1],
 ]
 
-def order_moves(board: Board, player: Player, moves: List[Move], tt_best: Optional[Move]) -> List[Move]:
-    if tt_best is not None:
-        moves = [tt_best] + [m for m in moves if m != tt_best]
-        return moves
+def order_moves(board: Board,
+                player: Player,
+                moves: List[Move],
+                tt_best: Optional[Move],
+                ply: Optional[int] = None) -> List[Move]:
+    front: List[Move] = []
+    if tt_best is not None and board.at(tt_best[0], tt_best[1]) == 0:
+        front.append(tt_best)
+    if ply is not None and ply < MAX_PLY:
+        for k in KILLERS[ply]:
+            if k is not None and k not in front and board.at(k[0], k[1]) == 0:
+                front.append(k)
+    hist = HISTORY
     def score(m: Move) -> int:
         r, c, q, d = m
-        return CENTER_WEIGHTS[r][c]
-    return sorted(moves, key=score, reverse=True)
+        return hist[(r * 6 + c) * 8 + q * 2 + (d < 0)] * 8 + CENTER_WEIGHTS[r][c]
+    ordered = sorted(moves, key=score, reverse=True)
+    if not front:
+        return ordered
+    return front + [m for m in ordered if m not in front]
+
+def record_cutoff(mv: Move, depth: int, ply: int) -> None:
+    if ply < MAX_PLY:
+        slots = KILLERS[ply]
+        if slots[0] != mv:
+            slots[1] = slots[0]
+            slots[0] = mv
+    r, c, q, d = mv
+    HISTORY[(r * 6 + c) * 8 + q * 2 + (d < 0)] += depth * depth
+
+def age_history() -> None:
+    for i in range(288):
+        HISTORY[i] >>= 1
+    for k in KILLERS:
+        k[0] = k[1] = None
 
 def segment_score(board: Board, player: Player) -> int:
-    me = int(player)
-    you = int(opponent(player))
-    s = 0
-    for seg in Board.SEGMENTS:
-        mc = 0
-        yc = 0
-        for r, c in seg:
-            v = board.grid[r][c]
-            if v == me:
-                mc += 1
-            elif v == you:
-                yc += 1
-        if yc == 0 and mc > 0:
-            s += 10 ** mc
-        elif mc == 0 and yc > 0:
-            s -= 10 ** yc
-    return s
+    # somme tenue à jour par le plateau (voir Board.seg), du point de vue de noir
+    return board.score if player == Player.BLACK else -board.score
 
 def evaluate(board: Board, player_to_maximize: Player) -> int:
     STATS["evals"] += 1
-    me = player_to_maximize
-    you = opponent(me)
-    if board.check_five(me):
+    fives = board.fives
+    if fives[player_to_maximize]:
         return 1_000_000_000
-    if board.check_five(you):
+    if fives[3 - player_to_maximize]:
         return -1_000_000_000
-    return segment_score(board, me)
+    return segment_score(board, player_to_maximize)
 
 # --- petit utilitaire de report temps → callback
 def _maybe_report(progress_cb: Optional[Callable[[int], None]],
@@ -133,6 +228,74 @@ def _maybe_report(progress_cb: Optional[Callable[[int], None]],
         except Exception:
             pass
 
+WIN = 1_000_000_000
+
+def _tactical(board: Board, player_to_move: Player, player_to_maximize: Player) -> Optional[int]:
+    # extension tactique d'un coup : victoire immédiate, ou menace adverse impossible à parer
+    sign = 1 if player_to_move == player_to_maximize else -1
+    if has_winning_move(board, player_to_move):
+        STATS["threat_wins"] += 1
+        return sign * (WIN - 10_000)
+    if has_winning_move(board, opponent(player_to_move)):
+        STATS["threat_ext"] += 1
+        if not safe_moves(board, player_to_move, generate_moves(board), first_only=True):
+            return -sign * (WIN - 10_001)
+    return None
+
+def _horizon(board: Board, player_to_move: Player, player_to_maximize: Player) -> int:
+    val = _tactical(board, player_to_move, player_to_maximize)
+    if val is None:
+        return evaluate(board, player_to_maximize)
+    return val
+
+def _search_frontier(board: Board,
+                     player_to_move: Player,
+                     player_to_maximize: Player,
+                     moves: List[Move],
+                     alpha: int,
+                     beta: int,
+                     threats: bool) -> Tuple[int, Optional[Move]]:
+    # nœud à profondeur 1 : tous les fils sont générés et évalués en un seul lot NumPy
+    STATS["nodes"] += len(moves)
+    codes = [encode_move(*mv) for mv in moves]
+    scores, terminal, children = evaluate_children(board_cells(board), player_to_move,
+                                                   player_to_maximize, codes, WIN - (10_000 - 1))
+    vals = scores.tolist()
+    done = terminal.tolist()
+    STATS["leaf_terminal"] += sum(done)
+    STATS["evals"] += len(vals) - sum(done)
+    if threats:
+        # même extension que _tactical, mais les deux tests de victoire immédiate sont vectorisés
+        nxt = opponent(player_to_move)
+        sign = 1 if nxt == player_to_maximize else -1
+        live = ~terminal
+        wins = (live & has_winning_move_batch(children, int(nxt))).tolist()
+        threatened = (live & has_winning_move_batch(children, int(player_to_move))).tolist()
+        for i in range(len(moves)):
+            if wins[i]:
+                STATS["threat_wins"] += 1
+                vals[i] = sign * (WIN - 10_000)
+        # l'extension ne fait que promouvoir un fils en victoire forcée pour le joueur au trait :
+        # inutile de la chercher si un fils gagne déjà directement ou si le nœud coupe déjà
+        # (la valeur renvoyée reste alors une borne correcte), et une seule suffit
+        target = -sign * (WIN - 10_001)
+        if sign < 0:
+            cut = max(vals) >= beta
+        else:
+            cut = min(vals) <= alpha
+        if not cut and not any(v * sign <= -(WIN - 10_000) for v in vals):
+            for i, mv in enumerate(moves):
+                if threatened[i] and not wins[i]:
+                    STATS["threat_ext"] += 1
+                    if not has_safe_move(children[i], int(nxt)):
+                        vals[i] = target
+                        break
+    if player_to_move == player_to_maximize:
+        best = max(vals)
+    else:
+        best = min(vals)
+    return best, moves[vals.index(best)]
+
 def search(board: Board,
            player_to_move: Player,
            player_to_maximize: Player,
@@ -145,19 +308,27 @@ def search(board: Board,
            start_ts: float,
            nodes0: int,
            last_report: List[int],
-           report_every_nodes: int) -> int:
+           report_every_nodes: int,
+           symmetry: bool = False,
+           pvs: bool = True,
+           ply: int = 0,
+           threats: bool = True,
+           batch_eval: bool = False) -> int:
     STATS["nodes"] += 1
-    if deadline is not None and time.time() > deadline:
+    if _STOP[0] or (deadline is not None and time.time() > deadline):
         return evaluate(board, player_to_maximize)
     if depth == 0:
+        if threats:
+            return _horizon(board, player_to_move, player_to_maximize)
         return evaluate(board, player_to_maximize)
 
     _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
 
-    key = board_key(board, player_to_move)
+    key, sym = position_key(board, player_to_move, symmetry)
     STATS["tt_probe"] += 1
-    if key in TT:
-        tt_depth, tt_val, tt_flag, tt_move = TT[key]
+    entry = TT.probe(key)
+    if entry is not None:
+        tt_depth, tt_val, tt_flag, tt_move = entry
         if tt_depth >= depth:
             STATS["tt_hit"] += 1
             if tt_flag == 0:
@@ -166,16 +337,55 @@ def search(board: Board,
                 return tt_val
             if tt_flag > 0 and tt_val >= beta:
                 return tt_val
-        moves = order_moves(board, player_to_move, generate_moves(board), tt_move)
+        if tt_move is not None:
+            tt_move = from_canonical(tt_move, sym)
     else:
-        moves = order_moves(board, player_to_move, generate_moves(board), None)
+        tt_move = None
+
+    if threats:
+        sign = 1 if player_to_move == player_to_maximize else -1
+        wins = winning_codes(board, player_to_move, first_only=True)
+        if wins:
+            STATS["threat_wins"] += 1
+            val = sign * (WIN - (10_000 - depth))
+            TT.store(key, depth, val, 0, to_canonical(MOVE_TABLE[wins[0]], sym))
+            return val
+    moves = order_moves(board, player_to_move, generate_moves(board), tt_move, ply)
+    if threats and has_winning_move(board, opponent(player_to_move)):
+        # seuls les coups qui parent toutes les menaces adverses restent
+        STATS["threat_blocks"] += 1
+        moves = safe_moves(board, player_to_move, moves)
+        if not moves:
+            val = -sign * (WIN - (10_000 - (depth - 1)))
+            TT.store(key, depth, val, 0, None)
+            return val
+
+    if batch_eval and depth == 1:
+        best, best_mv = _search_frontier(board, player_to_move, player_to_maximize, moves,
+                                         alpha, beta, threats)
+        flag = 0
+        if best <= alpha:
+            flag = -1
+        elif best >= beta:
+            flag = 1
+        if flag == (1 if player_to_move == player_to_maximize else -1):
+            STATS["cuts"] += 1
+            record_cutoff(best_mv, depth, ply)
+        TT.store(key, depth, best, flag, to_canonical(best_mv, sym))
+        return best
+
+    def _child(a: float, b: float) -> int:
+        return search(board, opponent(player_to_move), player_to_maximize, depth - 1, a, b, deadline,
+                      progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0,
+                      last_report=last_report, report_every_nodes=report_every_nodes,
+                      symmetry=symmetry, pvs=pvs, ply=ply + 1, threats=threats, batch_eval=batch_eval)
 
     if player_to_move == player_to_maximize:
         best = -math.inf
         best_mv: Optional[Move] = None
         a0 = alpha
-        for mv in moves:
-            b2, winner, terminal = apply_move(board, player_to_move, mv)
+        for i, mv in enumerate(moves):
+            winner, terminal = make_move(board, player_to_move, mv)
             if terminal:
                 if winner is None:
                     val = 0
@@ -183,10 +393,14 @@ def search(board: Board,
                     val = 1_000_000_000 - (10_000 - depth)
                 else:
                     val = -1_000_000_000 + (10_000 - depth)
+            elif pvs and i > 0:
+                val = _child(alpha, alpha + 1)
+                if alpha < val < beta:
+                    STATS["pvs_research"] += 1
+                    val = _child(alpha, beta)
             else:
-                val = search(b2, opponent(player_to_move), player_to_maximize, depth - 1, alpha, beta, deadline,
-                             progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0,
-                             last_report=last_report, report_every_nodes=report_every_nodes)
+                val = _child(alpha, beta)
+            unmake_move(board, mv)
             if val > best:
                 best = val
                 best_mv = mv
@@ -194,6 +408,11 @@ def search(board: Board,
                 alpha = best
             if beta <= alpha:
                 STATS["cuts"] += 1
+                if i == 0:
+                    STATS["cut_first"] += 1
+                if ply < MAX_PLY and mv in KILLERS[ply]:
+                    STATS["cut_killer"] += 1
+                record_cutoff(mv, depth, ply)
                 break
             _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
         flag = 0
@@ -201,14 +420,14 @@ def search(board: Board,
             flag = -1
         elif best >= beta:
             flag = 1
-        TT[key] = (depth, int(best), flag, best_mv)
+        TT.store(key, depth, int(best), flag, None if best_mv is None else to_canonical(best_mv, sym))
         return int(best)
     else:
         best = math.inf
         best_mv: Optional[Move] = None
         b0 = beta
-        for mv in moves:
-            b2, winner, terminal = apply_move(board, player_to_move, mv)
+        for i, mv in enumerate(moves):
+            winner, terminal = make_move(board, player_to_move, mv)
             if terminal:
                 if winner is None:
                     val = 0
@@ -216,10 +435,14 @@ def search(board: Board,
                     val = 1_000_000_000 - (10_000 - depth)
                 else:
                     val = -1_000_000_000 + (10_000 - depth)
+            elif pvs and i > 0:
+                val = _child(beta - 1, beta)
+                if alpha < val < beta:
+                    STATS["pvs_research"] += 1
+                    val = _child(alpha, beta)
             else:
-                val = search(b2, opponent(player_to_move), player_to_maximize, depth - 1, alpha, beta, deadline,
-                             progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0,
-                             last_report=last_report, report_every_nodes=report_every_nodes)
+                val = _child(alpha, beta)
+            unmake_move(board, mv)
             if val < best:
                 best = val
                 best_mv = mv
@@ -227,6 +450,11 @@ def search(board: Board,
                 beta = best
             if beta <= alpha:
                 STATS["cuts"] += 1
+                if i == 0:
+                    STATS["cut_first"] += 1
+                if ply < MAX_PLY and mv in KILLERS[ply]:
+                    STATS["cut_killer"] += 1
+                record_cutoff(mv, depth, ply)
                 break
             _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
         flag = 0
@@ -234,66 +462,203 @@ def search(board: Board,
             flag = -1
         elif best >= b0:
             flag = 1
-        TT[key] = (depth, int(best), flag, best_mv)
+        TT.store(key, depth, int(best), flag, None if best_mv is None else to_canonical(best_mv, sym))
         return int(best)
 
+def _search_root(board: Board,
+                 player_to_move: Player,
+                 moves: List[Move],
+                 depth: int,
+                 alpha: float,
+                 beta: float,
+                 deadline: Optional[float],
+                 *,
+                 progress_cb: Optional[Callable[[int], None]],
+                 start_ts: float,
+                 nodes0: int,
+                 last_report: List[int],
+                 report_every_nodes: int,
+                 symmetry: bool,
+                 pvs: bool,
+                 threats: bool,
+                 batch_eval: bool) -> Tuple[float, Optional[Move], bool]:
+    _tt()
+
+    def _child(a: float, b: float) -> int:
+        return search(board, opponent(player_to_move), player_to_move, depth - 1, a, b, deadline,
+                      progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0,
+                      last_report=last_report, report_every_nodes=report_every_nodes,
+                      symmetry=symmetry, pvs=pvs, ply=1, threats=threats, batch_eval=batch_eval)
+
+    best_val = -math.inf
+    best_mv: Optional[Move] = None
+    for i, mv in enumerate(moves):
+        if _STOP[0] or (deadline is not None and time.time() > deadline):
+            return best_val, best_mv, False
+        winner, terminal = make_move(board, player_to_move, mv)
+        if terminal:
+            if winner is None:
+                val = 0
+            elif winner == player_to_move:
+                val = 1_000_000_000 - (10_000 - depth)
+            else:
+                val = -1_000_000_000 + (10_000 - depth)
+        elif pvs and i > 0:
+            val = _child(alpha, alpha + 1)
+            if alpha < val < beta:
+                STATS["pvs_research"] += 1
+                val = _child(alpha, beta)
+        else:
+            val = _child(alpha, beta)
+        unmake_move(board, mv)
+        if val > best_val or best_mv is None:
+            best_val = val
+            best_mv = mv
+        if best_val > alpha:
+            alpha = best_val
+        if alpha >= beta:
+            break
+        _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
+    # arrêt pendant le sous-arbre du dernier coup : search() a rendu evaluate() aux nœuds en cours,
+    # la valeur est tronquée et l'itération ne compte pas comme complète
+    if _STOP[0] or (deadline is not None and time.time() > deadline):
+        return best_val, best_mv, False
+    return best_val, best_mv, True
+
+def _iterate(board: Board,
+             player_to_move: Player,
+             root_moves: List[Move],
+             best_mv: Optional[Move],
+             first_depth: int,
+             max_depth: int,
+             deadline: Optional[float],
+             aspiration: Optional[int],
+             ctx: dict,
+             shuffle: Optional[random.Random] = None) -> Tuple[Optional[Move], float, int]:
+    # approfondissement itératif ; renvoie (coup, valeur, dernière profondeur complète)
+    best_val = -math.inf
+    done = 0
+    for d in range(first_depth, max_depth + 1):
+        if _STOP[0] or (deadline is not None and time.time() > deadline):
+            break
+        key, sym = position_key(board, player_to_move, ctx["symmetry"])
+        entry = TT.probe(key)
+        tt_best = entry[3] if entry is not None and entry[0] >= d - 1 else None
+        if tt_best is not None:
+            tt_best = from_canonical(tt_best, sym)
+        else:
+            tt_best = best_mv
+        if tt_best is not None and tt_best not in root_moves:
+            tt_best = None
+        moves = order_moves(board, player_to_move, root_moves, tt_best, 0)
+        if shuffle is not None:
+            # helpers Lazy SMP : même premier coup, reste de la racine dans un autre ordre
+            tail = moves[1:]
+            shuffle.shuffle(tail)
+            moves = moves[:1] + tail
+
+        # fenêtre d'aspiration autour du score de l'itération précédente (hors scores de victoire)
+        window = aspiration if best_mv is not None and abs(best_val) < 500_000_000 else None
+        if window:
+            alpha, beta = best_val - window, best_val + window
+        else:
+            alpha, beta = -math.inf, math.inf
+        val, mv, complete = _search_root(board, player_to_move, moves, d, alpha, beta, deadline, **ctx)
+        if complete and window and (val <= alpha or val >= beta):
+            STATS["asp_fail"] += 1
+            val, mv, complete = _search_root(board, player_to_move, moves, d, -math.inf, math.inf, deadline, **ctx)
+
+        if mv is None:
+            break
+        best_mv = mv
+        if not complete:
+            break
+        best_val = val
+        done = d
+
+        _maybe_report(ctx["progress_cb"], ctx["start_ts"], ctx["nodes0"], ctx["last_report"],
+                      ctx["report_every_nodes"])
+    return best_mv, best_val, done
+
 def best_move(board: Board,
               player_to_move: Player,
               max_depth: int = 3,
               time_ms: Optional[int] = None,
-              progress_cb: Optional[Callable[[int], None]] = None) -> Move:
+              progress_cb: Optional[Callable[[int], None]] = None,
+              symmetry: bool = False,
+              pvs: bool = True,
+              aspiration: Optional[int] = ASPIRATION_WINDOW,
+              threats: bool = True,
+              batch_eval: bool = False,
+              workers: int = 1,
+              book: bool = True,
+              endgame: Optional[int] = None) -> Move:
+    global _STATS_TT
+    # position du livre d'ouvertures (book.load_book) : coup immédiat, sans recherche
+    if book:
+        mv = book_move(board, player_to_move)
+        if mv is not None:
+            return mv
     start_ts = time.time()
     deadline = None if time_ms is None else start_ts + time_ms / 1000.0
+    # cache persistant (poscache.open_cache) : un résultat au moins aussi profond évite la recherche,
+    # un résultat moins profond amorce l'ordre des coups de la racine
+    cached = None if _poscache.CACHE is None else _poscache.CACHE.get(board, player_to_move)
+    if cached is not None and cached[3] is not None and cached[0] >= max_depth:
+        STATS["pc_hit"] += 1
+        return cached[3]
+    # sur demande (endgame = seuil de cases vides) : résolution exacte avec la moitié du temps, ou
+    # ENDGAME_NODES nœuds sans limite de temps ; si elle n'aboutit pas, la recherche normale reprend
+    if endgame is not None and _endgame.empties(board) <= endgame:
+        solved = _endgame.solve(board, player_to_move, time_ms=None if time_ms is None else time_ms // 2,
+                                max_nodes=_endgame.ENDGAME_NODES if time_ms is None else None)
+        STATS["eg_nodes"] += _endgame.STATS["nodes"]
+        if solved is not None and solved[2] is not None:
+            STATS["eg_solved"] += 1
+            return solved[2]
+    # une seule copie : toute la recherche joue/déjoue les coups sur ce plateau
+    board = board.copy()
+    _STATS_TT = _tt()
+    TT.new_search()
+    if cached is not None and cached[3] is not None:
+        key, sym = position_key(board, player_to_move, symmetry)
+        TT.store(key, cached[0], cached[1], cached[2], to_canonical(cached[3], sym))
+    age_history()
     best_mv: Optional[Move] = None
-    best_val = -math.inf
 
     # report ~chaque 2000 nœuds (ajuste si tu veux)
     report_every_nodes = 2000
     nodes0 = STATS["nodes"]
     last_report = [0]
+    ctx = dict(progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0, last_report=last_report,
+               report_every_nodes=report_every_nodes, symmetry=symmetry, pvs=pvs, threats=threats,
+               batch_eval=batch_eval)
 
     # premier “heartbeat” pour afficher la barre tout de suite
     _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
 
-    for d in range(1, max_depth + 1):
-        if deadline is not None and time.time() > deadline:
-            break
-        key = board_key(board, player_to_move)
-        tt_best = TT[key][3] if key in TT and TT[key][0] >= d - 1 else None
-        moves = order_moves(board, player_to_move, generate_moves(board), tt_best)
-        cur_best_mv = best_mv
-        cur_best_val = best_val
-        alpha, beta = -math.inf, math.inf
-        for mv in moves:
-            if deadline is not None and time.time() > deadline:
-                break
-            b2, winner, terminal = apply_move(board, player_to_move, mv)
-            if terminal:
-                if winner is None:
-                    val = 0
-                elif winner == player_to_move:
-                    val = 1_000_000_000 - (10_000 - d)
-                else:
-                    val = -1_000_000_000 + (10_000 - d)
-            else:
-                val = search(b2, opponent(player_to_move), player_to_move, d - 1, alpha, beta, deadline,
-                             progress_cb=progress_cb, start_ts=start_ts, nodes0=nodes0,
-                             last_report=last_report, report_every_nodes=report_every_nodes)
-            if val > cur_best_val or cur_best_mv is None:
-                cur_best_val = val
-                cur_best_mv = mv
-            if cur_best_val > alpha:
-                alpha = cur_best_val
+    root_moves = generate_moves(board)
+    if threats:
+        wins = winning_codes(board, player_to_move)
+        if wins:
+            STATS["threat_wins"] += 1
+            best_mv = MOVE_TABLE[wins[0]]
+            max_depth = 0  # victoire immédiate : pas de recherche
+        elif has_winning_move(board, opponent(player_to_move)):
+            STATS["threat_blocks"] += 1
+            root_moves = safe_moves(board, player_to_move, root_moves) or root_moves
 
-            _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
-
-        if cur_best_mv is not None:
-            best_mv = cur_best_mv
-            best_val = cur_best_val
-        else:
-            break
-
-        _maybe_report(progress_cb, start_ts, nodes0, last_report, report_every_nodes)
+    if workers > 1 and max_depth > 0:
+        mv = _best_move_smp(board, player_to_move, root_moves, max_depth, deadline, aspiration, ctx, workers)
+        if mv is not None:
+            best_mv = mv
+    else:
+        mv, val, done = _iterate(board, player_to_move, root_moves, best_mv, 1, max_depth, deadline, aspiration, ctx)
+        if mv is not None:
+            best_mv = mv
+            if _poscache.CACHE is not None and done > 0:
+                STATS["pc_store"] += 1
+                _poscache.CACHE.put(board, player_to_move, done, int(val), 0, mv)
 
     # report final
     if progress_cb is not None:
@@ -305,4 +670,133 @@ def best_move(board: Board,
     if best_mv is None:
         ms = generate_moves(board)
         return ms[0]
-    return best_mv
\ No newline at end of file
+    return best_mv
+
+# --- Lazy SMP : plusieurs processus cherchent la même racine et partagent une TT en mémoire partagée
+_SMP: Dict[str, object] = {}
+# une seule recherche SMP à la fois : le pool, la TT partagée et le drapeau d'arrêt sont communs,
+# et le pool n'est reconstruit (nombre de workers ou taille de TT changés) que verrou tenu
+_SMP_LOCK = threading.Lock()
+
+def _smp_init(tt_name: str, tt_mb: float, stop_name: str) -> None:
+    global TT, _STOP
+    TT = TranspositionTable(tt_mb, name=tt_name)
+    _SMP["stop"] = shared_memory.SharedMemory(name=stop_name)
+    _STOP = _SMP["stop"].buf
+
+def _smp_search(job: tuple) -> tuple:
+    (black, white, player, codes, max_depth, deadline, aspiration, opts, helper, age) = job
+    # pas de reset_stats() : il viderait la TT partagée
+    for k in STATS:
+        STATS[k] = 0
+    age_history()
+    TT.age = age
+    board = Board.from_bits(black, white)
+    root_moves = [MOVE_TABLE[c] for c in codes]
+    ctx = dict(progress_cb=None, start_ts=time.time(), nodes0=0, last_report=[0],
+               report_every_nodes=2000, **opts)
+    # helper 0 = recherche principale ; les autres commencent une profondeur plus loin une fois
+    # sur deux et mélangent la racine, pour remplir la TT avec des sous-arbres différents
+    shuffle = random.Random(helper) if helper else None
+    first = 1 + (helper % 2)
+    mv, _, done = _iterate(board, Player(player), root_moves, None, min(first, max_depth), max_depth,
+                             deadline, aspiration, ctx, shuffle)
+    stats = {k: v for k, v in STATS.items() if k not in ("tt_fill", "tt_collisions")}
+    return done, None if mv is None else encode_move(*mv), stats
+
+def _smp_pool(workers: int):
+    # pool persistant : les processus et la TT partagée survivent d'un appel à l'autre (appelé sous _SMP_LOCK)
+    if _SMP.get("workers") == workers and _SMP.get("tt_mb") == _TT_MB:
+        return _SMP["pool"], _SMP["tt"], _SMP["stop"]
+    _smp_close()
+    tt = TranspositionTable(_TT_MB, shared=True)
+    stop = shared_memory.SharedMemory(create=True, size=1)
+    pool = multiprocessing.get_context().Pool(workers, initializer=_smp_init,
+                                              initargs=(tt.name, _TT_MB, stop.name))
+    _SMP.update(workers=workers, tt_mb=_TT_MB, pool=pool, tt=tt, stop=stop)
+    return pool, tt, stop
+
+def smp_shutdown() -> None:
+    with _SMP_LOCK:
+        _smp_close()
+
+def _smp_close() -> None:
+    if not _SMP:
+        return
+    _SMP["pool"].terminate()
+    _SMP["pool"].join()
+    _SMP["tt"].close(unlink=True)
+    _SMP["stop"].close()
+    _SMP["stop"].unlink()
+    _SMP.clear()
+
+atexit.register(smp_shutdown)
+
+def _best_move_smp(board: Board,
+                   player_to_move: Player,
+                   root_moves: List[Move],
+                   max_depth: int,
+                   deadline: Optional[float],
+                   aspiration: Optional[int],
+                   ctx: dict,
+                   workers: int) -> Optional[Move]:
+    with _SMP_LOCK:
+        return _run_smp(board, player_to_move, root_moves, max_depth, deadline, aspiration, ctx, workers)
+
+def _run_smp(board: Board,
+             player_to_move: Player,
+             root_moves: List[Move],
+             max_depth: int,
+             deadline: Optional[float],
+             aspiration: Optional[int],
+             ctx: dict,
+             workers: int) -> Optional[Move]:
+    global _STATS_TT
+    pool, tt, stop = _smp_pool(workers)
+    tt.new_search()
+    stop.buf[0] = 0
+    opts = {k: ctx[k] for k in ("symmetry", "pvs", "threats", "batch_eval")}
+    codes = [encode_move(*mv) for mv in root_moves]
+    pending = [pool.apply_async(_smp_search, ((board.bits[1], board.bits[2], int(player_to_move), codes,
+                                               max_depth, deadline, aspiration, opts, k, tt.age),))
+               for k in range(workers)]
+    progress_cb = ctx["progress_cb"]
+    results = []
+    try:
+        while pending:
+            pending[0].wait(0.05)
+            still = []
+            for r in pending:
+                if r.ready():
+                    res = r.get()
+                    results.append(res)
+                    # un worker a fini la profondeur maximale : inutile d'attendre les autres
+                    if res[0] >= max_depth:
+                        stop.buf[0] = 1
+                else:
+                    still.append(r)
+            pending = still
+            if progress_cb is not None:
+                try:
+                    progress_cb(int((time.time() - ctx["start_ts"]) * 1000))
+                except Exception:
+                    pass
+    finally:
+        # un worker en erreur : les autres s'arrêtent et on attend qu'ils aient rendu la main
+        # (résultats ignorés), pour que la recherche suivante trouve un pool libre
+        stop.buf[0] = 1
+        for r in pending:
+            r.wait()
+        stop.buf[0] = 0
+
+    best = None
+    for done, code, stats in results:
+        for k, v in stats.items():
+            STATS[k] = STATS.get(k, 0) + v
+        # la profondeur complète la plus grande l'emporte ; à égalité, le premier résultat arrivé
+        if code is not None and (best is None or done > best[0]):
+            best = (done, code)
+    tt.recount()
+    _STATS_TT = tt
+    _tt_stats()
+    return None if best is None else MOVE_TABLE[best[1]]
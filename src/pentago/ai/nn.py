@@ -0,0 +1,144 @@
+import zipfile
+from typing import Dict, Tuple
+import numpy as np
+
+# entrée : 36 cases « à moi » puis 36 cases « à l'adversaire » (cases vues du joueur au trait)
+INPUT_SIZE = 72
+POLICY_SIZE = 288
+
+
+def load_npz_mmap(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map every array of an uncompressed .npz (np.savez) without reading it.
+
+    np.load ignores mmap_mode for archives, so each member's .npy header is parsed here and the
+    data mapped read-only in place: worker processes loading the same file share its pages.
+    """
+    out: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed, save with np.savez")
+            # en-tête local : 30 octets fixes, puis nom et champ extra (longueurs aux octets 26 et 28)
+            fh.seek(info.header_offset)
+            local = fh.read(30)
+            start = info.header_offset + 30 + int.from_bytes(local[26:28], "little") \
+                + int.from_bytes(local[28:30], "little")
+            fh.seek(start)
+            version = np.lib.format.read_magic(fh)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran, dtype = read_header(fh)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            out[name] = np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(), shape=shape,
+                                  order="F" if fortran else "C")
+    return out
+
+
+class PolicyValueNet:
+    """Dense residual policy/value network, CPU inference in NumPy (float32).
+
+    in: 72 -> hidden (ReLU), then `blocks` residual blocks relu(x + W2 relu(W1 x)); a 288-way
+    policy head (softmax over the empty cells' moves) and a tanh value head through a small
+    hidden layer. Called as an evaluator (see policy.Evaluator): (B, 36) cells seen from the
+    side to move -> ((B, 288) priors, (B,) values). Intermediate buffers are allocated once for
+    `max_batch` positions; larger batches run in chunks. For B <= max_batch the returned arrays
+    are views of internal buffers, valid until the next call.
+    """
+
+    def __init__(self, weights: Dict[str, np.ndarray], max_batch: int = 256) -> None:
+        self.weights = weights
+        self.blocks = sum(1 for k in weights if k.endswith(".w1") and k.startswith("res"))
+        self.hidden = weights["in.w"].shape[1]
+        self.value_hidden = weights["value.w1"].shape[1]
+        self.max_batch = max_batch
+        b, h = max_batch, self.hidden
+        self._x = np.zeros((b, INPUT_SIZE), dtype=np.float32)
+        self._h = np.zeros((b, h), dtype=np.float32)
+        self._t = np.zeros((b, h), dtype=np.float32)
+        self._u = np.zeros((b, h), dtype=np.float32)
+        self._logits = np.zeros((b, POLICY_SIZE), dtype=np.float32)
+        self._v = np.zeros((b, self.value_hidden), dtype=np.float32)
+        self._value = np.zeros((b, 1), dtype=np.float32)
+
+    @classmethod
+    def random(cls, hidden: int = 128, blocks: int = 2, value_hidden: int = 32, seed: int = 0,
+               max_batch: int = 256) -> "PolicyValueNet":
+        """Freshly initialised weights (He init), e.g. to bootstrap self-play."""
+        rng = np.random.default_rng(seed)
+
+        def dense(n_in: int, n_out: int) -> np.ndarray:
+            return (rng.standard_normal((n_in, n_out)) * np.sqrt(2.0 / n_in)).astype(np.float32)
+
+        w = {"in.w": dense(INPUT_SIZE, hidden), "in.b": np.zeros(hidden, dtype=np.float32)}
+        for k in range(blocks):
+            w[f"res{k}.w1"] = dense(hidden, hidden)
+            w[f"res{k}.b1"] = np.zeros(hidden, dtype=np.float32)
+            # seconde couche à zéro : chaque bloc démarre comme l'identité
+            w[f"res{k}.w2"] = np.zeros((hidden, hidden), dtype=np.float32)
+            w[f"res{k}.b2"] = np.zeros(hidden, dtype=np.float32)
+        w["policy.w"] = dense(hidden, POLICY_SIZE) * 0.1
+        w["policy.b"] = np.zeros(POLICY_SIZE, dtype=np.float32)
+        w["value.w1"] = dense(hidden, value_hidden)
+        w["value.b1"] = np.zeros(value_hidden, dtype=np.float32)
+        w["value.w2"] = dense(value_hidden, 1) * 0.1
+        w["value.b2"] = np.zeros(1, dtype=np.float32)
+        return cls(w, max_batch)
+
+    @classmethod
+    def load(cls, path: str, max_batch: int = 256) -> "PolicyValueNet":
+        return cls(load_npz_mmap(path), max_batch)
+
+    def save(self, path: str) -> None:
+        # non compressé, pour que load() puisse projeter les tableaux en mémoire
+        np.savez(path, **{k: np.asarray(v, dtype=np.float32) for k, v in self.weights.items()})
+
+    def __call__(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cells = np.asarray(cells)
+        n = len(cells)
+        if n <= self.max_batch:
+            return self._forward(cells)
+        priors = np.empty((n, POLICY_SIZE), dtype=np.float32)
+        values = np.empty(n, dtype=np.float32)
+        for i in range(0, n, self.max_batch):
+            p, v = self._forward(cells[i:i + self.max_batch])
+            priors[i:i + len(p)] = p
+            values[i:i + len(v)] = v
+        return priors, values
+
+    def _forward(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        w = self.weights
+        n = len(cells)
+        x, h, t, u = self._x[:n], self._h[:n], self._t[:n], self._u[:n]
+        np.equal(cells, 1, out=x[:, :36])
+        np.equal(cells, 2, out=x[:, 36:])
+        np.matmul(x, w["in.w"], out=h)
+        h += w["in.b"]
+        np.maximum(h, 0.0, out=h)
+        for k in range(self.blocks):
+            np.matmul(h, w[f"res{k}.w1"], out=t)
+            t += w[f"res{k}.b1"]
+            np.maximum(t, 0.0, out=t)
+            np.matmul(t, w[f"res{k}.w2"], out=u)
+            u += w[f"res{k}.b2"]
+            h += u
+            np.maximum(h, 0.0, out=h)
+
+        logits = self._logits[:n]
+        np.matmul(h, w["policy.w"], out=logits)
+        logits += w["policy.b"]
+        # softmax limité aux coups des cases vides
+        logits[np.repeat(cells != 0, 8, axis=1)] = -1e9
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+
+        v = self._v[:n]
+        np.matmul(h, w["value.w1"], out=v)
+        v += w["value.b1"]
+        np.maximum(v, 0.0, out=v)
+        value = self._value[:n]
+        np.matmul(v, w["value.w2"], out=value)
+        value += w["value.b2"]
+        np.tanh(value, out=value)
+        return logits, value[:, 0]
+
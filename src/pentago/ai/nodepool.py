@@ -0,0 +1,300 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+# les coups non essayés d'un nœud sont parcourus dans l'ordre (start + j * MOVE_STRIDE) % 288,
+# start tiré au hasard à la création : une permutation implicite, sans liste par nœud
+MOVE_STRIDE = 173
+
+
+class NodePool:
+    """Structure-of-arrays MCTS node storage.
+
+    Nodes are rows of preallocated NumPy arrays (visits, value sum, untried-move cursor, edge
+    block); `index` maps position keys to rows. A node's children live in one contiguous block
+    of the edge arrays (move code, child row, per-edge visits/value and AMAF visits/value),
+    reserved at its first expansion and sized for its legal moves, so UCT selection is a
+    vectorized pass over the block. Moves are 9-bit codes (see board.encode_move). Arrays grow
+    by doubling, clamped so the allocation stays under `max_bytes` when it is set (unless the
+    live data itself needs more); compact() shrinks them back to the live size. Transpositions
+    make the tree a DAG: a node may be the child of several edges.
+
+    `refs` counts incoming edges plus pins (search roots). release() frees a node whose count
+    dropped to zero and, transitively, what it alone kept alive; evict() drops the least-visited
+    leaves. Freed rows and edge blocks are reused by later additions.
+    """
+
+    def __init__(self, capacity: int = 1024, edge_capacity: int = 16384) -> None:
+        self.index: Dict[int, int] = {}
+        # plafond d'allocation (octets) respecté par _grow quand c'est possible ; None = doublement libre
+        self.max_bytes: Optional[int] = None
+        self.size = 0
+        self.edge_size = 0
+        self.N = np.zeros(capacity, dtype=np.int32)
+        self.W = np.zeros(capacity, dtype=np.float64)
+        self.start = np.zeros(capacity, dtype=np.uint16)
+        self.cursor = np.zeros(capacity, dtype=np.uint16)
+        self.exhausted = np.zeros(capacity, dtype=np.bool_)
+        self.first_edge = np.zeros(capacity, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.uint16)
+        self.edge_cap = np.zeros(capacity, dtype=np.uint16)
+        self.key = np.zeros(capacity, dtype=np.uint64)
+        # parent = unique parent, -1 pour une racine ou une transposition (plusieurs parents)
+        self.parent = np.zeros(capacity, dtype=np.int32)
+        self.refs = np.zeros(capacity, dtype=np.uint16)
+        # rescan : des fils ont été évincés, le parcours des coups non essayés doit ignorer les fils présents
+        self.rescan = np.zeros(capacity, dtype=np.bool_)
+        self.edge_live = 0
+        self._free_rows: List[int] = []
+        self._free_blocks: Dict[int, List[int]] = {}
+        self.edge_move = np.zeros(edge_capacity, dtype=np.uint16)
+        self.edge_child = np.zeros(edge_capacity, dtype=np.int32)
+        self.edge_N = np.zeros(edge_capacity, dtype=np.int32)
+        self.edge_W = np.zeros(edge_capacity, dtype=np.float64)
+        # statistiques AMAF (RAVE) : coups joués plus tard dans la simulation par le même joueur
+        self.edge_AN = np.zeros(edge_capacity, dtype=np.int32)
+        self.edge_AW = np.zeros(edge_capacity, dtype=np.float32)
+
+    _NODE_ARRAYS = ("N", "W", "start", "cursor", "exhausted", "first_edge", "n_children", "edge_cap",
+                    "key", "parent", "refs", "rescan")
+    _EDGE_ARRAYS = ("edge_move", "edge_child", "edge_N", "edge_W", "edge_AN", "edge_AW")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.index
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, a).nbytes for a in self._NODE_ARRAYS + self._EDGE_ARRAYS)
+
+    @property
+    def used_bytes(self) -> int:
+        # octets occupés par les nœuds vivants et leurs blocs d'arêtes (hors capacité libre)
+        row = sum(getattr(self, a).itemsize for a in self._NODE_ARRAYS)
+        edge = sum(getattr(self, a).itemsize for a in self._EDGE_ARRAYS)
+        return len(self.index) * row + self.edge_live * edge
+
+    def clear(self) -> None:
+        self.index.clear()
+        self.size = 0
+        self.edge_size = 0
+        self.edge_live = 0
+        self._free_rows.clear()
+        self._free_blocks.clear()
+
+    def _grow(self, names: Tuple[str, ...], need: int) -> None:
+        old_cap = len(getattr(self, names[0]))
+        if need <= old_cap:
+            return
+        cap = max(old_cap, 16)
+        while cap < need:
+            cap *= 2
+        if self.max_bytes is not None:
+            # capacité supplémentaire limitée à ce qui tient sous max_bytes, mais jamais sous `need`
+            item = sum(getattr(self, a).itemsize for a in names)
+            room = old_cap + (self.max_bytes - self.nbytes) // item
+            cap = max(need, min(cap, room))
+        for a in names:
+            old = getattr(self, a)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, a, new)
+
+    def add(self, key: int, start: int, exhausted: bool = False) -> int:
+        if self._free_rows:
+            i = self._free_rows.pop()
+        else:
+            i = self.size
+            self._grow(self._NODE_ARRAYS, i + 1)
+            self.size = i + 1
+        self.index[key] = i
+        self.key[i] = key
+        self.parent[i] = -1
+        self.refs[i] = 0
+        self.rescan[i] = False
+        self.N[i] = 0
+        self.W[i] = 0.0
+        self.start[i] = start
+        self.cursor[i] = 0
+        self.exhausted[i] = exhausted
+        self.first_edge[i] = -1
+        self.n_children[i] = 0
+        self.edge_cap[i] = 0
+        return i
+
+    def add_edge(self, node: int, code: int, child: int, block: int) -> int:
+        # block = nombre de coups légaux du nœud, pour réserver son bloc d'arêtes au premier fils
+        first = int(self.first_edge[node])
+        if first < 0:
+            free = self._free_blocks.get(block)
+            if free:
+                first = free.pop()
+            else:
+                first = self.edge_size
+                self._grow(self._EDGE_ARRAYS, first + block)
+                self.edge_size = first + block
+            self.edge_live += block
+            self.first_edge[node] = first
+            self.edge_cap[node] = block
+        e = first + int(self.n_children[node])
+        self.edge_move[e] = code
+        self.edge_child[e] = child
+        self.edge_N[e] = 0
+        self.edge_W[e] = 0.0
+        self.edge_AN[e] = 0
+        self.edge_AW[e] = 0.0
+        self.n_children[node] += 1
+        refs = int(self.refs[child]) + 1
+        self.refs[child] = refs
+        self.parent[child] = node if refs == 1 else -1
+        return e
+
+    def block(self, node: int) -> Tuple[int, int]:
+        # (première arête, nombre de fils) : les statistiques d'arêtes sont les tranches [first:first + n]
+        n = int(self.n_children[node])
+        return (int(self.first_edge[node]) if n else 0), n
+
+    def pin(self, node: int) -> None:
+        self.refs[node] += 1
+        self.parent[node] = -1
+
+    def unpin(self, node: int) -> int:
+        """Drop a pin; free the node and what it alone kept alive. Returns the freed count."""
+        self.refs[node] -= 1
+        return self.release(node) if self.refs[node] == 0 else 0
+
+    def release(self, node: int) -> int:
+        # comptage de références : le coût est proportionnel à ce qui est libéré
+        freed = 0
+        stack = [node]
+        while stack:
+            i = stack.pop()
+            for c in self.children(i)[1].tolist():
+                self.refs[c] -= 1
+                if self.refs[c] == 0:
+                    stack.append(c)
+            self._free_row(i)
+            freed += 1
+        return freed
+
+    def _free_block(self, i: int) -> None:
+        cap = int(self.edge_cap[i])
+        if cap:
+            self._free_blocks.setdefault(cap, []).append(int(self.first_edge[i]))
+            self.edge_live -= cap
+        self.first_edge[i] = -1
+        self.edge_cap[i] = 0
+        self.n_children[i] = 0
+
+    def _free_row(self, i: int) -> None:
+        del self.index[int(self.key[i])]
+        self._free_block(i)
+        self.parent[i] = -1
+        self.refs[i] = 0
+        self._free_rows.append(i)
+
+    def evict(self, count: int, protect: int = -1) -> int:
+        """Free up to `count` least-visited leaves that have a single parent; returns the count.
+
+        The parent forgets the edge and reopens its untried moves (rescan), so an evicted move
+        can be expanded again later.
+        """
+        n = self.size
+        leaf = (self.n_children[:n] == 0) & (self.parent[:n] >= 0) & (self.refs[:n] == 1)
+        if 0 <= protect < n:
+            leaf[protect] = False
+        rows = np.flatnonzero(leaf)
+        if len(rows) > count:
+            rows = rows[np.argpartition(self.N[rows], count - 1)[:count]]
+        for i in rows.tolist():
+            p = int(self.parent[i])
+            first = int(self.first_edge[p])
+            last = int(self.n_children[p]) - 1
+            k = first + int(np.flatnonzero(self.edge_child[first:first + last + 1] == i)[0])
+            for a in self._EDGE_ARRAYS:
+                arr = getattr(self, a)
+                arr[k] = arr[first + last]
+            self.n_children[p] = last
+            if last == 0:
+                self._free_block(p)
+            self.cursor[p] = 0
+            self.exhausted[p] = False
+            self.rescan[p] = True
+            self._free_row(i)
+        return len(rows)
+
+    def children(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        first = int(self.first_edge[node])
+        n = int(self.n_children[node])
+        if n == 0:
+            return self.edge_move[:0], self.edge_child[:0]
+        return self.edge_move[first:first + n], self.edge_child[first:first + n]
+
+    def child(self, node: int, code: int) -> Optional[int]:
+        moves, kids = self.children(node)
+        hit = np.flatnonzero(moves == code)
+        return int(kids[hit[0]]) if len(hit) else None
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.index.items())
+
+    def compact(self, root: int, keep: Sequence[int] = ()) -> Dict[int, int]:
+        """Keep only the rows reachable from `root` and `keep`, renumbered densely; the arrays
+        are reallocated at the live size. Those rows are pinned; returns the old -> new row map."""
+        order = []
+        seen = {root}
+        stack = [root]
+        for k in keep:
+            if k not in seen:
+                seen.add(k)
+                stack.append(k)
+        while stack:
+            i = stack.pop()
+            order.append(i)
+            for c in self.children(i)[1].tolist():
+                if c not in seen:
+                    seen.add(c)
+                    stack.append(c)
+        remap = {old: new for new, old in enumerate(order)}
+        rows = np.array(order, dtype=np.int64)
+        keys = {i: k for k, i in self.index.items() if i in remap}
+        first = np.full(len(order), -1, dtype=np.int32)
+        caps = self.edge_cap[rows].astype(np.int64)
+        edge_total = int(caps.sum())
+        edges = {a: np.zeros(max(edge_total, 16), dtype=getattr(self, a).dtype) for a in self._EDGE_ARRAYS}
+        pos = 0
+        for new, old in enumerate(order):
+            cap = int(caps[new])
+            if cap == 0:
+                continue
+            src, n = self.block(old)
+            first[new] = pos
+            for a in self._EDGE_ARRAYS:
+                edges[a][pos:pos + n] = getattr(self, a)[src:src + n]
+            edges["edge_child"][pos:pos + n] = [remap[c] for c in self.edge_child[src:src + n].tolist()]
+            pos += cap
+        for a in self._NODE_ARRAYS:
+            arr = getattr(self, a)
+            new = np.zeros(max(len(order), 16), dtype=arr.dtype)
+            new[:len(order)] = arr[rows]
+            setattr(self, a, new)
+        self.first_edge[:len(order)] = first
+        for a in self._EDGE_ARRAYS:
+            setattr(self, a, edges[a])
+        self.edge_size = pos
+        self.edge_live = pos
+        self.size = len(order)
+        self.index = {k: remap[i] for i, k in keys.items()}
+        self._free_rows.clear()
+        self._free_blocks.clear()
+        # références et parents recalculés sur les arêtes conservées ; les racines sont épinglées
+        self.refs[:self.size] = 0
+        self.parent[:self.size] = -1
+        for i in range(self.size):
+            for c in self.children(i)[1].tolist():
+                self.refs[c] += 1
+                self.parent[c] = i if self.refs[c] == 1 else -1
+        for k in [root, *keep]:
+            self.pin(remap[k])
+        return remap
@@ -0,0 +1,70 @@
+from typing import Optional
+import numpy as np
+from ..board import Player
+from .minimax import CENTER_WEIGHTS
+from .batch import MOVE_GATHER, segment_counts, evaluate_batch
+
+# ROTATION_GATHER[k] : permutation des 36 cases pour la rotation k = quadrant * 2 + sens (0 = CW)
+ROTATION_GATHER = MOVE_GATHER[:8]
+_LOG_WEIGHTS = np.log(np.array(CENTER_WEIGHTS, dtype=np.float64).ravel())
+
+
+def playouts(cells: np.ndarray,
+             to_move: Player,
+             k: Optional[int] = None,
+             max_steps: Optional[int] = None,
+             rng: Optional[np.random.Generator] = None,
+             weighted: bool = True) -> np.ndarray:
+    """Play K random games in lockstep and return (K,) outcomes in {-1, 0, 1} for `to_move`.
+
+    `cells` is one (36,) position (copied K times) or a (K, 36) batch, 0/1/2 as in batch.py.
+    Each ply places a stone on a random empty cell (weighted toward the centre unless
+    weighted=False), applies a random quadrant rotation through ROTATION_GATHER, and checks
+    fives with the segment index table: a five for the mover wins even if the opponent also
+    gets one, a full board is a draw. After max_steps plies, unfinished games score by the sign
+    of the static evaluation.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    cells = np.asarray(cells, dtype=np.int8)
+    if cells.ndim == 1:
+        cells = np.repeat(cells[None, :], 1 if k is None else k, axis=0)
+    else:
+        cells = cells.copy()
+    n = cells.shape[0]
+    me = int(to_move)
+    outcome = np.zeros(n, dtype=np.int8)
+    active = np.ones(n, dtype=bool)
+    rows = np.arange(n)
+    player = me
+    steps = 0
+    while active.any():
+        if max_steps is not None and steps >= max_steps:
+            score = evaluate_batch(cells[active], Player(me))
+            outcome[active] = np.sign(score)
+            break
+        empty = cells == 0
+        # tirage pondéré sans boucle : argmax de log(w) + Gumbel sur les cases vides
+        keys = rng.gumbel(size=(n, 36))
+        if weighted:
+            keys += _LOG_WEIGHTS
+        keys[~empty] = -np.inf
+        cell = keys.argmax(axis=1)
+        placed = cells.copy()
+        placed[rows, cell] = player
+        rot = rng.integers(0, 8, size=n)
+        moved = np.take_along_axis(placed, ROTATION_GATHER[rot], axis=1)
+        cells = np.where(active[:, None], moved, cells)
+
+        mine = (segment_counts(cells, player) == 5).any(axis=1)
+        theirs = (segment_counts(cells, 3 - player) == 5).any(axis=1)
+        full = (cells != 0).all(axis=1)
+        sign = 1 if player == me else -1
+        won = active & mine
+        lost = active & theirs & ~mine
+        drawn = active & full & ~mine & ~theirs
+        outcome[won] = sign
+        outcome[lost] = -sign
+        active &= ~(won | lost | drawn)
+        player = 3 - player
+        steps += 1
+    return outcome
@@ -1,18 +1,29 @@
 import time
 import math
+import numpy as np
 from typing import Dict, Tuple, List, Optional, Callable
-from ..board import Board, Player, Quadrant, Direction
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, encode_move
+from ..symmetry import position_key, to_canonical, from_canonical
+from .batch import mover_cells
+from .book import book_move
 from .minimax import CENTER_WEIGHTS
 
 Move = Tuple[int, int, Quadrant, Direction]
-Key = Tuple[int, Tuple[int, ...]]
+Key = int
+# évaluateur : (B, 36) cases vues du joueur au trait (1 = ses pierres, 2 = adverses)
+# -> ((B, 288) priors indexés par code de coup, (B,) valeurs dans [-1, 1] pour le joueur au trait)
+Evaluator = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+# feuilles rassemblées par tour avant une évaluation groupée
+BATCH_SIZE = 16
+# perte virtuelle sur les arêtes d'un chemin en attente d'évaluation
+VIRTUAL_LOSS = 1.0
 
 def opponent(p: Player) -> Player:
     return Player.BLACK if p == Player.WHITE else Player.WHITE
 
 def board_key(board: Board, to_move: Player) -> Key:
-    flat = tuple(v for row in board.grid for v in row)
-    return (int(to_move), flat)
+    return board.hash_key(to_move)
 
 def generate_moves(board: Board) -> List[Move]:
     out: List[Move] = []
@@ -46,7 +57,8 @@ def apply_move(board: Board, player: Player, mv: Move):
 
 class Node:
     __slots__ = ("N", "P", "Nsa", "Wsa", "children")
-    def __init__(self, priors: Dict[Move, float]):
+    def __init__(self, priors: Optional[Dict[Move, float]]):
+        # P = None : feuille atteinte, en attente de l'évaluation groupée
         self.N = 0
         self.P = priors
         self.Nsa: Dict[Move, int] = {}
@@ -55,18 +67,111 @@ class Node:
 
 TREE: Dict[Key, Node] = {}
 
-def net_policy_value(board: Board, to_move: Player) -> Tuple[Dict[Move, float], float]:
-    moves = generate_moves(board)
-    if not moves:
-        return {}, 0.0
-    ws = [CENTER_WEIGHTS[m[0]][m[1]] for m in moves]
-    s = float(sum(ws))
-    if s <= 0:
-        p = 1.0 / len(moves)
-        priors = {mv: p for mv in moves}
-    else:
-        priors = {mv: w / s for mv, w in zip(moves, ws)}
-    return priors, 0.0
+_CENTER_PRIORS = np.repeat(np.array(CENTER_WEIGHTS, dtype=np.float64).ravel(), 8)
+
+def center_evaluator(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Default evaluator: CENTER_WEIGHTS priors over the empty cells, value 0."""
+    priors = np.where(np.repeat(cells == 0, 8, axis=1), _CENTER_PRIORS, 0.0)
+    return priors / np.maximum(priors.sum(axis=1, keepdims=True), 1e-12), np.zeros(len(cells))
+
+EVALUATOR: Evaluator = center_evaluator
+
+def set_evaluator(evaluator: Optional[Evaluator]) -> None:
+    # les priors déjà stockés dans TREE viennent de l'ancien évaluateur
+    global EVALUATOR
+    EVALUATOR = center_evaluator if evaluator is None else evaluator
+    TREE.clear()
+
+def _legal_priors(priors: np.ndarray, cells: np.ndarray) -> Dict[Move, float]:
+    # priors (288,) restreints aux cases vides et renormalisés, dans l'ordre de generate_moves
+    codes = np.flatnonzero(np.repeat(cells == 0, 8))
+    if len(codes) == 0:
+        return {}
+    p = np.maximum(priors[codes], 0.0)
+    s = float(p.sum())
+    p = p / s if s > 0 else np.full(len(codes), 1.0 / len(codes))
+    return {MOVE_TABLE[c]: w for c, w in zip(codes.tolist(), p.tolist())}
+
+def net_policy_value(board: Board, to_move: Player,
+                     evaluator: Optional[Evaluator] = None) -> Tuple[Dict[Move, float], float]:
+    cells = mover_cells(board, to_move)
+    priors, values = (EVALUATOR if evaluator is None else evaluator)(cells[None, :])
+    return _legal_priors(priors[0], cells), float(values[0])
+
+def canonical_priors(priors: Dict[Move, float], sym: int) -> Dict[Move, float]:
+    if sym == 0:
+        return priors
+    out: Dict[Move, float] = {}
+    for m, p in priors.items():
+        cm = to_canonical(m, sym)
+        out[cm] = out.get(cm, 0.0) + p
+    return out
+
+def _select(board: Board, player_to_move: Player, root_key: Key, root_sym: int, c_puct: float,
+            symmetry: bool, virtual_loss: float):
+    # descente PUCT avec perte virtuelle ; renvoie le chemin et soit la feuille à évaluer
+    # (clé, position, joueur au trait, symétrie), soit la valeur connue d'une fin de partie
+    # (vue du joueur qui serait au trait)
+    path: List[Tuple[Key, Move]] = []
+    cur_board = board
+    cur_player = player_to_move
+    key = root_key
+    sym = root_sym
+    while True:
+        node = TREE[key]
+        if node.P is None:
+            return path, (key, cur_board, cur_player, sym), None
+        if not node.P:
+            return path, None, 0.0
+
+        best = None
+        best_m: Optional[Move] = None
+        sqrtN = math.sqrt(node.N + 1)
+        for m, p in node.P.items():
+            nsa = node.Nsa.get(m, 0)
+            q = (node.Wsa.get(m, 0.0) / nsa) if nsa > 0 else 0.0
+            u = c_puct * p * (sqrtN / (1 + nsa))
+            s = q + u
+            if best is None or s > best:
+                best = s
+                best_m = m
+
+        mv = best_m
+        node.N += 1
+        node.Nsa[mv] = node.Nsa.get(mv, 0) + 1
+        node.Wsa[mv] = node.Wsa.get(mv, 0.0) - virtual_loss
+        path.append((key, mv))
+        b2, winner, terminal, _ = apply_move(cur_board, cur_player, from_canonical(mv, sym))
+        if terminal:
+            if winner is None:
+                return path, None, 0.0
+            return path, None, (-1.0 if winner == cur_player else 1.0)
+
+        next_player = opponent(cur_player)
+        child_key, child_sym = position_key(b2, next_player, symmetry)
+        node.children[mv] = child_key
+        if child_key not in TREE:
+            TREE[child_key] = Node(None)
+        cur_board = b2
+        cur_player = next_player
+        key = child_key
+        sym = child_sym
+
+def _backup(path: List[Tuple[Key, Move]], v: float, virtual_loss: float) -> None:
+    # v est vu du joueur au trait à la feuille ; chaque arête prend la valeur de celui qui a joué
+    for nk, m in reversed(path):
+        v = -v
+        TREE[nk].Wsa[m] += v + virtual_loss
+
+def root_visits(board: Board, to_move: Player, symmetry: bool = False) -> np.ndarray:
+    """(288,) visit counts of the root's moves after best_move, indexed by real-frame move code."""
+    out = np.zeros(288, dtype=np.int64)
+    key, sym = position_key(board, to_move, symmetry)
+    node = TREE.get(key)
+    if node is not None:
+        for m, n in node.Nsa.items():
+            out[encode_move(*from_canonical(m, sym))] = n
+    return out
 
 def best_move(
     board: Board,
@@ -75,11 +180,26 @@ def best_move(
     simulations: Optional[int] = None,
     c_puct: float = 1.5,
     progress_cb: Optional[Callable[[int], None]] = None,
+    symmetry: bool = False,
+    evaluator: Optional[Evaluator] = None,
+    batch_size: int = BATCH_SIZE,
+    virtual_loss: float = VIRTUAL_LOSS,
+    book: bool = True,
 ) -> Move:
-    root_key = board_key(board, player_to_move)
-    if root_key not in TREE:
-        priors, _ = net_policy_value(board, player_to_move)
-        TREE[root_key] = Node(priors)
+    # avec symmetry=True, TREE est indexé par position canonique et les coups des nœuds
+    # sont exprimés dans le repère canonique.
+    # Chaque tour rassemble jusqu'à batch_size feuilles (perte virtuelle sur leurs chemins),
+    # les évalue en un seul appel à l'évaluateur, puis rétropropage leurs valeurs.
+    if book:
+        mv = book_move(board, player_to_move)
+        if mv is not None:
+            return mv
+    evaluate = EVALUATOR if evaluator is None else evaluator
+    root_key, root_sym = position_key(board, player_to_move, symmetry)
+    root = TREE.get(root_key)
+    if root is None or root.P is None:
+        priors, _ = net_policy_value(board, player_to_move, evaluate)
+        root = TREE[root_key] = Node(canonical_priors(priors, root_sym))
 
     deadline = None if time_ms is None else time.time() + time_ms / 1000.0
     sims_target = simulations if simulations is not None else (10_000 if time_ms is None else 1_000_000_000)
@@ -88,91 +208,43 @@ def best_move(
     if simulations is not None and sims_target and sims_target > 0:
         report_every = max(1, sims_target // 100)
 
-    while True:
+    while root.P:
         if deadline is not None and time.time() > deadline:
             break
         if sims >= sims_target:
             break
-        sims += 1
-        if progress_cb and (sims % report_every == 0):
-            try:
-                progress_cb(sims)
-            except Exception:
-                pass
-
-        path: List[Tuple[Key, Move]] = []
-        cur_board = board.copy()
-        cur_player = player_to_move
-        key = root_key
-        terminal = False
-        winner: Optional[Player] = None
-
-        while True:
-            node = TREE[key]
-            if not node.P:
-                priors, v_est = net_policy_value(cur_board, cur_player)
-                if priors:
-                    node.P = priors
-                else:
-                    terminal = True
-                    winner = None
-                    break
-
-            best = None
-            best_m: Optional[Move] = None
-            sqrtN = math.sqrt(node.N + 1)
-            for m, p in node.P.items():
-                nsa = node.Nsa.get(m, 0)
-                q = (node.Wsa.get(m, 0.0) / nsa) if nsa > 0 else 0.0
-                u = c_puct * p * (sqrtN / (1 + nsa))
-                s = q + u
-                if best is None or s > best:
-                    best = s
-                    best_m = m
-
-            mv = best_m
-            if mv is None:
-                terminal = True
-                winner = None
-                break
-
-            path.append((key, mv))
-            b2, winner, terminal, _ = apply_move(cur_board, cur_player, mv)
-            if terminal:
-                cur_board = b2
+        # rassemblement : une feuille déjà en attente (collision) ajoute seulement son chemin
+        pending: Dict[Key, Tuple[np.ndarray, int, List[List[Tuple[Key, Move]]]]] = {}
+        for _ in range(max(1, batch_size)):
+            if sims >= sims_target or (deadline is not None and time.time() > deadline):
                 break
-
-            next_player = opponent(cur_player)
-            child_key = board_key(b2, next_player)
-            if child_key not in TREE:
-                priors, _ = net_policy_value(b2, next_player)
-                node.children[mv] = child_key
-                TREE[child_key] = Node(priors)
-                cur_board = b2
-                cur_player = next_player
-                key = child_key
-                break
-
-            cur_board = b2
-            cur_player = next_player
-            key = child_key
-
-        if terminal:
-            if winner is None:
-                v = 0.0
-            elif winner == cur_player:
-                v = 1.0
+            sims += 1
+            if progress_cb and (sims % report_every == 0):
+                try:
+                    progress_cb(sims)
+                except Exception:
+                    pass
+            path, leaf, v = _select(board, player_to_move, root_key, root_sym, c_puct, symmetry, virtual_loss)
+            if leaf is None:
+                _backup(path, v, virtual_loss)
+                continue
+            key, leaf_board, leaf_player, sym = leaf
+            if key in pending:
+                pending[key][2].append(path)
             else:
-                v = -1.0
-        else:
-            _, v = net_policy_value(cur_board, cur_player)
+                pending[key] = (mover_cells(leaf_board, leaf_player), sym, [path])
+        if not pending:
+            continue
 
-        for nk, m in reversed(path):
-            n = TREE[nk]
-            n.N += 1
-            n.Nsa[m] = n.Nsa.get(m, 0) + 1
-            n.Wsa[m] = n.Wsa.get(m, 0.0) + v
-            v = -v
+        # évaluation groupée puis répartition
+        keys = list(pending)
+        cells = np.stack([pending[k][0] for k in keys])
+        priors, values = evaluate(cells)
+        for i, k in enumerate(keys):
+            leaf_cells, sym, paths = pending[k]
+            TREE[k].P = canonical_priors(_legal_priors(priors[i], leaf_cells), sym)
+            for path in paths:
+                _backup(path, float(values[i]), virtual_loss)
 
     if progress_cb:
         try:
@@ -180,7 +252,6 @@ def best_move(
         except Exception:
             pass
 
-    root = TREE[root_key]
     if not root.P:
         moves = generate_moves(board)
         return moves[0]
@@ -193,5 +264,5 @@ def best_move(
             best_mv = m
     if best_mv is None:
         moves = generate_moves(board)
-        best_mv = moves[0]
-    return best_mv  # type: ignore
\ No newline at end of file
+        return moves[0]
+    return from_canonical(best_mv, root_sym)
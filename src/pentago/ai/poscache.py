@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+from typing import Optional, Set, Tuple
+from ..board import Board, Player, Quadrant, Direction, MOVE_TABLE, encode_move
+from ..symmetry import canonical_key, to_canonical, from_canonical
+
+Move = Tuple[int, int, Quadrant, Direction]
+# (profondeur, score pour le joueur au trait, borne : 0 exact / <0 majorant / >0 minorant, coup)
+Entry = Tuple[int, int, int, Optional[Move]]
+
+# nombre d'écritures entre deux contrôles de la taille de la table
+CHECK_EVERY = 256
+
+
+class PositionCache:
+    """Search results that outlive the process: canonical position key -> depth, score, bound, move.
+
+    One sqlite file in WAL mode, so every worker process can open it and read while another
+    writes; moves are stored in the canonical frame and symmetric positions share an entry.
+    Each row carries the time of its last store or hit; once the table holds more than
+    `max_entries` rows, the least recently used tenth is deleted. Hits are stamped in the
+    next write transaction, so probing never writes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched: Set[int] = set()
+        self._puts = 0
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS positions ("
+                         "key INTEGER PRIMARY KEY, depth INTEGER NOT NULL, score INTEGER NOT NULL, "
+                         "flag INTEGER NOT NULL, move INTEGER, stamp INTEGER NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS positions_stamp ON positions (stamp)")
+        self._db.commit()
+
+    @staticmethod
+    def _signed(key: int) -> int:
+        # sqlite stocke des entiers signés sur 64 bits
+        return key - (1 << 64) if key >= 1 << 63 else key
+
+    def get(self, board: Board, to_move: Player) -> Optional[Entry]:
+        key, t = canonical_key(board, to_move)
+        key = self._signed(key)
+        with self._lock:
+            row = self._db.execute("SELECT depth, score, flag, move FROM positions WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched.add(key)
+        depth, score, flag, code = row
+        return depth, score, flag, None if code is None else from_canonical(MOVE_TABLE[code], t)
+
+    def put(self, board: Board, to_move: Player, depth: int, score: int, flag: int,
+            move: Optional[Move]) -> None:
+        """Store a result unless the cache already holds a deeper one for this position."""
+        key, t = canonical_key(board, to_move)
+        code = None if move is None else encode_move(*to_canonical(move, t))
+        now = time.time_ns()
+        with self._lock:
+            with self._db:
+                self._db.execute("INSERT INTO positions (key, depth, score, flag, move, stamp) "
+                                 "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                                 "depth = excluded.depth, score = excluded.score, flag = excluded.flag, "
+                                 "move = excluded.move, stamp = excluded.stamp WHERE excluded.depth >= depth",
+                                 (self._signed(key), depth, score, flag, code, now))
+                if self._touched:
+                    self._db.executemany("UPDATE positions SET stamp = ? WHERE key = ?",
+                                         [(now, k) for k in self._touched])
+                    self._touched.clear()
+                self._puts += 1
+                if self._puts % CHECK_EVERY == 0:
+                    self._evict()
+
+    def _evict(self) -> None:
+        # la table est partagée : on recompte plutôt que de tenir un compteur par processus
+        count = self._db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        if count > self.max_entries:
+            drop = count - self.max_entries + self.max_entries // 10
+            self._db.execute("DELETE FROM positions WHERE key IN "
+                             "(SELECT key FROM positions ORDER BY stamp LIMIT ?)", (drop,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# cache ouvert par open_cache() et consulté par minimax.best_move
+CACHE: Optional[PositionCache] = None
+
+
+def open_cache(path: Optional[str], max_entries: int = 1_000_000) -> None:
+    global CACHE
+    if CACHE is not None:
+        CACHE.close()
+    CACHE = None if path is None else PositionCache(path, max_entries)
@@ -0,0 +1,84 @@
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..board import MOVE_TABLE, encode_move
+from ..symmetry import CELL_PERMS, INVERSE, transform_move
+from .selfplay import RECORD_DTYPE, list_shards, read_shard, unpack_cells
+
+# indices de rassemblement des 8 symétries : augmented[:, j] = original[:, GATHER[t][j]]
+SYM_CELL_GATHER = np.array([CELL_PERMS[INVERSE[t]] for t in range(8)], dtype=np.intp)
+SYM_MOVE_GATHER = np.array([[encode_move(*transform_move(mv, INVERSE[t])) for mv in MOVE_TABLE] for t in range(8)],
+                           dtype=np.intp)
+
+
+def augment(cells: np.ndarray, policy: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Apply symmetry t[i] (see symmetry.transform_move) to row i of (B, 36) cells and (B, 288) targets."""
+    t = np.asarray(t, dtype=np.intp)
+    return (np.take_along_axis(cells, SYM_CELL_GATHER[t], axis=1),
+            np.take_along_axis(policy, SYM_MOVE_GATHER[t], axis=1))
+
+
+class ReplayBuffer:
+    """Training samples drawn from the newest self-play shards, memory-mapped in place.
+
+    The window holds the `window` most recent records across the shards of `directory` (see
+    selfplay.ShardWriter); refresh() picks up new records and shards and drops the old ones.
+    sample() draws uniformly in the window with one searchsorted over the shard offsets, then
+    decodes the 2-bit cells, normalises the visits into a policy target and, with augment_symmetry=True,
+    applies one of the 8 board symmetries per sample, so no augmented copy is ever stored.
+    """
+
+    def __init__(self, directory: str, window: int = 1_000_000) -> None:
+        self.directory = directory
+        self.window = window
+        self._maps: Dict[str, np.ndarray] = {}
+        self._shards: List[np.ndarray] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Rescan the shard directory; returns the number of records in the window."""
+        picked: List[Tuple[str, np.ndarray]] = []
+        total = 0
+        for path in reversed(list_shards(self.directory)):
+            if total >= self.window:
+                break
+            m = self._maps.get(path)
+            # le shard en cours d'écriture grossit : on le projette à nouveau
+            if m is None or len(m) < os.path.getsize(path) // RECORD_DTYPE.itemsize:
+                m = read_shard(path)
+            if len(m):
+                picked.append((path, m))
+                total += len(m)
+        picked.reverse()
+        self._maps = dict(picked)
+        self._shards = [m for _, m in picked]
+        self._offsets = np.concatenate([[0], np.cumsum([len(m) for m in self._shards])]).astype(np.int64)
+        return len(self)
+
+    def __len__(self) -> int:
+        return int(min(self._offsets[-1], self.window))
+
+    def records(self, idx: np.ndarray) -> np.ndarray:
+        """Raw records at window positions `idx` (0 = oldest record of the window)."""
+        idx = np.asarray(idx, dtype=np.int64) + (self._offsets[-1] - len(self))
+        shard = np.searchsorted(self._offsets, idx, side="right") - 1
+        out = np.empty(len(idx), dtype=RECORD_DTYPE)
+        for s in np.unique(shard).tolist():
+            hit = shard == s
+            out[hit] = self._shards[s][idx[hit] - self._offsets[s]]
+        return out
+
+    def sample(self, batch: int, rng: Optional[np.random.Generator] = None,
+               augment_symmetry: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(cells (B, 36) int8, policy (B, 288) float32, value (B,) float32) drawn uniformly."""
+        if len(self) == 0:
+            raise ValueError("replay buffer is empty")
+        rng = np.random.default_rng() if rng is None else rng
+        rec = self.records(rng.integers(0, len(self), size=batch))
+        cells = unpack_cells(rec["cells"])
+        visits = rec["visits"].astype(np.float32)
+        policy = visits / np.maximum(visits.sum(axis=1, keepdims=True), 1.0)
+        if augment_symmetry:
+            cells, policy = augment(cells, policy, rng.integers(0, 8, size=batch))
+        return cells, policy, rec["outcome"].astype(np.float32)
@@ -0,0 +1,123 @@
+import os
+import time
+from typing import List, Optional
+import numpy as np
+from ..game import Game
+from ..board import MOVE_TABLE
+from . import mcts, policy
+from .batch import mover_cells
+
+# enregistrement fixe de 587 octets : 36 cases sur 2 bits (vues du joueur au trait : 1 = lui,
+# 2 = adversaire), visites de la racine par code de coup, résultat pour le joueur au trait, ply
+RECORD_DTYPE = np.dtype([("cells", "u1", 9), ("visits", "<u2", 288), ("outcome", "i1"), ("ply", "u1")])
+SHARD_SUFFIX = ".rec"
+_CELL_SHIFTS = np.arange(4, dtype=np.uint8) * 2
+
+
+def pack_cells(cells: np.ndarray) -> np.ndarray:
+    """(N, 36) cells in 0..2 -> (N, 9) uint8, four cells per byte (cell i in bits 2*(i%4))."""
+    c = np.asarray(cells, dtype=np.uint8).reshape(-1, 9, 4)
+    return np.bitwise_or.reduce(c << _CELL_SHIFTS, axis=2).astype(np.uint8)
+
+
+def unpack_cells(packed: np.ndarray) -> np.ndarray:
+    p = np.asarray(packed, dtype=np.uint8).reshape(-1, 9, 1)
+    return ((p >> _CELL_SHIFTS) & 3).reshape(-1, 36).astype(np.int8)
+
+
+def play_game(engine: str = "policy",
+              simulations: int = 200,
+              temperature_plies: int = 8,
+              evaluator: Optional[policy.Evaluator] = None,
+              rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Play one self-play game and return its positions as RECORD_DTYPE records.
+
+    Each move searches `simulations` simulations with policy.best_move or MCTS; for the first
+    `temperature_plies` plies the move is sampled in proportion to the root visits, then the
+    engine's choice is played. Search trees are reset per game so memory stays flat.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    policy.TREE.clear()
+    mcts.mcts_reset()
+    g = Game()
+    cells: List[np.ndarray] = []
+    visits: List[np.ndarray] = []
+    sides: List[int] = []
+    while not g.terminal():
+        side = g.current_player()
+        if engine == "policy":
+            mv = policy.best_move(g.board, side, simulations=simulations, evaluator=evaluator)
+            n = policy.root_visits(g.board, side)
+        elif engine == "mcts":
+            mcts.mcts_rebase(g.board, side)
+            mv = mcts.best_move_mcts(g.board, side, simulations=simulations)
+            n = mcts.root_visits(g.board, side)
+        else:
+            raise ValueError(f"unknown engine: {engine}")
+        if len(sides) < temperature_plies and n.sum() > 0:
+            mv = MOVE_TABLE[int(rng.choice(288, p=n / n.sum()))]
+        cells.append(mover_cells(g.board, side))
+        visits.append(n)
+        sides.append(int(side))
+        g.play(*mv)
+
+    win = g.winner()
+    out = np.zeros(len(sides), dtype=RECORD_DTYPE)
+    out["cells"] = pack_cells(np.stack(cells))
+    out["visits"] = np.minimum(np.stack(visits), 65535)
+    out["outcome"] = [0 if win is None else (1 if int(win) == s else -1) for s in sides]
+    out["ply"] = np.arange(len(sides))
+    return out
+
+
+class ShardWriter:
+    """Append-only record files, rolled over every `shard_records` records.
+
+    Shards are named shard-<creation time ns>-<writer id>.rec so that sorting names sorts them
+    by age, and are never reopened once rolled. Records are appended whole and flushed per
+    call; a reader takes floor(size / itemsize) records, which skips a write cut short.
+    """
+
+    def __init__(self, directory: str, writer_id: int = 0, shard_records: int = 100_000) -> None:
+        self.directory = directory
+        self.writer_id = writer_id
+        self.shard_records = shard_records
+        self._fh = None
+        self._count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, records: np.ndarray) -> None:
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        while len(records):
+            if self._fh is None or self._count >= self.shard_records:
+                self._roll()
+            take = records[:self.shard_records - self._count]
+            self._fh.write(take.tobytes())
+            self._count += len(take)
+            records = records[len(take):]
+        if self._fh is not None:
+            self._fh.flush()
+
+    def _roll(self) -> None:
+        self.close()
+        name = f"shard-{time.time_ns():020d}-{self.writer_id:03d}{SHARD_SUFFIX}"
+        self._fh = open(os.path.join(self.directory, name), "ab")
+        self._count = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def read_shard(path: str) -> np.ndarray:
+    """Read-only memory map of the complete records of one shard."""
+    n = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(n,))
+
+
+def list_shards(directory: str) -> List[str]:
+    """Shard paths of `directory`, oldest first."""
+    return [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.endswith(SHARD_SUFFIX)]
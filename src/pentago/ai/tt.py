@@ -0,0 +1,128 @@
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+import numpy as np
+from ..board import Quadrant, Direction, encode_move, MOVE_TABLE
+
+Move = Tuple[int, int, Quadrant, Direction]
+TTEntry = Tuple[int, int, int, Optional[Move]]
+
+ENTRY_BYTES = 24
+NO_MOVE = 0xFFFF
+MASK64 = (1 << 64) - 1
+
+
+class TranspositionTable:
+    """Fixed-size table of 2-slot buckets: a depth-preferred slot and an always-replace slot.
+
+    Entries live in one preallocated buffer viewed as three arrays: key, value and a packed
+    meta word (depth | flag + 1 << 8 | move << 16 | age << 32). meta == 0 marks an empty slot.
+    The key word holds key ^ value ^ meta, so a slot half-written by another process sharing
+    the buffer fails validation instead of returning a mixed entry (lockless hashing).
+    """
+
+    def __init__(self, mb: float, shared: bool = False, name: Optional[str] = None) -> None:
+        buckets = 1
+        while buckets * 2 * 2 * ENTRY_BYTES <= mb * (1 << 20):
+            buckets *= 2
+        self.mb = mb
+        self.buckets = buckets
+        self.slots = buckets * 2
+        self._mask = buckets - 1
+        # shared=True : tampon en mémoire partagée (multiprocessing), rattachable par son nom
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        if shared or name is not None:
+            if name is None:
+                self._shm = shared_memory.SharedMemory(create=True, size=self.slots * ENTRY_BYTES)
+            else:
+                self._shm = shared_memory.SharedMemory(name=name)
+            self._buf = self._shm.buf
+        else:
+            self._buf = bytearray(self.slots * ENTRY_BYTES)
+        n = self.slots
+        mv = memoryview(self._buf)
+        self._keys = mv[0:n * 8].cast("Q")
+        self._vals = mv[n * 8:n * 16].cast("q")
+        self._meta = mv[n * 16:n * 24].cast("Q")
+        self.age = 1
+        self.used = 0
+        self.collisions = 0
+
+    @property
+    def name(self) -> Optional[str]:
+        return None if self._shm is None else self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self.slots * ENTRY_BYTES
+
+    def clear(self) -> None:
+        # meta == 0 suffit à marquer un emplacement vide : remise à zéro sur place, sans copie
+        np.frombuffer(self._meta, dtype=np.uint64)[:] = 0
+        self.age = 1
+        self.used = 0
+        self.collisions = 0
+
+    def close(self, unlink: bool = False) -> None:
+        if self._shm is None:
+            return
+        self._keys.release()
+        self._vals.release()
+        self._meta.release()
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+        self._shm = None
+
+    def new_search(self) -> None:
+        self.age = (self.age % 0xFFFF) + 1
+
+    def fill(self) -> float:
+        return self.used / self.slots
+
+    def recount(self) -> None:
+        # `used` ne compte que les écritures de ce processus : recompté sur le tampon (TT partagée)
+        self.used = int(np.count_nonzero(np.frombuffer(self._meta, dtype=np.uint64)))
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        i = (key & self._mask) * 2
+        keys = self._keys
+        vals = self._vals
+        meta = self._meta[i]
+        val = vals[i]
+        if keys[i] ^ (val & MASK64) ^ meta != key or meta == 0:
+            i += 1
+            meta = self._meta[i]
+            val = vals[i]
+            if keys[i] ^ (val & MASK64) ^ meta != key or meta == 0:
+                return None
+        code = (meta >> 16) & 0xFFFF
+        return (meta & 0xFF, val, ((meta >> 8) & 0xFF) - 1,
+                None if code == NO_MOVE else MOVE_TABLE[code])
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: Optional[Move]) -> None:
+        i = (key & self._mask) * 2
+        keys = self._keys
+        vals = self._vals
+        meta = self._meta
+        m0 = meta[i]
+        if (m0 == 0 or keys[i] ^ (vals[i] & MASK64) ^ m0 == key or (m0 >> 32) != self.age
+                or depth >= (m0 & 0xFF)):
+            slot = i
+        else:
+            slot = i + 1
+        old = meta[slot]
+        if old == 0:
+            self.used += 1
+        elif keys[slot] ^ (vals[slot] & MASK64) ^ old != key:
+            self.collisions += 1
+        code = NO_MOVE if move is None else encode_move(*move)
+        m = min(depth, 0xFF) | ((flag + 1) << 8) | (code << 16) | (self.age << 32)
+        keys[slot] = key ^ (value & MASK64) ^ m
+        vals[slot] = value
+        meta[slot] = m
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tt_fill": int(self.fill() * 1000),
+            "tt_collisions": self.collisions,
+        }
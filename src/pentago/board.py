@@ -1,3 +1,4 @@
+import random
 from enum import IntEnum
 from typing import List, Tuple
 
@@ -19,6 +20,21 @@ class Direction(IntEnum):
     CCW = -1
 
 
+def encode_move(r: int, c: int, q: Quadrant, d: Direction) -> int:
+    # 9 bits : case * 8 + quadrant * 2 + sens (0 = CW, 1 = CCW)
+    return (r * 6 + c) * 8 + q * 2 + (0 if d == Direction.CW else 1)
+
+
+def decode_move(code: int) -> Tuple[int, int, Quadrant, Direction]:
+    return MOVE_TABLE[code]
+
+
+MOVE_TABLE: List[Tuple[int, int, Quadrant, Direction]] = [
+    (i // 48, (i // 8) % 6, Quadrant((i // 2) % 4), Direction.CW if i % 2 == 0 else Direction.CCW)
+    for i in range(288)
+]
+
+
 def _compute_segments() -> List[List[Tuple[int, int]]]:
     segments = []
     for r in range(6):
@@ -43,73 +59,252 @@ def _compute_segments() -> List[List[Tuple[int, int]]]:
     return uniq
 
 
+QUADRANT_ORIGINS = ((0, 0), (0, 3), (3, 0), (3, 3))
+QUADRANT_MASKS = [sum(1 << ((r0 + i) * 6 + c0 + j) for i in range(3) for j in range(3))
+                  for r0, c0 in QUADRANT_ORIGINS]
+QUADRANT_SHIFTS = [r0 * 6 + c0 for r0, c0 in QUADRANT_ORIGINS]
+FULL_MASK = (1 << 36) - 1
+
+
+def _compute_rotation_tables() -> List[List[int]]:
+    # tables[q * 2 + k][pattern] -> bits du quadrant q après rotation (k=0 CW, k=1 CCW),
+    # pattern = 9 bits du quadrant, ligne par ligne
+    tables = []
+    for r0, c0 in QUADRANT_ORIGINS:
+        for d in (Direction.CW, Direction.CCW):
+            table = []
+            for pattern in range(512):
+                out = 0
+                for i in range(3):
+                    for j in range(3):
+                        if (pattern >> (i * 3 + j)) & 1:
+                            if d == Direction.CW:
+                                ni, nj = j, 2 - i
+                            else:
+                                ni, nj = 2 - j, i
+                            out |= 1 << ((r0 + ni) * 6 + c0 + nj)
+                table.append(out)
+            tables.append(table)
+    return tables
+
+
+ROTATION_TABLES = _compute_rotation_tables()
+
+
+def _compute_zobrist() -> Tuple[List[List[int]], List[List[List[int]]], int]:
+    rng = random.Random(0x5EED)
+    cells = [[0] * 36] + [[rng.getrandbits(64) for _ in range(36)] for _ in range(2)]
+    # quad[p][q][pattern] -> xor des clés des pierres de p dans le quadrant q
+    quad: List[List[List[int]]] = [[]]
+    for p in (1, 2):
+        per_q = []
+        for r0, c0 in QUADRANT_ORIGINS:
+            table = []
+            for pattern in range(512):
+                k = 0
+                for i in range(3):
+                    for j in range(3):
+                        if (pattern >> (i * 3 + j)) & 1:
+                            k ^= cells[p][(r0 + i) * 6 + c0 + j]
+                table.append(k)
+            per_q.append(table)
+        quad.append(per_q)
+    return cells, quad, rng.getrandbits(64)
+
+
+ZOBRIST, ZOBRIST_QUADRANT, ZOBRIST_SIDE = _compute_zobrist()
+
+
+def _cell_mask(cells: List[Tuple[int, int]]) -> int:
+    m = 0
+    for r, c in cells:
+        m |= 1 << (r * 6 + c)
+    return m
+
+
+def _compute_segment_values() -> List[int]:
+    # valeur d'un segment du point de vue de noir, indexée par noirs + 6 * blancs
+    out = []
+    for code in range(36):
+        b, w = code % 6, code // 6
+        if w == 0 and b > 0:
+            out.append(10 ** b)
+        elif b == 0 and w > 0:
+            out.append(-10 ** w)
+        else:
+            out.append(0)
+    return out
+
+
+SEGMENT_VALUES = _compute_segment_values()
+
+
+def _pattern_bits(pattern: int, q: int) -> int:
+    s = QUADRANT_SHIFTS[q]
+    return ((pattern & 7) << s) | (((pattern >> 3) & 7) << (s + 6)) | (((pattern >> 6) & 7) << (s + 12))
+
+
+def _compute_segment_index(line_masks: List[int]):
+    cells = [tuple((s, 1) for s, m in enumerate(line_masks) if (m >> i) & 1) for i in range(36)]
+    # deltas[q * 2 + k][motif] -> ((segment, variation du nombre de pierres), ...) quand le motif
+    # du quadrant q tourne dans le sens k (mêmes indices que ROTATION_TABLES)
+    deltas = []
+    for q in range(4):
+        touching = [(s, m) for s, m in enumerate(line_masks) if m & QUADRANT_MASKS[q]]
+        for k in range(2):
+            table = ROTATION_TABLES[q * 2 + k]
+            per_pattern = []
+            for pattern in range(512):
+                before = _pattern_bits(pattern, q)
+                after = table[pattern]
+                per_pattern.append(tuple((s, (after & m).bit_count() - (before & m).bit_count())
+                                         for s, m in touching
+                                         if (after & m).bit_count() != (before & m).bit_count()))
+            deltas.append(per_pattern)
+    return cells, deltas
+
+
+# poids d'une pierre dans le code d'un segment
+SEGMENT_WEIGHT = (0, 1, 6)
+
+
+def quadrant_pattern(bits: int, q: int) -> int:
+    s = QUADRANT_SHIFTS[q]
+    return ((bits >> s) & 7) | (((bits >> (s + 6)) & 7) << 3) | (((bits >> (s + 12)) & 7) << 6)
+
+
+def rotate_bits(bits: int, q: int, d: Direction) -> int:
+    table = ROTATION_TABLES[q * 2 + (0 if d == Direction.CW else 1)]
+    return (bits & ~QUADRANT_MASKS[q]) | table[quadrant_pattern(bits, q)]
+
+
 class Board:
     SEGMENTS = _compute_segments()
+    LINE_MASKS = [_cell_mask(seg) for seg in SEGMENTS]
+    # variations (segment, pierres) d'une pose sur chaque case et de chaque rotation de motif
+    CELL_DELTAS, ROTATION_DELTAS = _compute_segment_index(LINE_MASKS)
 
     def __init__(self) -> None:
-        self.grid: List[List[int]] = [[0 for _ in range(6)] for _ in range(6)]
+        # bits[1] = pierres noires, bits[2] = pierres blanches ; bit r*6+c
+        self.bits: List[int] = [0, 0, 0]
+        # clé de Zobrist 64 bits, tenue à jour par place/remove/rotate
+        self.key = 0
+        # par segment : noirs + 6 * blancs ; score = somme des SEGMENT_VALUES (point de vue de noir) ;
+        # fives[p] = nombre de segments complets de p. Tenus à jour par place/remove/rotate.
+        self.seg: List[int] = [0] * len(Board.SEGMENTS)
+        self.score = 0
+        self.fives: List[int] = [0, 0, 0]
 
     def copy(self) -> "Board":
         b = Board()
-        b.grid = [row[:] for row in self.grid]
+        b.bits = self.bits[:]
+        b.key = self.key
+        b.seg = self.seg[:]
+        b.score = self.score
+        b.fives = self.fives[:]
         return b
 
+    @classmethod
+    def from_bits(cls, black: int, white: int) -> "Board":
+        b = cls()
+        for p, x in ((Player.BLACK, black), (Player.WHITE, white)):
+            while x:
+                low = x & -x
+                i = low.bit_length() - 1
+                b.place(i // 6, i % 6, p)
+                x ^= low
+        return b
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return [[self.at(r, c) for c in range(6)] for r in range(6)]
+
+    def hash_key(self, to_move: Player) -> int:
+        return self.key if to_move == Player.BLACK else self.key ^ ZOBRIST_SIDE
+
+    def stones(self, player: Player) -> int:
+        return self.bits[player]
+
     def at(self, r: int, c: int) -> int:
-        return self.grid[r][c]
+        m = 1 << (r * 6 + c)
+        if self.bits[1] & m:
+            return 1
+        if self.bits[2] & m:
+            return 2
+        return 0
 
     def place(self, r: int, c: int, player: Player) -> None:
-        if self.grid[r][c] != 0:
+        m = 1 << (r * 6 + c)
+        if (self.bits[1] | self.bits[2]) & m:
             raise ValueError("Cell not empty")
-        self.grid[r][c] = int(player)
+        self.bits[player] |= m
+        self.key ^= ZOBRIST[player][r * 6 + c]
+        self._shift(Board.CELL_DELTAS[r * 6 + c], SEGMENT_WEIGHT[player])
+
+    def remove(self, r: int, c: int) -> None:
+        i = r * 6 + c
+        for p in (1, 2):
+            if (self.bits[p] >> i) & 1:
+                self.bits[p] ^= 1 << i
+                self.key ^= ZOBRIST[p][i]
+                self._shift(Board.CELL_DELTAS[i], -SEGMENT_WEIGHT[p])
 
     def rotate(self, q: Quadrant, d: Direction) -> None:
-        if q == Quadrant.Q00:
-            r0, c0 = 0, 0
-        elif q == Quadrant.Q01:
-            r0, c0 = 0, 3
-        elif q == Quadrant.Q10:
-            r0, c0 = 3, 0
-        else:
-            r0, c0 = 3, 3
-        sub = [[self.grid[r0 + i][c0 + j] for j in range(3)] for i in range(3)]
-        rot = [[0] * 3 for _ in range(3)]
-        if d == Direction.CW:
-            for i in range(3):
-                for j in range(3):
-                    rot[j][2 - i] = sub[i][j]
-        elif d == Direction.CCW:
-            for i in range(3):
-                for j in range(3):
-                    rot[2 - j][i] = sub[i][j]
-        else:
+        if d != Direction.CW and d != Direction.CCW:
             raise ValueError("Invalid direction")
-        for i in range(3):
-            for j in range(3):
-                self.grid[r0 + i][c0 + j] = rot[i][j]
+        bits = self.bits
+        k = q * 2 + (0 if d == Direction.CW else 1)
+        table = ROTATION_TABLES[k]
+        deltas = Board.ROTATION_DELTAS[k]
+        keep = ~QUADRANT_MASKS[q]
+        key = self.key
+        for p in (1, 2):
+            x = bits[p]
+            pattern = quadrant_pattern(x, q)
+            if pattern:
+                x = (x & keep) | table[pattern]
+                bits[p] = x
+                hq = ZOBRIST_QUADRANT[p][q]
+                key ^= hq[pattern] ^ hq[quadrant_pattern(x, q)]
+                if deltas[pattern]:
+                    self._shift(deltas[pattern], SEGMENT_WEIGHT[p])
+        self.key = key
+
+    def _shift(self, deltas: Tuple[Tuple[int, int], ...], weight: int) -> None:
+        seg = self.seg
+        fives = self.fives
+        score = self.score
+        for s, n in deltas:
+            old = seg[s]
+            new = old + n * weight
+            seg[s] = new
+            score += SEGMENT_VALUES[new] - SEGMENT_VALUES[old]
+            if old == 5 or new == 5:
+                fives[1] += 1 if new == 5 else -1
+            elif old == 30 or new == 30:
+                fives[2] += 1 if new == 30 else -1
+        self.score = score
+
+    def make(self, r: int, c: int, q: Quadrant, d: Direction, player: Player) -> None:
+        self.place(r, c, player)
+        self.rotate(q, d)
+
+    def unmake(self, r: int, c: int, q: Quadrant, d: Direction) -> None:
+        self.rotate(q, Direction(-d))
+        self.remove(r, c)
 
     def legal_placements(self) -> List[Tuple[int, int]]:
         out = []
-        for r in range(6):
-            for c in range(6):
-                if self.grid[r][c] == 0:
-                    out.append((r, c))
+        empty = ~(self.bits[1] | self.bits[2]) & FULL_MASK
+        while empty:
+            low = empty & -empty
+            i = low.bit_length() - 1
+            out.append((i // 6, i % 6))
+            empty ^= low
         return out
 
     def check_five(self, player: Player) -> bool:
-        p = int(player)
-        for seg in Board.SEGMENTS:
-            ok = True
-            for r, c in seg:
-                if self.grid[r][c] != p:
-                    ok = False
-                    break
-            if ok:
-                return True
-        return False
+        return self.fives[player] > 0
 
     def full(self) -> bool:
-        for r in range(6):
-            for c in range(6):
-                if self.grid[r][c] == 0:
-                    return False
-        return True
\ No newline at end of file
+        return (self.bits[1] | self.bits[2]) == FULL_MASK
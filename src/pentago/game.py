@@ -12,6 +12,7 @@ class Game:
         self.to_move: Player = Player.BLACK
         self._winner: Optional[Player] = None
         self._draw: bool = False
+        self._history: List[Tuple[int, int, Quadrant, Direction, Player]] = []
 
     def current_player(self) -> Player:
         return self.to_move
@@ -29,8 +30,8 @@ class Game:
     def play(self, r: int, c: int, q: Quadrant, d: Direction) -> None:
         if self.terminal():
             raise RuntimeError("Game over")
-        self.board.place(r, c, self.to_move)
-        self.board.rotate(q, d)
+        self.board.make(r, c, q, d, self.to_move)
+        self._history.append((r, c, q, d, self.to_move))
         cur = self.board.check_five(self.to_move)
         opp = self.board.check_five(_opponent(self.to_move))
         if cur and opp:
@@ -44,6 +45,15 @@ class Game:
         else:
             self.to_move = _opponent(self.to_move)
 
+    def undo(self) -> None:
+        if not self._history:
+            raise RuntimeError("Nothing to undo")
+        r, c, q, d, mover = self._history.pop()
+        self.board.unmake(r, c, q, d)
+        self.to_move = mover
+        self._winner = None
+        self._draw = False
+
     def terminal(self) -> bool:
         return self._winner is not None or self._draw
 
@@ -0,0 +1,112 @@
+from typing import List, Tuple
+from .board import Board, Player, Quadrant, Direction, ZOBRIST, ZOBRIST_SIDE
+
+Move = Tuple[int, int, Quadrant, Direction]
+
+
+def _map_cell(t: int, r: int, c: int) -> Tuple[int, int]:
+    # t = 4 * miroir + nombre de quarts de tour horaires
+    if t >= 4:
+        c = 5 - c
+    for _ in range(t % 4):
+        r, c = c, 5 - r
+    return r, c
+
+
+def _compute_tables():
+    perms = []
+    quads = []
+    for t in range(8):
+        perm = []
+        for i in range(36):
+            r, c = _map_cell(t, i // 6, i % 6)
+            perm.append(r * 6 + c)
+        perms.append(perm)
+        qs = []
+        for r0, c0 in ((0, 0), (0, 3), (3, 0), (3, 3)):
+            r, c = _map_cell(t, r0 + 1, c0 + 1)
+            qs.append(Quadrant((r // 3) * 2 + c // 3))
+        quads.append(qs)
+    inverse = [next(u for u in range(8) if all(perms[u][perms[t][i]] == i for i in range(36))) for t in range(8)]
+    # row_hash[t][p][row][bits] -> clé de Zobrist des pierres de p de cette ligne, une fois transformées par t
+    row_hash = []
+    for t in range(8):
+        per_p = [[]]
+        for p in (1, 2):
+            rows = []
+            for row in range(6):
+                table = []
+                for bits in range(64):
+                    k = 0
+                    for j in range(6):
+                        if (bits >> j) & 1:
+                            k ^= ZOBRIST[p][perms[t][row * 6 + j]]
+                    table.append(k)
+                rows.append(table)
+            per_p.append(rows)
+        row_hash.append(per_p)
+    return perms, quads, inverse, row_hash
+
+
+CELL_PERMS, QUADRANT_PERMS, INVERSE, _ROW_HASH = _compute_tables()
+
+
+def transform_move(mv: Move, t: int) -> Move:
+    r, c, q, d = mv
+    i = CELL_PERMS[t][r * 6 + c]
+    if t >= 4:
+        d = Direction(-d)
+    return i // 6, i % 6, QUADRANT_PERMS[t][q], d
+
+
+def transform_board(board: Board, t: int) -> Board:
+    out = Board()
+    perm = CELL_PERMS[t]
+    for i in range(36):
+        v = board.at(i // 6, i % 6)
+        if v:
+            j = perm[i]
+            out.place(j // 6, j % 6, Player(v))
+    return out
+
+
+def canonical_key(board: Board, to_move: Player) -> Tuple[int, int]:
+    """Return (key, t): the smallest Zobrist key over the 8 symmetries and the transform reaching it."""
+    black = board.bits[1]
+    white = board.bits[2]
+    rows_b = [(black >> (6 * r)) & 63 for r in range(6)]
+    rows_w = [(white >> (6 * r)) & 63 for r in range(6)]
+    best = -1
+    best_t = 0
+    for t in range(8):
+        hb = _ROW_HASH[t][1]
+        hw = _ROW_HASH[t][2]
+        k = 0
+        for r in range(6):
+            k ^= hb[r][rows_b[r]] ^ hw[r][rows_w[r]]
+        if best < 0 or k < best:
+            best = k
+            best_t = t
+    if to_move != Player.BLACK:
+        best ^= ZOBRIST_SIDE
+    return best, best_t
+
+
+def to_canonical(mv: Move, t: int) -> Move:
+    return mv if t == 0 else transform_move(mv, t)
+
+
+def from_canonical(mv: Move, t: int) -> Move:
+    return mv if t == 0 else transform_move(mv, INVERSE[t])
+
+
+def canonical_moves(moves: List[Move], t: int) -> List[Move]:
+    if t == 0:
+        return moves
+    return [transform_move(mv, t) for mv in moves]
+
+
+def position_key(board: Board, to_move: Player, symmetry: bool) -> Tuple[int, int]:
+    if symmetry:
+        return canonical_key(board, to_move)
+    return board.hash_key(to_move), 0
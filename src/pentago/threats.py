@@ -0,0 +1,95 @@
+from typing import Dict, List, Tuple
+from .board import Board, Player, Quadrant, Direction, FULL_MASK, QUADRANT_MASKS, rotate_bits, MOVE_TABLE
+
+Move = Tuple[int, int, Quadrant, Direction]
+
+ROTATIONS = [(q, d) for q in Quadrant for d in (Direction.CW, Direction.CCW)]
+
+
+def _compute_line_tables() -> List[Tuple[int, List[Tuple[int, int]]]]:
+    # pour chaque ligne : (reach, [(pre, rots), ...]) où pre = cases qui se retrouvent sur la ligne
+    # après l'une des rotations du masque rots (bit k = ROTATIONS[k]), reach = union des pre
+    out = []
+    for m in Board.LINE_MASKS:
+        groups: Dict[int, int] = {}
+        for k, (q, d) in enumerate(ROTATIONS):
+            inv = Direction.CCW if d == Direction.CW else Direction.CW
+            pre = rotate_bits(m, q, inv) if m & QUADRANT_MASKS[q] else m
+            groups[pre] = groups.get(pre, 0) | (1 << k)
+        reach = 0
+        for pre in groups:
+            reach |= pre
+        out.append((reach, list(groups.items())))
+    return out
+
+
+LINE_TABLES = _compute_line_tables()
+
+
+def _opponent(p: Player) -> Player:
+    return Player.BLACK if p == Player.WHITE else Player.WHITE
+
+
+def winning_codes(board: Board, player: Player, first_only: bool = False) -> List[int]:
+    """Move codes (see board.encode_move) after which `player` has five in a row."""
+    mine = board.bits[player]
+    if mine.bit_count() < 4:
+        return []
+    empty = ~(board.bits[1] | board.bits[2]) & FULL_MASK
+    codes: List[int] = []
+    for reach, groups in LINE_TABLES:
+        # une seule pose : il faut déjà 4 pierres capables d'atteindre la ligne
+        if (mine & reach).bit_count() < 4:
+            continue
+        for pre, rots in groups:
+            miss = pre & ~mine
+            if miss & (miss - 1):
+                continue
+            if miss == 0:
+                # déjà alignée après rotation : n'importe quelle pose gagne
+                cells = empty
+            elif miss & empty:
+                cells = miss
+            else:
+                continue
+            while cells:
+                low = cells & -cells
+                i = (low.bit_length() - 1) * 8
+                for k in range(8):
+                    if (rots >> k) & 1:
+                        codes.append(i + k)
+                cells ^= low
+            if first_only:
+                return codes
+    return sorted(set(codes))
+
+
+def winning_moves(board: Board, player: Player) -> List[Move]:
+    return [MOVE_TABLE[c] for c in winning_codes(board, player)]
+
+
+def has_winning_move(board: Board, player: Player) -> bool:
+    return bool(winning_codes(board, player, first_only=True))
+
+
+def safe_moves(board: Board, player: Player, moves: List[Move], first_only: bool = False) -> List[Move]:
+    """Moves after which the opponent has no immediate win (draws by a full board are kept)."""
+    opp = _opponent(player)
+    out = []
+    for mv in moves:
+        r, c, q, d = mv
+        board.make(r, c, q, d, player)
+        if board.check_five(player):
+            ok = True
+        elif board.check_five(opp):
+            ok = False
+        elif board.full():
+            ok = True
+        else:
+            ok = not has_winning_move(board, opp)
+        board.unmake(r, c, q, d)
+        if ok:
+            out.append(mv)
+            if first_only:
+                break
+    return out
@@ -14,4 +14,21 @@ def test_api_flow():
     r = client.post(f"/bot/{gid}", json={"depth":2})
     assert r.status_code == 200
     js = r.json()
-    assert "move" in js and isinstance(js["move"], str)
\ No newline at end of file
+    assert "move" in js and isinstance(js["move"], str)
+
+
+def test_bot_workers_are_capped_by_server_config(monkeypatch):
+    import server.main as server
+    monkeypatch.setattr(server, "MAX_WORKERS", 2)
+    assert server.bot_workers(None) == 1
+    assert server.bot_workers(64) == 2
+    assert server.bot_workers(0) == 1
+
+
+def test_bot_rejects_unknown_parallel_mode():
+    client = TestClient(app)
+    gid = client.post("/new").json()["game_id"]
+    r = client.post(f"/bot/{gid}", json={"depth": 1, "engine": "mcts", "parallel": "gpu"})
+    assert r.status_code == 400
+    # les autres corps invalides gardent la réponse de validation de FastAPI
+    assert client.post(f"/bot/{gid}", json={"engine": "mcts"}).status_code == 422
@@ -15,4 +15,23 @@ def test_new_and_mcts_move():
     data2 = r2.json()
     assert "move" in data2
     assert data2["engine"] == "mcts"
-    assert data2["state"]["to_move"] == "W"
\ No newline at end of file
+    assert data2["state"]["to_move"] == "W"
+
+def test_mcts_move_reports_tree_size():
+    gid = client.post("/new").json()["game_id"]
+    data = client.post(f"/bot/{gid}", json={"depth": 1, "simulations": 30, "engine": "mcts"}).json()
+    tree = data["tree"]
+    assert tree["nodes"] > 1 and tree["bytes"] > 0
+    assert client.get(f"/progress/{gid}").json()["tree"] == tree
+
+def test_root_parallel_move_does_not_report_the_idle_tree(monkeypatch):
+    import server.main as server
+    from pentago.ai import mcts
+    monkeypatch.setattr(server, "MAX_WORKERS", 2)
+    gid = client.post("/new").json()["game_id"]
+    try:
+        data = client.post(f"/bot/{gid}", json={"depth": 1, "simulations": 20, "engine": "mcts",
+                                                "parallel": "root", "workers": 2}).json()
+    finally:
+        mcts.mcts_pool_shutdown()
+    assert "tree" not in data and "tree" not in client.get(f"/progress/{gid}").json()
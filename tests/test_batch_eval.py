@@ -0,0 +1,43 @@
+import math
+import random
+import numpy as np
+from pentago.game import Game
+from pentago.ai import minimax
+from pentago.ai.batch import board_cells, evaluate_batch, has_winning_move_batch, has_safe_move
+from pentago.threats import has_winning_move, safe_moves
+
+def _positions(seed: int, count: int):
+    rng = random.Random(seed)
+    out = []
+    while len(out) < count:
+        g = Game()
+        for _ in range(rng.randrange(4, 24)):
+            if g.terminal():
+                break
+            g.play(*rng.choice(g.legal_moves()))
+        if not g.terminal():
+            out.append(g)
+    return out
+
+def test_batch_matches_scalar_evaluation_and_threats():
+    games = _positions(3, 40)
+    cells = np.stack([board_cells(g.board) for g in games])
+    for p in (1, 2):
+        scores = evaluate_batch(cells, p).tolist()
+        wins = has_winning_move_batch(cells, p).tolist()
+        for g, s, w in zip(games, scores, wins):
+            assert s == minimax.evaluate(g.board, p)
+            assert w == has_winning_move(g.board, p)
+            ok = bool(safe_moves(g.board, p, minimax.generate_moves(g.board), first_only=True))
+            assert has_safe_move(board_cells(g.board), p) == ok
+
+def test_batch_frontier_returns_same_value():
+    for g in _positions(11, 3):
+        side = g.current_player()
+        vals = []
+        for batch_eval in (False, True):
+            minimax.reset_stats()
+            vals.append(minimax.search(g.board.copy(), side, side, 2, -math.inf, math.inf, None,
+                                       progress_cb=None, start_ts=0.0, nodes0=0, last_report=[0],
+                                       report_every_nodes=2000, batch_eval=batch_eval))
+        assert vals[0] == vals[1]
@@ -0,0 +1,119 @@
+import random
+from pentago.board import Board, Player, Quadrant, Direction, ZOBRIST, SEGMENT_VALUES
+
+
+def reference_rotate(grid, q, d):
+    r0, c0 = [(0, 0), (0, 3), (3, 0), (3, 3)][q]
+    sub = [[grid[r0 + i][c0 + j] for j in range(3)] for i in range(3)]
+    for i in range(3):
+        for j in range(3):
+            if d == Direction.CW:
+                grid[r0 + j][c0 + 2 - i] = sub[i][j]
+            else:
+                grid[r0 + 2 - j][c0 + i] = sub[i][j]
+
+
+def test_bitboard_rotation_matches_grid_rotation():
+    rng = random.Random(0)
+    b = Board()
+    for r in range(6):
+        for c in range(6):
+            v = rng.choice([0, 1, 2])
+            if v:
+                b.place(r, c, Player(v))
+    for _ in range(50):
+        q = rng.choice(list(Quadrant))
+        d = rng.choice(list(Direction))
+        ref = b.grid
+        reference_rotate(ref, q, d)
+        b.rotate(q, d)
+        assert b.grid == ref
+
+
+def test_place_sets_single_bit_and_rejects_occupied():
+    b = Board()
+    b.place(2, 4, Player.WHITE)
+    assert b.stones(Player.WHITE) == 1 << (2 * 6 + 4)
+    assert b.stones(Player.BLACK) == 0
+    assert b.at(2, 4) == Player.WHITE
+    try:
+        b.place(2, 4, Player.BLACK)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_legal_placements_row_major_and_full():
+    b = Board()
+    assert b.legal_placements()[:3] == [(0, 0), (0, 1), (0, 2)]
+    for r in range(6):
+        for c in range(6):
+            if (r, c) != (5, 5):
+                b.place(r, c, Player.BLACK if (r + c) % 2 else Player.WHITE)
+    assert b.legal_placements() == [(5, 5)]
+    assert not b.full()
+    b.place(5, 5, Player.BLACK)
+    assert b.full()
+
+
+def test_copy_is_independent():
+    b = Board()
+    b.place(0, 0, Player.BLACK)
+    b2 = b.copy()
+    b2.place(1, 1, Player.WHITE)
+    assert b.at(1, 1) == 0
+    assert b2.at(0, 0) == Player.BLACK
+
+
+def full_key(b):
+    k = 0
+    for p in (1, 2):
+        for i in range(36):
+            if (b.stones(Player(p)) >> i) & 1:
+                k ^= ZOBRIST[p][i]
+    return k
+
+
+def test_zobrist_key_tracks_place_rotate_and_unmake():
+    rng = random.Random(7)
+    b = Board()
+    played = []
+    for k in range(20):
+        r, c = rng.choice(b.legal_placements())
+        q = rng.choice(list(Quadrant))
+        d = rng.choice(list(Direction))
+        b.make(r, c, q, d, Player.BLACK if k % 2 == 0 else Player.WHITE)
+        played.append((r, c, q, d))
+        assert b.key == full_key(b)
+    while played:
+        b.unmake(*played.pop())
+        assert b.key == full_key(b)
+    assert b.key == 0
+    assert b.hash_key(Player.BLACK) != b.hash_key(Player.WHITE)
+
+
+def full_counts(b):
+    seg = []
+    for m in Board.LINE_MASKS:
+        seg.append((b.stones(Player.BLACK) & m).bit_count() + 6 * (b.stones(Player.WHITE) & m).bit_count())
+    score = sum(SEGMENT_VALUES[s] for s in seg)
+    fives = [0, seg.count(5), seg.count(30)]
+    return seg, score, fives
+
+
+def test_segment_counts_track_make_and_unmake():
+    rng = random.Random(11)
+    b = Board()
+    played = []
+    for k in range(30):
+        r, c = rng.choice(b.legal_placements())
+        q = rng.choice(list(Quadrant))
+        d = rng.choice(list(Direction))
+        b.make(r, c, q, d, Player.BLACK if k % 2 == 0 else Player.WHITE)
+        played.append((r, c, q, d))
+        assert (b.seg, b.score, b.fives) == full_counts(b)
+        assert b.copy().score == b.score
+    while played:
+        b.unmake(*played.pop())
+        assert (b.seg, b.score, b.fives) == full_counts(b)
+    assert b.score == 0 and b.fives == [0, 0, 0]
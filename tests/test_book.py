@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+from pentago.board import Board, Player
+from pentago.symmetry import canonical_key, transform_board
+from pentago.ai import book
+from pentago.ai.minimax import best_move
+from pentago.ai.mcts import best_move_mcts
+from pentago.ai.policy import best_move as best_move_policy
+
+def test_book_roundtrip_symmetric_probe_and_engines(tmp_path):
+    built = book.build_book(plies=1, depth=1)
+    assert len(built) == 7
+    path = str(tmp_path / "book.bin")
+    built.save(path)
+    try:
+        book.load_book(path)
+        b = Board()
+        b.place(1, 1, Player.BLACK)
+        mv = book.book_move(b, Player.WHITE)
+        assert mv is not None and b.at(mv[0], mv[1]) == 0
+        after = b.copy()
+        after.make(*mv, Player.WHITE)
+        for t in range(8):
+            # la position a des symétries propres : on compare les positions obtenues, pas les coups
+            bt = transform_board(b, t)
+            mt = book.book_move(bt, Player.WHITE)
+            assert mt is not None
+            bt.make(*mt, Player.WHITE)
+            assert canonical_key(bt, Player.BLACK)[0] == canonical_key(after, Player.BLACK)[0]
+        assert best_move(b, Player.WHITE, max_depth=4) == mv
+        assert best_move_mcts(b, Player.WHITE, simulations=10_000) == mv
+        assert best_move_policy(b, Player.WHITE, simulations=10_000) == mv
+        # le mode parallel est vérifié avant le livre
+        with pytest.raises(ValueError):
+            best_move_mcts(b, Player.WHITE, parallel="gpu")
+        b.place(4, 4, Player.WHITE)
+        assert book.book_move(b, Player.BLACK) is None
+
+        from server.main import app
+        client = TestClient(app)
+        gid = client.post("/new").json()["game_id"]
+        data = client.post(f"/bot/{gid}", json={"depth": 2, "engine": "mcts"}).json()
+        assert data["book"] is True and data["state"]["to_move"] == "W"
+    finally:
+        book.load_book(None)
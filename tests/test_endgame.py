@@ -0,0 +1,103 @@
+import random
+from pentago.board import Board, Player, MOVE_TABLE
+from pentago.symmetry import transform_board
+from pentago.threats import has_winning_move
+from pentago.ai import endgame, minimax
+
+def _exact(b, p, ply=0):
+    # négamax sans élagage, même échelle que endgame : victoire au ply t = SOLVED - t
+    o = Player(3 - p)
+    best = -endgame.SOLVED - 1
+    for r, c, q, d in MOVE_TABLE:
+        if b.at(r, c):
+            continue
+        b.make(r, c, q, d, p)
+        if b.fives[p]:
+            v = endgame.SOLVED - (ply + 1)
+        elif b.fives[o]:
+            v = -(endgame.SOLVED - (ply + 1))
+        elif b.full():
+            v = 0
+        else:
+            v = -_exact(b, o, ply + 1)
+        b.unmake(r, c, q, d)
+        best = max(best, v)
+    return best
+
+def _position(empties, rng):
+    while True:
+        b, p = Board(), Player.BLACK
+        for _ in range(36 - empties):
+            r, c, q, d = rng.choice([m for m in MOVE_TABLE if not b.at(m[0], m[1])])
+            b.make(r, c, q, d, p)
+            p = Player(3 - p)
+            if b.fives[1] or b.fives[2]:
+                break
+        else:
+            if not has_winning_move(b, p):
+                return b, p
+
+def test_solve_matches_exhaustive_search():
+    rng = random.Random(3)
+    for _ in range(12):
+        b, p = _position(3, rng)
+        v = _exact(b.copy(), p)
+        result, dist, mv = endgame.solve(b, p)
+        assert result == (v > 0) - (v < 0)
+        assert dist == (endgame.SOLVED - abs(v) if v else 3)
+        # le coup rendu atteint bien ce résultat
+        b.make(*mv, p)
+        if not (b.fives[1] or b.fives[2] or b.full()):
+            assert -_exact(b.copy(), Player(3 - p), 1) == v
+
+def test_forced_results_and_budget():
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.BLACK)
+    result, dist, mv = endgame.solve(b, Player.BLACK)
+    assert (result, dist) == (1, 1)
+    b.make(*mv, Player.BLACK)
+    assert b.fives[Player.BLACK]
+    # deux menaces noires : blanc au trait perd en deux plies
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.BLACK)
+        b.place(5, c, Player.BLACK)
+    for r, c in [(1, 5), (2, 2), (3, 0), (4, 4)]:
+        b.place(r, c, Player.WHITE)
+    assert endgame.solve(b, Player.WHITE)[:2] == (-1, 2)
+    assert endgame.solve(Board(), Player.BLACK, max_nodes=50) is None
+
+def test_cache_is_persistent_and_symmetric(tmp_path):
+    b, p = _position(6, random.Random(5))
+    path = str(tmp_path / "endgame.db")
+    try:
+        endgame.open_cache(path)
+        solved = endgame.solve(b, p)
+        endgame.open_cache(path)
+        assert len(endgame.CACHE) == 1
+        for t in range(8):
+            bt = transform_board(b, t)
+            result, dist, mv = endgame.solve(bt, p)
+            assert endgame.STATS["nodes"] == 0 and (result, dist) == solved[:2]
+            assert not bt.at(mv[0], mv[1])
+    finally:
+        endgame.open_cache(None)
+
+def test_minimax_plays_the_proven_move():
+    b, p = _position(6, random.Random(7))
+    minimax.reset_stats()
+    # sans endgame, pas de résolution exacte
+    minimax.best_move(b, p, max_depth=1)
+    assert minimax.STATS["eg_nodes"] == 0
+    mv = minimax.best_move(b, p, max_depth=2, endgame=endgame.ENDGAME_EMPTIES)
+    assert minimax.STATS["eg_solved"] == 1
+    result, dist, _ = endgame.solve(b, p)
+    b.make(*mv, p)
+    if b.fives[p]:
+        assert (result, dist) == (1, 1)
+    elif not b.full():
+        after = endgame.solve(b, Player(3 - p))
+        assert (-after[0], after[1] + 1) == (result, dist)
+    minimax.best_move(b, Player(3 - p), max_depth=1, endgame=None)
+    assert minimax.STATS["eg_solved"] == 1
@@ -27,4 +27,27 @@ def test_simultaneous_alignments_current_player_wins():
     g.board.place(5, 3, Player.WHITE)
     g.play(4, 0, Quadrant.Q11, Direction.CCW)
     assert g.terminal()
-    assert g.winner() == Player.BLACK
\ No newline at end of file
+    assert g.winner() == Player.BLACK
+
+def test_undo_restores_position_and_turn():
+    g = Game()
+    g.play(2, 2, Quadrant.Q00, Direction.CW)
+    ref = g.board.grid
+    g.play(3, 4, Quadrant.Q11, Direction.CCW)
+    g.undo()
+    assert g.board.grid == ref
+    assert g.current_player() == Player.WHITE
+    g.undo()
+    assert g.board.grid == Game().board.grid
+    assert g.current_player() == Player.BLACK
+
+
+def test_undo_clears_winner():
+    g = Game()
+    for c in range(4):
+        g.board.place(1, c, Player.BLACK)
+    g.play(1, 4, Quadrant.Q10, Direction.CW)
+    assert g.winner() == Player.BLACK
+    g.undo()
+    assert not g.terminal()
+    assert g.board.at(1, 4) == 0
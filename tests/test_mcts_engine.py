@@ -30,4 +30,142 @@ def test_mcts_two_moves_progresses():
         r2, c2, q2, d2 = best_move_mcts(g.board, player_to_move=g.current_player(), simulations=25)
         assert g.board.grid[r2][c2] == 0
         g.play(r2, c2, q2, d2)
-        assert stones(g) == s1 + 1
\ No newline at end of file
+        assert stones(g) == s1 + 1
+def test_parallel_modes_keep_budget_and_progress_contract():
+    from pentago.ai import mcts
+    g = Game()
+    g.play(2, 2, *g.legal_moves()[0][2:])
+    try:
+        for mode in ("tree", "root"):
+            mcts.mcts_reset()
+            seen = []
+            r, c, q, d = best_move_mcts(g.board, player_to_move=g.current_player(), simulations=8,
+                                        progress_cb=seen.append, parallel=mode, workers=2)
+            assert g.board.grid[r][c] == 0
+            assert seen[-1] == 8
+    finally:
+        mcts.mcts_pool_shutdown()
+
+def test_concurrent_root_parallel_searches_share_the_pool_safely():
+    import threading
+    from pentago.ai import mcts
+    g = Game()
+    out, errors = [], []
+
+    def run(workers):
+        try:
+            out.append(best_move_mcts(g.board, player_to_move=g.current_player(), simulations=40,
+                                      parallel="root", workers=workers, book=False))
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        # nombres de workers différents : sans verrou, le pool serait reconstruit sous l'autre recherche
+        threads = [threading.Thread(target=run, args=(w,)) for w in (2, 3, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors and len(out) == 3
+        assert all(g.board.grid[r][c] == 0 for r, c, _, _ in out)
+    finally:
+        mcts.mcts_pool_shutdown()
+
+def test_virtual_loss_is_undone_after_backprop():
+    from pentago.ai import mcts
+    random.seed(3)
+    mcts.mcts_reset()
+    g = Game()
+    best_move_mcts(g.board, player_to_move=g.current_player(), simulations=6)
+    pool = mcts.POOL
+    size, edges = pool.size, pool.edge_size
+    before = (pool.edge_N[:edges].copy(), pool.edge_W[:edges].copy(), pool.W[:size].copy())
+    root = pool.index[g.board.hash_key(g.current_player())]
+    pool.exhausted[root] = True
+    path, vpath, *_ = mcts._select_expand(g.board, g.current_player(), g.board.hash_key(g.current_player()),
+                                          0, 1.414, False, 1.0)
+    assert vpath and all(pool.edge_N[e] > 0 for e in vpath)
+    mcts._backprop(path, vpath, 0.0, 1.0)
+    for _, edge, *_ in path:
+        pool.edge_N[edge] -= 1
+    assert (pool.edge_N[:edges] == before[0]).all() and (pool.edge_W[:edges] == before[1]).all()
+    assert (pool.W[:size] == before[2]).all()
+
+def test_fast_rollout_takes_immediate_win_and_stays_in_range():
+    from pentago.board import Board
+    from pentago.ai.mcts import fast_rollout
+    random.seed(4)
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.BLACK)
+    b.place(5, 5, Player.WHITE)
+    assert all(fast_rollout(b, Player.BLACK) == 1 for _ in range(20))
+    g = Game()
+    assert {fast_rollout(g.board, Player.BLACK) for _ in range(30)} <= {-1, 0, 1}
+
+def test_mcts_with_batched_playouts_returns_legal_move():
+    random.seed(5)
+    g = Game()
+    seen = []
+    r, c, q, d = best_move_mcts(g.board, player_to_move=g.current_player(), simulations=10, playouts=16,
+                                progress_cb=seen.append)
+    assert g.board.grid[r][c] == 0
+    assert seen[-1] == 10
+
+def test_tree_budget_bounds_pool_and_rebase_is_incremental():
+    from pentago.ai import mcts
+    random.seed(5)
+    mcts.mcts_reset()
+    g = Game()
+    mcts.mcts_rebase(g.board, g.current_player())
+    best_move_mcts(g.board, player_to_move=g.current_player(), simulations=300, tree_mb=0.05)
+    # la mémoire allouée (pas seulement les lignes vivantes) tient dans le budget, à une simulation
+    # près (un bloc d'arêtes et un nœud)
+    assert mcts.POOL.nbytes <= 0.05 * 1024 * 1024 + 288 * 26 + 64
+    assert mcts.tree_stats()["bytes"] == mcts.POOL.nbytes
+    r, c, q, d = best_move_mcts(g.board, player_to_move=g.current_player(), simulations=50, tree_mb=None)
+    before = len(mcts.POOL)
+    root = mcts.POOL.index[g.board.hash_key(g.current_player())]
+    kept = mcts.POOL.child(root, mcts.encode_move(r, c, q, d))
+    g.play(r, c, q, d)
+    mcts.mcts_rebase(g.board, g.current_player())
+    assert mcts.POOL.index[g.board.hash_key(g.current_player())] == kept
+    assert 0 < len(mcts.POOL) < before
+    assert all(mcts.POOL.refs[i] > 0 for i in mcts.POOL.index.values())
+
+def test_transposed_child_shares_stats_and_rave_runs():
+    from pentago.ai import mcts
+    random.seed(6)
+    mcts.mcts_reset()
+    g = Game()
+    best_move_mcts(g.board, player_to_move=g.current_player(), simulations=400, rave=True)
+    pool = mcts.POOL
+    root = pool.index[g.board.hash_key(g.current_player())]
+    first, count = pool.block(root)
+    # chaque simulation passe par une arête de la racine ; les fils comptent leurs visites depuis tous leurs parents
+    assert pool.edge_N[first:first + count].sum() == pool.N[root] == 400
+    assert pool.edge_AN[first:first + count].sum() >= 400
+    kids = pool.edge_child[first:first + count]
+    assert (pool.N[kids] >= pool.edge_N[first:first + count]).all()
+
+def test_move_that_loses_at_once_gets_negative_root_q():
+    from pentago.board import Board
+    from pentago.threats import safe_moves
+    from pentago.ai import mcts
+    random.seed(8)
+    mcts.mcts_reset()
+    b = Board()
+    for c in range(4):
+        b.place(5, c, Player.WHITE)
+    for r, c in [(0, 0), (1, 2), (2, 4), (0, 5)]:
+        b.place(r, c, Player.BLACK)
+    best_move_mcts(b, player_to_move=Player.BLACK, simulations=400)
+    safe = set(safe_moves(b, Player.BLACK, [mv for mv in mcts.MOVE_TABLE if not b.at(mv[0], mv[1])]))
+    pool = mcts.POOL
+    first, count = pool.block(pool.index[b.hash_key(Player.BLACK)])
+    losing = [e for e in range(first, first + count) if mcts.MOVE_TABLE[int(pool.edge_move[e])] not in safe]
+    assert len(losing) == count - len(safe) and all(pool.edge_N[e] > 0 for e in losing)
+    # le rollout du fils est noté pour blanc, qui gagne tout de suite : -1 du point de vue de noir
+    assert all(pool.edge_W[e] == -1 for e in losing if pool.edge_N[e] == 1)
+    q = sum(pool.edge_W[e] for e in losing) / sum(pool.edge_N[e] for e in losing)
+    assert q < -0.5
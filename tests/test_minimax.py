@@ -2,6 +2,7 @@ from pentago.board import Board, Player, Quadrant, Direction
 from pentago.game import Game
 from pentago.ai.minimax import best_move
 
+
 def test_minimax_takes_immediate_win():
     b = Board()
     b.place(0, 0, Player.BLACK)
@@ -17,6 +18,7 @@ def test_minimax_takes_immediate_win():
     g.play(r, c, q, d)
     assert g.winner() == Player.BLACK
 
+
 def test_minimax_blocks_opponent_threat_depth2():
     b = Board()
     b.place(0, 0, Player.WHITE)
@@ -25,4 +27,116 @@ def test_minimax_blocks_opponent_threat_depth2():
     b.place(0, 3, Player.WHITE)
     mv = best_move(b, Player.BLACK, max_depth=2)
     r, c, q, d = mv
-    assert r == 0 and c == 4
\ No newline at end of file
+    assert r == 0 and c == 4
+
+
+def test_search_leaves_caller_board_untouched():
+    b = Board()
+    b.place(2, 2, Player.BLACK)
+    b.place(3, 3, Player.WHITE)
+    ref = b.grid
+    best_move(b, Player.BLACK, max_depth=2)
+    assert b.grid == ref
+
+
+def test_pvs_returns_same_value_as_plain_alpha_beta():
+    import math
+    import random
+    from pentago.ai import minimax
+    rng = random.Random(5)
+    g = Game()
+    for _ in range(6):
+        g.play(*rng.choice(g.legal_moves()))
+    vals = []
+    for pvs in (False, True):
+        minimax.reset_stats()
+        vals.append(minimax.search(g.board.copy(), g.current_player(), g.current_player(), 2,
+                                   -math.inf, math.inf, None, progress_cb=None, start_ts=0.0,
+                                   nodes0=0, last_report=[0], report_every_nodes=2000, pvs=pvs))
+    assert vals[0] == vals[1]
+    minimax.reset_stats()
+    r, c, q, d = best_move(g.board, g.current_player(), max_depth=2, pvs=True, aspiration=10)
+    assert g.board.at(r, c) == 0
+
+
+def test_killers_and_history_recorded_on_cutoffs():
+    from pentago.ai import minimax
+    minimax.reset_stats()
+    b = Board()
+    b.place(2, 2, Player.BLACK)
+    b.place(3, 3, Player.WHITE)
+    best_move(b, Player.BLACK, max_depth=2)
+    s = minimax.stats_snapshot()
+    assert s["cuts"] > 0
+    assert s["cut_first"] <= s["cuts"]
+    assert any(k[0] is not None for k in minimax.KILLERS)
+    assert sum(minimax.HISTORY) > 0
+    ply = next(i for i, k in enumerate(minimax.KILLERS) if k[0] is not None)
+    killer = minimax.KILLERS[ply][0]
+    b2 = Board()
+    ordered = minimax.order_moves(b2, Player.BLACK, minimax.generate_moves(b2), None, ply)
+    assert ordered[0] == killer
+
+
+def test_lazy_smp_workers_find_the_block():
+    from pentago.ai import minimax
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.WHITE)
+    b.place(3, 3, Player.BLACK)
+    try:
+        r, c, q, d = best_move(b, Player.BLACK, max_depth=2, workers=2)
+        assert (r, c) == (0, 4)
+        r, c, q, d = best_move(Board(), Player.BLACK, max_depth=2, time_ms=2000, workers=2)
+        assert 0 <= r < 6 and 0 <= c < 6
+        assert minimax.stats_snapshot()["nodes"] > 0
+    finally:
+        minimax.smp_shutdown()
+
+
+def test_concurrent_smp_searches_do_not_tear_down_the_pool():
+    import threading
+    from pentago.ai import minimax
+    b = Board()
+    b.place(2, 2, Player.BLACK)
+    b.place(3, 3, Player.WHITE)
+    out, errors = [], []
+
+    def run(workers):
+        try:
+            out.append(best_move(b, Player.BLACK, max_depth=2, workers=workers))
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        # nombres de workers différents : le pool serait reconstruit pendant la recherche de l'autre
+        threads = [threading.Thread(target=run, args=(w,)) for w in (2, 3, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors and len(out) == 3
+        assert all(not b.at(r, c) for r, c, _, _ in out)
+    finally:
+        minimax.smp_shutdown()
+
+
+def test_failing_smp_worker_stops_the_search_and_frees_the_pool():
+    import pytest
+    from pentago.ai import minimax
+    b = Board()
+    b.place(2, 2, Player.BLACK)
+    ctx = dict(progress_cb=None, start_ts=0.0, symmetry=False, pvs=True, threats=True, batch_eval=False)
+    try:
+        # case hors plateau : le décodage du coup échoue dans chaque worker
+        with pytest.raises(IndexError):
+            minimax._best_move_smp(b, Player.WHITE, [(6, 0, Quadrant.Q00, Direction.CW)], 2, None, None, ctx, 2)
+        assert minimax._SMP["stop"].buf[0] == 0
+        r, c, _, _ = best_move(b, Player.WHITE, max_depth=3, workers=2)
+        assert not b.at(r, c)
+        # remplissage lu sur la TT partagée elle-même, pas la somme des écritures des workers
+        tt = minimax._SMP["tt"]
+        assert 0 < tt.used <= tt.slots
+        assert minimax.stats_snapshot()["tt_fill"] == int(tt.used / tt.slots * 1000)
+    finally:
+        minimax.smp_shutdown()
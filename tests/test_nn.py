@@ -0,0 +1,31 @@
+import numpy as np
+from pentago.board import Board, Player
+from pentago.ai import policy
+from pentago.ai.nn import PolicyValueNet
+
+def test_forward_shapes_masking_and_chunking():
+    net = PolicyValueNet.random(hidden=32, blocks=1, max_batch=8)
+    cells = np.random.default_rng(1).integers(0, 3, size=(20, 36)).astype(np.int8)
+    priors, values = net(cells)
+    assert priors.shape == (20, 288) and values.shape == (20,)
+    assert np.allclose(priors.sum(axis=1), 1.0, atol=1e-5)
+    assert (priors[np.repeat(cells != 0, 8, axis=1)] < 1e-6).all()
+    assert (np.abs(values) <= 1.0).all()
+    p8, v8 = net(cells[:8])
+    assert np.allclose(p8, priors[:8]) and np.allclose(v8, values[:8])
+
+def test_mmap_roundtrip_and_policy_plug_in(tmp_path):
+    net = PolicyValueNet.random(hidden=32, blocks=2, seed=3)
+    net.weights["res0.w2"] += 0.01
+    path = str(tmp_path / "net.npz")
+    net.save(path)
+    loaded = PolicyValueNet.load(path)
+    assert isinstance(loaded.weights["in.w"], np.memmap)
+    cells = np.zeros((2, 36), dtype=np.int8)
+    cells[1, :5] = [1, 2, 1, 2, 1]
+    a, b = net(cells)[0].copy(), loaded(cells)[0]
+    assert np.allclose(a, b)
+    policy.TREE.clear()
+    board = Board()
+    r, c, _, _ = policy.best_move(board, Player.BLACK, simulations=40, evaluator=loaded)
+    assert board.at(r, c) == 0
@@ -0,0 +1,64 @@
+from pentago.ai.nodepool import NodePool
+
+def test_pool_grows_and_keeps_children_blocks():
+    pool = NodePool(capacity=2, edge_capacity=4)
+    root = pool.add(100, start=0)
+    kids = [pool.add(200 + k, start=k) for k in range(10)]
+    for k, c in enumerate(kids):
+        pool.add_edge(root, k * 8, c, block=16)
+        pool.N[c] = k
+    pool.add_edge(kids[0], 5, kids[1], block=3)
+    moves, children = pool.children(root)
+    assert moves.tolist() == [k * 8 for k in range(10)]
+    assert children.tolist() == kids
+    assert pool.child(root, 24) == kids[3] and pool.child(root, 7) is None
+    assert len(pool) == 11 and 205 in pool
+    assert pool.N[kids[9]] == 9
+
+def test_compact_keeps_reachable_rows_only():
+    pool = NodePool()
+    a = pool.add(1, 0)
+    b = pool.add(2, 0)
+    c = pool.add(3, 0)
+    d = pool.add(4, 0)
+    pool.add_edge(a, 10, b, block=4)
+    pool.add_edge(b, 11, c, block=4)
+    pool.add_edge(a, 12, d, block=4)
+    pool.W[c] = 2.5
+    pool.compact(b)
+    assert sorted(pool.index) == [2, 3]
+    nb, nc = pool.index[2], pool.index[3]
+    assert pool.children(nb)[1].tolist() == [nc]
+    assert pool.W[nc] == 2.5
+    pool.add_edge(nb, 13, pool.add(5, 0), block=4)
+    assert pool.children(nb)[0].tolist() == [11, 13]
+
+def test_release_frees_only_what_the_old_root_alone_kept():
+    pool = NodePool()
+    root = pool.add(1, 0)
+    pool.pin(root)
+    a, b, shared = pool.add(2, 0), pool.add(3, 0), pool.add(4, 0)
+    pool.add_edge(root, 0, a, block=4)
+    pool.add_edge(root, 8, b, block=4)
+    pool.add_edge(a, 16, shared, block=4)
+    pool.add_edge(b, 24, shared, block=4)
+    pool.pin(a)
+    assert pool.unpin(root) == 2
+    assert sorted(pool.index) == [2, 4]
+    assert pool.refs[shared] == 1
+    assert pool.add(5, 0) in (root, b)
+
+def test_evict_drops_least_visited_leaves_and_reopens_parent():
+    pool = NodePool()
+    root = pool.add(1, 0)
+    pool.pin(root)
+    kids = [pool.add(10 + k, 0) for k in range(4)]
+    for k, c in enumerate(kids):
+        pool.add_edge(root, k, c, block=8)
+        pool.N[c] = 10 - k
+    pool.cursor[root] = 200
+    pool.exhausted[root] = True
+    assert pool.evict(2, protect=root) == 2
+    assert sorted(pool.children(root)[0].tolist()) == [0, 1]
+    assert pool.rescan[root] and not pool.exhausted[root] and pool.cursor[root] == 0
+    assert pool.evict(5, protect=root) == 2 and pool.edge_live == 0
@@ -0,0 +1,44 @@
+import random
+import numpy as np
+from pentago.board import Board, Player, Quadrant, Direction
+from pentago.ai.batch import board_cells, evaluate_batch
+from pentago.ai.playout import playouts
+
+def _one_empty_board(seed: int) -> Board:
+    rng = random.Random(seed)
+    while True:
+        cells = list(range(36))
+        rng.shuffle(cells)
+        b = Board()
+        for n, i in enumerate(cells[:35]):
+            b.place(i // 6, i % 6, Player.BLACK if n % 2 == 0 else Player.WHITE)
+        if not b.check_five(Player.BLACK) and not b.check_five(Player.WHITE):
+            return b
+
+def test_last_cell_outcomes_match_board_rules():
+    b = _one_empty_board(1)
+    r, c = b.legal_placements()[0]
+    expected = set()
+    for q in Quadrant:
+        for d in (Direction.CW, Direction.CCW):
+            b2 = b.copy()
+            b2.make(r, c, q, d, Player.WHITE)
+            if b2.check_five(Player.WHITE):
+                expected.add(1)
+            elif b2.check_five(Player.BLACK):
+                expected.add(-1)
+            else:
+                expected.add(0)
+    out = playouts(board_cells(b), Player.WHITE, 400, rng=np.random.default_rng(0), weighted=False)
+    assert out.shape == (400,)
+    assert set(out.tolist()) == expected
+
+def test_batch_input_and_step_cutoff():
+    rng = np.random.default_rng(2)
+    cells = np.zeros((5, 36), dtype=np.int8)
+    cells[:, 14] = 1
+    out = playouts(cells, Player.WHITE, rng=rng)
+    assert out.shape == (5,) and set(out.tolist()) <= {-1, 0, 1}
+    assert (cells[:, 14] == 1).all()
+    out = playouts(cells, Player.BLACK, max_steps=0, rng=rng)
+    assert out.tolist() == np.sign(evaluate_batch(cells, Player.BLACK)).tolist()
@@ -0,0 +1,34 @@
+import numpy as np
+from pentago.board import Board, Player
+from pentago.ai import policy
+from pentago.ai.policy import best_move, center_evaluator
+
+def test_leaves_are_evaluated_in_batches():
+    policy.TREE.clear()
+    shapes = []
+
+    def evaluator(cells):
+        shapes.append(cells.shape)
+        assert set(np.unique(cells)) <= {0, 1, 2}
+        return center_evaluator(cells)
+
+    seen = []
+    r, c, _, _ = best_move(Board(), Player.BLACK, simulations=64, evaluator=evaluator, batch_size=8,
+                           progress_cb=seen.append)
+    assert seen[-1] == 64
+    assert all(s[1] == 36 and 1 <= s[0] <= 8 for s in shapes)
+    assert max(s[0] for s in shapes) > 1
+    assert sum(s[0] for s in shapes) <= 65
+    assert all(w == 0.0 for n in policy.TREE.values() for w in n.Wsa.values())
+
+def test_value_is_backed_up_for_the_side_that_moved():
+    policy.TREE.clear()
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.BLACK)
+    b.place(5, 5, Player.WHITE)
+    b.place(4, 5, Player.WHITE)
+    r, c, q, d = best_move(b, Player.BLACK, simulations=400)
+    won = b.copy()
+    won.make(r, c, q, d, Player.BLACK)
+    assert won.check_five(Player.BLACK)
@@ -0,0 +1,86 @@
+from pentago.board import Board, Player
+from pentago.symmetry import transform_board
+from pentago.ai import minimax, poscache
+
+def _opening():
+    b = Board()
+    b.place(1, 1, Player.BLACK)
+    b.place(4, 4, Player.WHITE)
+    b.place(1, 4, Player.BLACK)
+    return b
+
+def test_minimax_results_persist_across_reopen(tmp_path):
+    path = str(tmp_path / "positions.db")
+    b = _opening()
+    try:
+        poscache.open_cache(path)
+        minimax.reset_stats()
+        mv = minimax.best_move(b, Player.WHITE, max_depth=2, book=False)
+        assert minimax.STATS["pc_store"] == 1
+        depth, _, flag, cached = poscache.CACHE.get(b, Player.WHITE)
+        assert (depth, flag, cached) == (2, 0, mv)
+
+        # un autre processus (ou un redémarrage) rouvre le même fichier
+        poscache.open_cache(path)
+        minimax.reset_stats()
+        assert minimax.best_move(b, Player.WHITE, max_depth=2, book=False) == mv
+        assert minimax.best_move(b, Player.WHITE, max_depth=1, book=False) == mv
+        assert minimax.STATS["pc_hit"] == 2 and minimax.STATS["nodes"] == 0
+        for t in range(8):
+            bt = transform_board(b, t)
+            mt = minimax.best_move(bt, Player.WHITE, max_depth=2, book=False)
+            assert not bt.at(mt[0], mt[1])
+        assert minimax.STATS["pc_hit"] == 10
+        # le cache passe avant le solveur de finales
+        minimax.best_move(b, Player.WHITE, max_depth=2, book=False, endgame=36)
+        assert minimax.STATS["pc_hit"] == 11 and minimax.STATS["eg_nodes"] == 0
+
+        # plus profond que le cache : nouvelle recherche, résultat remplacé ; jamais l'inverse
+        minimax.best_move(b, Player.WHITE, max_depth=3, book=False)
+        assert poscache.CACHE.get(b, Player.WHITE)[0] == 3
+        poscache.CACHE.put(b, Player.WHITE, 1, 0, 0, None)
+        assert poscache.CACHE.get(b, Player.WHITE)[0] == 3
+    finally:
+        poscache.open_cache(None)
+
+def test_eviction_keeps_recently_used_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(poscache, "CHECK_EVERY", 1)
+    cache = poscache.PositionCache(str(tmp_path / "positions.db"), max_entries=20)
+    boards = []
+    for i in range(30):
+        # nombres de pierres différents : aucune position n'est symétrique d'une autre
+        b = boards[-1].copy() if boards else Board()
+        b.place(i // 6, i % 6, Player.BLACK if i % 2 else Player.WHITE)
+        boards.append(b)
+        cache.put(b, Player.BLACK, 1, i, 0, None)
+        if i >= 1:
+            # la première position est relue à chaque tour : elle reste la plus récente
+            assert cache.get(boards[0], Player.BLACK) is not None
+    assert len(cache) <= 20
+    assert cache.get(boards[1], Player.BLACK) is None
+    assert cache.get(boards[-1], Player.BLACK) is not None
+    cache.close()
+
+
+def test_search_stopped_in_last_root_move_is_not_complete():
+    b = _opening()
+    mv = minimax.generate_moves(b)[0]
+    calls = []
+
+    def stop(_elapsed_ms):
+        # appelé depuis search(), donc pendant le sous-arbre du seul (et dernier) coup de la racine
+        calls.append(1)
+        minimax._STOP[0] = 1
+
+    ctx = dict(progress_cb=stop, start_ts=0.0, nodes0=minimax.STATS["nodes"], last_report=[0],
+               report_every_nodes=1, symmetry=False, pvs=True, threats=True, batch_eval=False)
+    try:
+        _, best, complete = minimax._search_root(b, Player.WHITE, [mv], 3, -float("inf"), float("inf"),
+                                                   None, **ctx)
+        assert calls and best == mv and not complete
+        minimax._STOP[0] = 0
+        ctx["last_report"] = [0]
+        _, _, done = minimax._iterate(b, Player.WHITE, [mv], None, 3, 3, None, None, ctx)
+        assert done == 0
+    finally:
+        minimax._STOP[0] = 0
@@ -0,0 +1,47 @@
+import numpy as np
+from pentago.board import Board, Player, MOVE_TABLE, encode_move
+from pentago.symmetry import transform_move, transform_board
+from pentago.ai.batch import mover_cells
+from pentago.ai.replay import ReplayBuffer, augment
+from pentago.ai.selfplay import RECORD_DTYPE, ShardWriter, pack_cells
+
+def test_augment_matches_board_and_move_symmetries():
+    b = Board()
+    b.place(0, 1, Player.BLACK)
+    b.place(2, 4, Player.WHITE)
+    b.place(5, 0, Player.BLACK)
+    mv = (1, 2, MOVE_TABLE[13][2], MOVE_TABLE[13][3])
+    policy = np.zeros((8, 288), dtype=np.float32)
+    policy[:, encode_move(*mv)] = 1.0
+    cells = np.repeat(mover_cells(b, Player.BLACK)[None, :], 8, axis=0)
+    out_cells, out_policy = augment(cells, policy, np.arange(8))
+    for t in range(8):
+        assert (out_cells[t] == mover_cells(transform_board(b, t), Player.BLACK)).all()
+        assert out_policy[t].argmax() == encode_move(*transform_move(mv, t))
+
+def _records(n, tag):
+    rec = np.zeros(n, dtype=RECORD_DTYPE)
+    rec["cells"] = pack_cells(np.zeros((n, 36), dtype=np.int8))
+    rec["visits"][:, 0] = 3
+    rec["visits"][:, 9] = 1
+    rec["ply"] = tag
+    rec["outcome"] = 1
+    return rec
+
+def test_window_keeps_newest_records_and_sees_appends(tmp_path):
+    w = ShardWriter(str(tmp_path), shard_records=10)
+    w.write(_records(10, 1))
+    w.write(_records(10, 2))
+    w.write(_records(4, 3))
+    buf = ReplayBuffer(str(tmp_path), window=12)
+    assert len(buf) == 12
+    assert set(buf.records(np.arange(12))["ply"].tolist()) == {2, 3}
+    w.write(_records(3, 4))
+    w.close()
+    assert buf.refresh() == 12
+    assert buf.records(np.array([11]))["ply"][0] == 4
+    cells, policy, value = buf.sample(64, np.random.default_rng(0), augment_symmetry=False)
+    assert cells.shape == (64, 36) and value.tolist() == [1.0] * 64
+    assert np.allclose(policy[:, 0], 0.75) and np.allclose(policy[:, 9], 0.25)
+    _, policy, _ = buf.sample(64, np.random.default_rng(0))
+    assert np.allclose(policy.sum(axis=1), 1.0)
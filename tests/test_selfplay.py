@@ -0,0 +1,28 @@
+import numpy as np
+from pentago.ai.selfplay import (RECORD_DTYPE, ShardWriter, list_shards, pack_cells, play_game, read_shard,
+                                 unpack_cells)
+
+def test_cells_pack_to_two_bits():
+    cells = np.random.default_rng(0).integers(0, 3, size=(5, 36)).astype(np.int8)
+    packed = pack_cells(cells)
+    assert packed.shape == (5, 9) and packed.dtype == np.uint8
+    assert (unpack_cells(packed) == cells).all()
+
+def test_game_records_and_sharded_writer(tmp_path):
+    records = play_game("policy", simulations=30, temperature_plies=4, rng=np.random.default_rng(1))
+    assert records.dtype == RECORD_DTYPE and len(records) >= 5
+    assert (records["visits"].sum(axis=1) == 30).all()
+    assert (records["ply"] == np.arange(len(records))).all()
+    # le résultat alterne de signe d'un ply à l'autre (ou vaut 0 partout)
+    assert (records["outcome"][1:] == -records["outcome"][:-1]).all()
+    first = unpack_cells(records["cells"][:1])[0]
+    assert not first.any()
+
+    w = ShardWriter(str(tmp_path), writer_id=3, shard_records=4)
+    w.write(records)
+    w.write(records[:2])
+    w.close()
+    shards = list_shards(str(tmp_path))
+    assert len(shards) == (len(records) + 2 + 3) // 4
+    back = np.concatenate([read_shard(p) for p in shards])
+    assert (back == np.concatenate([records, records[:2]])).all()
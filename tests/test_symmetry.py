@@ -0,0 +1,59 @@
+import random
+from pentago.board import Board, Player, Quadrant, Direction
+from pentago.symmetry import transform_board, transform_move, canonical_key, from_canonical, to_canonical
+from pentago.ai.minimax import best_move, reset_stats
+from pentago.ai.mcts import best_move_mcts, mcts_reset
+from pentago.ai.policy import best_move as best_move_policy
+
+
+def random_board(seed: int, stones: int) -> Board:
+    rng = random.Random(seed)
+    b = Board()
+    for k in range(stones):
+        r, c = rng.choice(b.legal_placements())
+        b.place(r, c, Player.BLACK if k % 2 == 0 else Player.WHITE)
+    return b
+
+
+def test_transforms_commute_with_moves():
+    rng = random.Random(0)
+    b = random_board(1, 9)
+    for t in range(8):
+        for _ in range(20):
+            r, c = rng.choice(b.legal_placements())
+            mv = (r, c, rng.choice(list(Quadrant)), rng.choice(list(Direction)))
+            after = b.copy()
+            after.make(*mv, Player.BLACK)
+            tb = transform_board(b, t)
+            tb.make(*transform_move(mv, t), Player.BLACK)
+            assert tb.grid == transform_board(after, t).grid
+            assert from_canonical(to_canonical(mv, t), t) == mv
+
+
+def test_canonical_key_is_symmetry_invariant():
+    b = random_board(2, 11)
+    keys = {canonical_key(transform_board(b, t), Player.WHITE)[0] for t in range(8)}
+    assert len(keys) == 1
+    key, t = canonical_key(b, Player.BLACK)
+    assert transform_board(b, t).key == key
+    assert canonical_key(Board(), Player.BLACK) == (Board().hash_key(Player.BLACK), 0)
+
+
+def test_engines_play_legal_moves_with_symmetry():
+    reset_stats()
+    b = Board()
+    for c in range(4):
+        b.place(5, c, Player.BLACK)
+    b.place(0, 0, Player.WHITE)
+    b.place(2, 4, Player.WHITE)
+    r, c, q, d = best_move(b, Player.BLACK, max_depth=2, symmetry=True)
+    win = b.copy()
+    win.make(r, c, q, d, Player.BLACK)
+    assert win.check_five(Player.BLACK)
+
+    random.seed(0)
+    mcts_reset()
+    r, c, _, _ = best_move_mcts(b, Player.WHITE, simulations=20, symmetry=True)
+    assert b.at(r, c) == 0
+    r, c, _, _ = best_move_policy(b, Player.WHITE, simulations=50, symmetry=True)
+    assert b.at(r, c) == 0
@@ -0,0 +1,66 @@
+import random
+from pentago.board import Board, Player, encode_move
+from pentago.game import Game
+from pentago.threats import winning_codes, winning_moves, has_winning_move, safe_moves
+from pentago.ai import minimax
+
+
+def brute_force_wins(board: Board, player: Player):
+    out = []
+    g = Game()
+    g.board = board
+    for mv in g.legal_moves():
+        b = board.copy()
+        b.make(*mv, player)
+        if b.check_five(player):
+            out.append(encode_move(*mv))
+    return out
+
+
+def test_winning_codes_match_brute_force():
+    rng = random.Random(11)
+    for _ in range(15):
+        g = Game()
+        while not g.terminal():
+            for p in (Player.BLACK, Player.WHITE):
+                expected = brute_force_wins(g.board, p)
+                assert winning_codes(g.board, p) == expected
+                assert has_winning_move(g.board, p) == bool(expected)
+            g.play(*rng.choice(g.legal_moves()))
+
+
+def test_safe_moves_block_every_threat():
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.WHITE)
+    b.place(4, 4, Player.BLACK)
+    assert winning_moves(b, Player.WHITE)
+    g = Game()
+    g.board = b
+    safe = safe_moves(b, Player.BLACK, g.legal_moves())
+    assert safe
+    for mv in safe:
+        b2 = b.copy()
+        b2.make(*mv, Player.BLACK)
+        assert not has_winning_move(b2, Player.WHITE)
+
+
+def test_minimax_resolves_threats_without_search():
+    minimax.reset_stats()
+    b = Board()
+    for c in range(4):
+        b.place(2, c, Player.BLACK)
+    mv = minimax.best_move(b, Player.BLACK, max_depth=3)
+    assert minimax.STATS["nodes"] == 0
+    b.make(*mv, Player.BLACK)
+    assert b.check_five(Player.BLACK)
+
+
+def test_minimax_blocks_at_depth_one():
+    b = Board()
+    for c in range(4):
+        b.place(0, c, Player.WHITE)
+    b.place(4, 4, Player.BLACK)
+    r, c, q, d = minimax.best_move(b, Player.BLACK, max_depth=1)
+    b.make(r, c, q, d, Player.BLACK)
+    assert not has_winning_move(b, Player.WHITE)
@@ -0,0 +1,65 @@
+from pentago.board import Board, Player, Quadrant, Direction
+from pentago.ai.tt import TranspositionTable
+from pentago.ai import minimax
+
+
+def test_store_and_probe_roundtrip():
+    tt = TranspositionTable(1)
+    mv = (2, 3, Quadrant.Q10, Direction.CCW)
+    tt.store(12345, 3, -420, 1, mv)
+    assert tt.probe(12345) == (3, -420, 1, mv)
+    assert tt.probe(54321) is None
+    tt.store(0, 1, 7, 0, None)
+    assert tt.probe(0) == (1, 7, 0, None)
+
+
+def test_size_is_bounded_and_depth_preferred():
+    tt = TranspositionTable(0.01)
+    assert tt.nbytes <= 0.01 * (1 << 20)
+    b = tt.buckets
+    tt.store(1, 5, 10, 0, None)
+    tt.store(1 + b, 1, 20, 0, None)
+    tt.store(1 + 2 * b, 1, 30, 0, None)
+    assert tt.probe(1) == (5, 10, 0, None)
+    assert tt.probe(1 + b) is None
+    assert tt.probe(1 + 2 * b) == (1, 30, 0, None)
+    assert tt.collisions == 1
+    for k in range(10 * tt.slots):
+        tt.store(k * 7919, 2, k, 0, None)
+    assert tt.used <= tt.slots
+    assert tt.fill() <= 1.0
+
+
+def test_new_search_lets_shallow_entries_replace_stale_ones():
+    tt = TranspositionTable(0.01)
+    b = tt.buckets
+    tt.store(3, 6, 1, 0, None)
+    tt.new_search()
+    tt.store(3 + b, 1, 2, 0, None)
+    assert tt.probe(3) is None
+    assert tt.probe(3 + b) == (1, 2, 0, None)
+
+
+def test_minimax_reports_tt_usage():
+    minimax.reset_stats()
+    b = Board()
+    b.place(2, 2, Player.BLACK)
+    minimax.best_move(b, Player.WHITE, max_depth=2)
+    s = minimax.stats_snapshot()
+    assert s["tt_fill"] >= 0 and "tt_collisions" in s
+    assert minimax.TT.used > 0
+
+
+def test_table_is_allocated_on_first_search_and_cleared_in_place():
+    minimax.set_tt_size(1)
+    assert minimax.TT is None and minimax.stats_snapshot()["tt_fill"] == 0
+    try:
+        b = Board()
+        b.place(2, 2, Player.BLACK)
+        minimax.best_move(b, Player.WHITE, max_depth=2)
+        tt = minimax.TT
+        assert tt is not None and tt.used > 0
+        minimax.reset_stats()
+        assert minimax.TT is tt and tt.used == 0 and all(m == 0 for m in tt._meta)
+    finally:
+        minimax.set_tt_size(minimax.TT_DEFAULT_MB)
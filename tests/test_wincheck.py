@@ -1,4 +1,6 @@
+import random
 from pentago.board import Board, Player
+from pentago.game import Game
 
 def test_check_five_horizontal_black():
     b = Board()
@@ -24,4 +26,28 @@ def test_no_false_positive_on_four():
     b = Board()
     for c in range(4):
         b.place(5, c, Player.BLACK)
-    assert not b.check_five(Player.BLACK)
\ No newline at end of file
+    assert not b.check_five(Player.BLACK)
+
+
+def _recount(b):
+    # segments recomptés depuis les cases : (noirs + 6 * blancs) par segment, segments complets par joueur
+    seg = [sum(1 if b.at(r, c) == Player.BLACK else 6 if b.at(r, c) == Player.WHITE else 0 for r, c in cells)
+           for cells in Board.SEGMENTS]
+    return seg, [0, seg.count(5), seg.count(30)]
+
+def test_incremental_check_matches_full_check():
+    rng = random.Random(3)
+    for _ in range(20):
+        g = Game()
+        while not g.terminal():
+            r, c, q, d = rng.choice(g.legal_moves())
+            p = g.current_player()
+            b = g.board.copy()
+            b.make(r, c, q, d, p)
+            seg, fives = _recount(b)
+            assert b.seg == seg and b.fives == fives
+            for who in (Player.BLACK, Player.WHITE):
+                assert b.check_five(who) == (fives[who] > 0)
+            b.unmake(r, c, q, d)
+            assert (b.seg, b.fives) == _recount(g.board)
+            g.play(r, c, q, d)